@@ -1,42 +1,82 @@
+import argparse
 import time
 
+from Neuro_Estate_Model import FLAT, Accrual, EstateModel, LinearGrowth, Stream
+from Neuro_Estate_OS import growth_table
+
+# Модель из статьи: линейный рост (Linear-growth model from the article)
+ANCESTRAL_MODEL = EstateModel(
+    name="Ancestral Estate",
+    revenue=(
+        Stream("remote_work", 1_800_000, LinearGrowth(0.02)),  # Stable growth
+        Stream("organic_sales", 600_000, LinearGrowth(0.05), first_year=2),
+        Stream("carbon_credits", 180_000, LinearGrowth(0.05), first_year=4),
+        Stream("eco_tourism", 720_000, LinearGrowth(0.05), first_year=3),
+        Stream("education_services", 300_000, LinearGrowth(0.05), first_year=3),
+    ),
+    expenses=(Stream("living_expenses", 1_200_000, LinearGrowth(0.03)),),
+    initial_assets=(
+        ("financial", 0),       # Rubles
+        ("natural", 100_000),   # Initial land value
+        ("human", 500_000),     # Initial potential
+        ("social", 50_000),     # Initial connections
+    ),
+    asset_rules=(
+        ("natural", Accrual(150_000, LinearGrowth(0.05))),  # Soil, trees grow
+        ("human", Accrual(100_000, FLAT)),                  # Skills, health improve
+        ("social", Accrual(80_000, FLAT)),                  # Community strengthens
+    ),
+    # Costs based on the article
+    capex=(
+        ("land_lease_99_years", 300_000),
+        ("modular_house_3d", 2_500_000),
+        ("infrastructure_share", 400_000),
+        ("agri_start", 200_000),
+        ("reserve_fund", 600_000),
+    ),
+    cash_asset="financial",
+    capex_funding="financial",
+)
+
 class AncestralEstate:
-    def __init__(self, family_name, region="Central Russia"):
+    def __init__(self, family_name, region="Central Russia", headless=False,
+                 model: EstateModel = ANCESTRAL_MODEL):
         self.family_name = family_name
         self.region = region
+        self.headless = headless  # Без пауз и баннеров (No sleeps or banners)
+        self.model = model
         self.year = 0
-        self.capital = {
-            "financial": 0,  # Rubles
-            "natural": 0,    # Ecosystem value
-            "human": 0,      # Skills, health
-            "social": 0      # Community, reputation
-        }
+        # Капиталы до инвестиций (Capitals before the initial investment)
+        self.capital = {name: 0 for name, _ in model.initial_assets}
         self.cash_flow = []
+        self.model_seconds = 0.0  # Время в модели (Time spent in the model)
+
+    @property
+    def model(self) -> EstateModel:
+        return self._growth.model
+
+    @model.setter
+    def model(self, model: EstateModel):
+        # Общая таблица факторов, как у ядра NEURO-ESTATE (Shared growth table, as in the kernel)
+        self._growth = growth_table(model)
+
+    def _pause(self, seconds):
+        if not self.headless:
+            time.sleep(seconds)
         
     def initialize_investment(self):
         """Initial investment phase (Year 0)"""
-        print(f"\n🌱 Инициализация Родового Поместья семьи {self.family_name}...")
-        time.sleep(1)
-        
-        # Costs based on the article
-        investments = {
-            "land_lease_99_years": 300_000,
-            "modular_house_3d": 2_500_000,
-            "infrastructure_share": 400_000,
-            "agri_start": 200_000,
-            "reserve_fund": 600_000
-        }
+        if not self.headless:
+            print(f"\n🌱 Инициализация Родового Поместья семьи {self.family_name}...")
+        self._pause(1)
         
-        total_invest = sum(investments.values())
-        self.capital["financial"] -= total_invest
-        
-        # Initial capital value (assets)
-        self.capital["natural"] = 100_000 # Initial land value
-        self.capital["human"] = 500_000   # Initial potential
-        self.capital["social"] = 50_000   # Initial connections
+        # Стартовые активы за вычетом инвестиций (Initial assets net of the investment)
+        total_invest = self.model.total_capex
+        self.capital = self.model.opening_balance()
         
         print(f"💰 Стартовые инвестиции: {total_invest:,.0f} руб.".replace(",", " "))
-        print(f"🏡 Дом построен. Сад заложен. Жизнь начинается.")
+        if not self.headless:
+            print(f"🏡 Дом построен. Сад заложен. Жизнь начинается.")
         return total_invest
 
     def simulate_year(self, year_num):
@@ -44,31 +84,20 @@ class AncestralEstate:
         self.year = year_num
         
         # Income sources (Year 5 model from article, scaled for growth)
-        growth_factor = 1 + (year_num * 0.05) # 5% growth per year
-        
-        incomes = {
-            "remote_work": 1_800_000 * (1 + year_num * 0.02), # Stable growth
-            "organic_sales": 600_000 * growth_factor if year_num > 1 else 0,
-            "carbon_credits": 180_000 * growth_factor if year_num > 3 else 0,
-            "eco_tourism": 720_000 * growth_factor if year_num > 2 else 0,
-            "education_services": 300_000 * growth_factor if year_num > 2 else 0
-        }
-        
-        total_income = sum(incomes.values())
-        expenses = 1_200_000 * (1 + year_num * 0.03) # Living expenses
+        total_income, expenses = self._growth.cash_flows(year_num)
         
         net_income = total_income - expenses
-        self.capital["financial"] += net_income
+        self.capital[self.model.cash_asset] += net_income
         self.cash_flow.append(net_income)
         
         # Capital accumulation (The "Magic" part)
-        self.capital["natural"] += 150_000 * growth_factor # Soil, trees grow
-        self.capital["human"] += 100_000 # Skills, health improve
-        self.capital["social"] += 80_000 # Community strengthens
+        self.model.grow_assets(self.capital, year_num)
         
         return total_income, net_income
 
     def generate_report(self, years=20):
+        started = time.perf_counter()
+        self.model_seconds = 0.0  # Время только этого отчета (Per-report timing)
         print(f"\n🚀 Запуск симуляции на {years} лет для {self.region}...")
         print("-" * 60)
         
@@ -79,12 +108,14 @@ class AncestralEstate:
         print("-" * 60)
         
         for y in range(1, years + 1):
+            tick = time.perf_counter()
             inc, net = self.simulate_year(y)
+            self.model_seconds += time.perf_counter() - tick
             total_cap = sum(self.capital.values()) + initial_invest # Asset value
             
             if y in [1, 5, 10, 20]: # Key milestones
                 print(f"{y:<5} | {inc:,.0f}".replace(",", " ") + f" | {net:,.0f}".replace(",", " ") + f" | {total_cap:,.0f}".replace(",", " "))
-                time.sleep(0.2)
+                self._pause(0.2)
         
         print("-" * 60)
         print(f"\n✨ ИТОГИ ЧЕРЕЗ {years} ЛЕТ ✨")
@@ -97,15 +128,30 @@ class AncestralEstate:
         print(f"🤝 Социальный капитал (Связи): {self.capital['social']:,.0f} руб.".replace(",", " "))
         print(f"🧠 Человеческий капитал (Семья): {self.capital['human']:,.0f} руб.".replace(",", " "))
         
-        print("\n🔮 ВЫВОД НЕЙРОСЕТИ:")
-        print("Модель подтверждает: переход от 'выживания' к 'процветанию' происходит на 3-4 год.")
-        print("К 20-му году семья становится полностью автономной и финансово свободной.")
-        print("Это не просто дом. Это машина по производству счастья и капитала.")
+        if not self.headless:
+            print("\n🔮 ВЫВОД НЕЙРОСЕТИ:")
+            print("Модель подтверждает: переход от 'выживания' к 'процветанию' происходит на 3-4 год.")
+            print("К 20-му году семья становится полностью автономной и финансово свободной.")
+            print("Это не просто дом. Это машина по производству счастья и капитала.")
+
+        presentation = time.perf_counter() - started - self.model_seconds
+        print(f"\n⏱  Модель: {self.model_seconds * 1e3:.2f} ms | Вывод: {presentation * 1e3:.2f} ms")
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Расчет родового поместья 2.0 (Ancestral estate model)")
+    parser.add_argument("--headless", action="store_true",
+                        help="Без пауз, баннеров и вопросов (No sleeps, banners or prompts)")
+    parser.add_argument("--family", help="Фамилия семьи (Family name)")
+    parser.add_argument("--years", type=int, default=20, help="Горизонт расчета (Simulation horizon)")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
-    print("🌿 ПРОГРАММА РАСЧЕТА РОДОВОГО ПОМЕСТЬЯ 2.0 🌿")
-    print("Версия: Final Release | Powered by AI Analysis")
-    
-    family = input("\nВведите фамилию вашей семьи (Enter для 'Соколовы'): ") or "Соколовы"
-    estate = AncestralEstate(family)
-    estate.generate_report()
+    args = parse_args()
+    family = args.family
+    if not args.headless:
+        print("🌿 ПРОГРАММА РАСЧЕТА РОДОВОГО ПОМЕСТЬЯ 2.0 🌿")
+        print("Версия: Final Release | Powered by AI Analysis")
+        if family is None:
+            family = input("\nВведите фамилию вашей семьи (Enter для 'Соколовы'): ") or "Соколовы"
+    estate = AncestralEstate(family or "Соколовы", headless=args.headless)
+    estate.generate_report(args.years)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+📐 NEURO-ESTATE Analytic Evaluator
+==================================
+Закрытые формулы для траектории без случайных событий.
+(Closed-form evaluator for the event-free trajectory.)
+
+Без событий каждый поток — сумма по политике роста (геометрическая прогрессия для
+CompoundGrowth, арифметическая для LinearGrowth), техно-апгрейды — точечные
+поправки в годы апгрейда, а скидка автономии линейна до потолка. Поэтому стоимость
+и накопленная прибыль за Y лет считаются за O(1), без шагов по годам. Аргументы
+`years` и темпы GrowthRates могут быть массивами NumPy — тогда миллионы точек
+калибровки считаются одним вызовом. Работает с любой EstateModel, в том числе
+с массивами в параметрах: `model.with_parameters({"autonomy.cap": caps})`.
+
+Результаты совпадают с NeuroEstateKernel до ошибок округления (~1e-12 отн.).
+
+Usage:
+    model = AnalyticEstate()
+    model.valuation(30)                 # стоимость на 30-й год
+    model.cumulative_net_income([4, 7]) # накопленная прибыль к 4-му и 7-му году
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from Neuro_Estate_Model import Accrual, Appreciation, CompoundGrowth, EstateModel, LinearGrowth
+from Neuro_Estate_OS import DEFAULT_GROWTH, GrowthRates, build_neuro_model
+
+# --- SERIES ---
+
+def geometric_sum(rate, first, last):
+    """sum_{y=first}^{last} rate**y; 0 при last < first (empty range)."""
+    rate = np.asarray(rate, dtype=np.float64)
+    last = np.maximum(np.asarray(last), first - 1)
+    count = last - first + 1
+    flat = np.isclose(rate, 1.0)
+    safe = np.where(flat, 2.0, rate)
+    series = (safe ** (last + 1) - safe ** first) / (safe - 1.0)
+    return np.where(flat, count, series)
+
+def _weighted_prefix(rate, n):
+    """sum_{y=1}^{n} y * rate**y."""
+    flat = np.isclose(rate, 1.0)
+    safe = np.where(flat, 2.0, rate)
+    series = safe * (1.0 - (n + 1) * safe ** n + n * safe ** (n + 1)) / (1.0 - safe) ** 2
+    return np.where(flat, n * (n + 1) / 2.0, series)
+
+def weighted_geometric_sum(rate, first, last):
+    """sum_{y=first}^{last} y * rate**y; 0 при last < first."""
+    rate = np.asarray(rate, dtype=np.float64)
+    last = np.maximum(np.asarray(last), first - 1)
+    return _weighted_prefix(rate, last) - _weighted_prefix(rate, first - 1)
+
+def _power_sums(first, last):
+    """(count, sum y, sum y^2) по y = first..last; нули при last < first."""
+    last = np.maximum(np.asarray(last), first - 1)
+    lo = first - 1
+    s1 = lambda n: n * (n + 1) / 2.0
+    s2 = lambda n: n * (n + 1) * (2 * n + 1) / 6.0
+    return last - lo, s1(last) - s1(lo), s2(last) - s2(lo)
+
+def policy_sum(growth, first, last):
+    """sum_{y=first}^{last} growth.factor(y) для любой политики роста."""
+    if isinstance(growth, CompoundGrowth):
+        return geometric_sum(growth.rate, first, last)
+    count, s1, _ = _power_sums(first, last)
+    if isinstance(growth, LinearGrowth):
+        return count + growth.slope * s1
+    return count * 1.0
+
+def policy_weighted_sum(growth, first, last):
+    """sum_{y=first}^{last} y * growth.factor(y)."""
+    if isinstance(growth, CompoundGrowth):
+        return weighted_geometric_sum(growth.rate, first, last)
+    _, s1, s2 = _power_sums(first, last)
+    if isinstance(growth, LinearGrowth):
+        return s1 + growth.slope * s2
+    return s1
+
+# --- EVALUATOR ---
+
+class AnalyticEstate:
+    """O(1) оценка детерминированной траектории (Deterministic trajectory in O(1))."""
+
+    def __init__(self, growth_rates: GrowthRates = DEFAULT_GROWTH, model: Optional[EstateModel] = None):
+        self.growth_rates = growth_rates
+        # Без кэша: темпы могут быть массивами (Uncached: rates may be arrays)
+        self.model = model if model is not None else build_neuro_model(growth_rates)
+        # Год, после которого скидка автономии упирается в потолок (массив, если параметры — массивы)
+        autonomy = self.model.autonomy
+        self.autonomy_cap_year = None
+        if autonomy is not None:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                cap_year = np.floor(np.asarray(autonomy.cap) / autonomy.rate)
+            # Нулевая скидка не доходит до потолка никогда (Zero rate never reaches the cap)
+            self.autonomy_cap_year = np.where(np.asarray(autonomy.rate) > 0, cap_year, np.inf)
+
+    def cumulative_revenue(self, years):
+        years = np.asarray(years)
+        total = np.zeros(np.broadcast(years, *self._rate_arrays()).shape)
+        for stream in self.model.revenue:
+            total = total + stream.base * policy_sum(stream.growth, stream.first_year, years)
+            if stream.tech_sensitive:
+                # Год апгрейда: поток умножается на m, т.е. + base*(m-1)*factor(u)
+                for upgrade in self.model.tech_upgrades:
+                    if upgrade.year >= stream.first_year:
+                        bump = (stream.base * (upgrade.multiplier - 1.0)
+                                * np.asarray(stream.growth.factor(upgrade.year), dtype=np.float64))
+                        total = total + np.where(years >= upgrade.year, bump, 0.0)
+        return total
+
+    def cumulative_expenses(self, years):
+        years = np.asarray(years)
+        total = np.zeros(np.broadcast(years, *self._rate_arrays()).shape)
+        autonomy = self.model.autonomy
+        for stream in self.model.expenses:
+            growth, first = stream.growth, stream.first_year
+            if autonomy is None:
+                total = total + stream.base * policy_sum(growth, first, years)
+                continue
+            k = np.minimum(self.autonomy_cap_year, years)
+            linear_last = np.minimum(years, k)
+            # sum (1 - rate_d*y) f(y) до потолка + (1 - cap) sum f(y) после
+            part = (policy_sum(growth, first, linear_last)
+                    - autonomy.rate * policy_weighted_sum(growth, first, linear_last)
+                    + (1.0 - autonomy.cap) * policy_sum(growth, np.maximum(k + 1, first), years))
+            # Год апгрейда: скидка считается с множителем технологий
+            for upgrade in self.model.tech_upgrades:
+                if upgrade.year >= first:
+                    usual = np.minimum(autonomy.cap, autonomy.rate * upgrade.year)
+                    actual = np.minimum(autonomy.cap, autonomy.rate * upgrade.year * upgrade.multiplier)
+                    bump = (usual - actual) * np.asarray(growth.factor(upgrade.year), dtype=np.float64)
+                    part = part + np.where(years >= upgrade.year, bump, 0.0)
+            total = total + stream.base * part
+        return total
+
+    def cumulative_net_income(self, years):
+        return self.cumulative_revenue(years) - self.cumulative_expenses(years)
+
+    def net_income(self, years):
+        """Чистая прибыль одного года (Net income of year Y)."""
+        years = np.asarray(years)
+        return self.cumulative_net_income(years) - self.cumulative_net_income(years - 1)
+
+    def valuation(self, years):
+        """Стоимость активов на конец года Y (Capital valuation after year Y)."""
+        years = np.asarray(years)
+        rules = dict(self.model.asset_rules)
+        total = self.cumulative_net_income(years)
+        for name, value in self.model.opening_balance().items():
+            rule = rules.get(name)
+            if isinstance(rule, Appreciation):
+                value = value * np.asarray(rule.rate, dtype=np.float64) ** years
+            elif isinstance(rule, Accrual):
+                value = value + rule.amount * policy_sum(rule.growth, 1, years)
+            total = total + value
+        return total
+
+    def _rate_arrays(self):
+        return [np.asarray(getattr(self.growth_rates, name))
+                for name in self.growth_rates.__dataclass_fields__]
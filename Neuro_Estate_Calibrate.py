@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🎯 NEURO-ESTATE Calibration
+===========================
+Подбор параметров под цель (Goal-seek and calibration).
+
+Вопросы планировщиков вида «какая база remote_work дает окупаемость к 4-му году?»
+или «при каком CAPEX IRR еще ≥ 18%?» решаются на детерминированной траектории:
+
+  * goal_seek — один параметр, вилка + метод Иллинойса (regula falsi с
+    гарантией сходимости): сначала сетка по границам одним векторным вызовом,
+    затем уточнение внутри найденной вилки;
+  * calibrate — несколько параметров и целей, дифференциальная эволюция:
+    вся популяция считается одним вызовом AnalyticEstate.
+
+Потоки берутся из общей таблицы роста (growth_table), если меняются только
+CAPEX / активы / порог событий, иначе из аналитических формул с параметрами-
+массивами. Каждая посчитанная точка кэшируется по хешу (имена, значения),
+поэтому поиск не пересчитывает уже посещенные точки.
+
+Показатели: npv, irr, payback (год окупаемости, NaN если не окупилось),
+net_income (прибыль последнего года горизонта), cumulative_net_income, valuation.
+Псевдо-параметр "capex.total" масштабирует все статьи CAPEX пропорционально.
+
+Usage:
+    calibrator = Calibrator(years=10)
+    calibrator.goal_seek("payback", 4.0, "revenue.remote_work.base", (0, 2e6))   # ≈ 731_600
+    calibrator.goal_seek("irr", 0.18, "capex.total", (5e6, 1e8))                 # ≈ 13.4M
+    calibrator.calibrate({"irr": 0.20, "npv": 8e6},
+                         {"capex.total": (5e6, 3e7), "revenue.remote_work.base": (5e5, 3e6)})
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from Neuro_Estate_Analytic import AnalyticEstate
+from Neuro_Estate_Finance import irr, npv, payback_year
+from Neuro_Estate_Model import EstateModel
+from Neuro_Estate_OS import NEURO_MODEL, growth_table
+
+METRICS = ("npv", "irr", "payback", "net_income", "cumulative_net_income", "valuation")
+CAPEX_TOTAL = "capex.total"
+
+# Параметры, не влияющие на денежный поток (Parameters that leave cash flows unchanged)
+_FLOW_NEUTRAL = ("capex.", "assets.", "event_threshold")
+
+# --- RESULTS ---
+
+@dataclass
+class GoalSeekResult:
+    parameter: str
+    value: float              # Найденное значение (NaN, если цель не в вилке)
+    metric: str
+    target: float
+    achieved: float           # Показатель в найденной точке
+    evaluations: int          # Новых точек, посчитанных этим поиском
+    converged: bool
+
+@dataclass
+class CalibrationResult:
+    values: Dict[str, float]
+    metrics: Dict[str, float]
+    loss: float
+    generations: int
+    evaluations: int
+    converged: bool
+    history: List[float] = field(default_factory=list)  # Лучшая ошибка по поколениям
+
+# --- CALIBRATOR ---
+
+class Calibrator:
+    """
+    Оценка показателей по точкам параметров с кэшем (Cached point evaluator).
+    Одна модель, горизонт и ставка дисконтирования на экземпляр.
+    """
+
+    def __init__(self, model: EstateModel = NEURO_MODEL, years: int = 15, discount_rate: float = 0.10,
+                 expected_events: bool = False):
+        self.model = model
+        self.years = years
+        self.discount_rate = discount_rate
+        self.expected_events = expected_events
+        self.cache: Dict[Tuple, float] = {}
+        self.flow_cache: Dict[Tuple, Tuple[np.ndarray, float]] = {}
+        self.hits = 0
+        self.misses = 0
+        # Общая таблица роста базовой модели (Shared growth table of the base model)
+        table = growth_table(model, years)
+        self._base_flows = (np.array(table.revenue[1:years + 1]) - np.array(table.expenses[1:years + 1]))
+
+    # --- evaluation ---
+
+    def evaluate(self, metric: str, names: Sequence[str], points) -> np.ndarray:
+        """Показатель для строк points (n, len(names)); посчитанные точки берутся из кэша."""
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric!r}; expected one of {METRICS}")
+        names = tuple(names)
+        points = np.atleast_2d(np.asarray(points, dtype=np.float64))
+        keys = [(metric, names, row.tobytes()) for row in points]
+        out = np.empty(len(keys))
+        missing: Dict[Tuple, List[int]] = {}
+        for i, key in enumerate(keys):
+            if key in self.cache:
+                out[i] = self.cache[key]
+                self.hits += 1
+            else:
+                missing.setdefault(key, []).append(i)
+        if missing:
+            rows = [indices[0] for indices in missing.values()]
+            values = self._compute(metric, names, points[rows])
+            self.misses += len(rows)
+            for (key, indices), value in zip(missing.items(), values):
+                self.cache[key] = float(value)
+                out[indices] = value
+        return out
+
+    def _compute(self, metric: str, names: Tuple[str, ...], points: np.ndarray) -> np.ndarray:
+        if metric == "valuation":
+            varied, events = self._varied(names, points)
+            value = AnalyticEstate(model=varied).valuation(self.years) + self.years * events
+            return np.broadcast_to(value, (points.shape[0],))
+        flows, invested = self._flows(names, points)
+        if metric == "npv":
+            return npv(flows, self.discount_rate, invested)
+        if metric == "irr":
+            return irr(flows, invested)
+        if metric == "payback":
+            return payback_year(flows, invested)
+        if metric == "net_income":
+            return flows[:, -1]
+        return flows.sum(axis=1)
+
+    def _varied(self, names: Tuple[str, ...], points: np.ndarray):
+        """Модель с параметрами-массивами и ожидаемый вклад событий (Varied model, event term)."""
+        values = self._parameters(names, points)
+        varied = self.model.with_parameters(values)
+        events = 0.0
+        if self.expected_events:
+            from Neuro_Estate_Sobol import expected_event_impact
+
+            events = expected_event_impact(varied, values.get("event_threshold"))
+        return varied, events
+
+    def _flows(self, names: Tuple[str, ...], points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Потоки (n, T) и инвестиции (n,), кэш по точке без показателя: npv, irr и
+        payback в одной точке строят потоки один раз (Flows cached per point).
+        """
+        keys = [(names, row.tobytes()) for row in points]
+        missing: Dict[Tuple, int] = {}
+        for i, key in enumerate(keys):
+            if key not in self.flow_cache and key not in missing:
+                missing[key] = i
+        if missing:
+            rows = points[list(missing.values())]
+            n = rows.shape[0]
+            varied, events = self._varied(names, rows)
+            values = self._parameters(names, rows)
+            if all(name.startswith(_FLOW_NEUTRAL) for name in values):
+                flows = np.broadcast_to(self._base_flows, (n, self.years))
+            else:
+                t = np.arange(1, self.years + 1)[:, None]
+                flows = np.broadcast_to(AnalyticEstate(model=varied).net_income(t).T, (n, self.years))
+            flows = flows + np.broadcast_to(events, (n,))[:, None]
+            invested = np.broadcast_to(np.asarray(varied.total_capex, dtype=np.float64), (n,))
+            for j, key in enumerate(missing):
+                self.flow_cache[key] = (flows[j], float(invested[j]))
+        cached = [self.flow_cache[key] for key in keys]
+        return np.array([row for row, _ in cached]), np.array([amount for _, amount in cached])
+
+    def _parameters(self, names: Tuple[str, ...], points: np.ndarray) -> Dict[str, np.ndarray]:
+        values = {name: points[:, j] for j, name in enumerate(names)}
+        total = values.pop(CAPEX_TOTAL, None)
+        if total is not None:
+            base_total = float(self.model.total_capex)
+            for item, amount in self.model.capex:
+                values[f"capex.{item}"] = amount * total / base_total
+        return values
+
+    # --- single parameter ---
+
+    def goal_seek(self, metric: str, target: float, parameter: str, bounds: Tuple[float, float],
+                  grid: int = 33, xtol: float = 1e-9, max_iter: int = 100) -> GoalSeekResult:
+        """
+        Значение параметра, при котором metric = target (Value hitting the target).
+        Вилка ищется на сетке из `grid` точек внутри bounds; берется первая смена знака
+        между соседними точками, где показатель определен (NaN знака не имеет).
+        """
+        names = (parameter,)
+        start = self.misses
+
+        def f(x):
+            return self.evaluate(metric, names, np.asarray(x, dtype=np.float64).reshape(-1, 1)) - target
+
+        xs = np.linspace(bounds[0], bounds[1], grid)
+        fs = f(xs)
+        exact = np.flatnonzero(fs == 0)
+        if exact.size:
+            x = xs[exact[0]]
+            return GoalSeekResult(parameter, float(x), metric, target, float(fs[exact[0]] + target),
+                                  self.misses - start, True)
+        # NaN (нет IRR, не окупилось) — знака нет: вилка только между соседними конечными точками
+        finite = np.isfinite(fs)
+        signs = np.sign(fs)
+        change = np.flatnonzero(finite[:-1] & finite[1:] & (signs[:-1] != signs[1:]))
+        if change.size == 0:
+            return GoalSeekResult(parameter, float("nan"), metric, target, float("nan"), self.misses - start, False)
+        i = change[0]
+        lo, hi, f_lo, f_hi = xs[i], xs[i + 1], fs[i], fs[i + 1]
+        side = 0
+        converged = False
+        for _ in range(max_iter):
+            x = (lo * f_hi - hi * f_lo) / (f_hi - f_lo)
+            fx = f(x)[0]
+            if not np.isfinite(fx):
+                # Показатель пропал внутри вилки: корня нет (No metric inside the bracket)
+                return GoalSeekResult(parameter, float("nan"), metric, target, float("nan"),
+                                      self.misses - start, False)
+            if fx == 0 or hi - lo <= xtol * max(1.0, abs(x)):
+                converged = True
+                break
+            if np.sign(fx) == np.sign(f_lo):
+                lo, f_lo = x, fx
+                # Иллинойс: второй шаг с той же стороны уполовинивает застрявший конец
+                f_hi = f_hi / 2 if side == -1 else f_hi
+                side = -1
+            else:
+                hi, f_hi = x, fx
+                f_lo = f_lo / 2 if side == 1 else f_lo
+                side = 1
+        return GoalSeekResult(parameter, float(x), metric, target, float(fx + target),
+                              self.misses - start, converged)
+
+    # --- several parameters ---
+
+    def loss(self, targets: Dict[str, float], names: Sequence[str], points,
+             weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """Сумма квадратов относительных отклонений от целей (Sum of squared relative misses)."""
+        points = np.atleast_2d(np.asarray(points, dtype=np.float64))
+        total = np.zeros(points.shape[0])
+        for metric, target in targets.items():
+            scale = abs(target) if target else 1.0
+            weight = 1.0 if weights is None else weights.get(metric, 1.0)
+            miss = np.nan_to_num((self.evaluate(metric, names, points) - target) / scale, nan=np.inf)
+            with np.errstate(over="ignore"):
+                total += weight * miss ** 2
+        return total
+
+    def calibrate(self, targets: Dict[str, float], bounds: Dict[str, Tuple[float, float]],
+                  weights: Optional[Dict[str, float]] = None, population: Optional[int] = None,
+                  generations: int = 200, mutation: float = 0.7, crossover: float = 0.9,
+                  tol: float = 1e-12, seed=None) -> CalibrationResult:
+        """
+        Дифференциальная эволюция rand/1/bin (Differential evolution). Каждое поколение —
+        один векторный расчет всей популяции; остановка при loss <= tol или когда
+        популяция сжалась до точки.
+        """
+        names = tuple(bounds)
+        d = len(names)
+        low = np.array([bounds[name][0] for name in names], dtype=np.float64)
+        high = np.array([bounds[name][1] for name in names], dtype=np.float64)
+        size = population if population is not None else max(15 * d, 20)
+        rng = np.random.default_rng(seed)
+        start = self.misses
+
+        pop = low + rng.random((size, d)) * (high - low)
+        scores = self.loss(targets, names, pop, weights)
+        history = [float(scores.min())]
+        converged = False
+        generation = 0
+        for generation in range(1, generations + 1):
+            # Три разных партнера для каждой особи (Three distinct partners per member)
+            others = np.argsort(rng.random((size, size - 1)), axis=1)[:, :3]
+            others = others + (others >= np.arange(size)[:, None])
+            a, b, c = pop[others[:, 0]], pop[others[:, 1]], pop[others[:, 2]]
+            mutant = np.clip(a + mutation * (b - c), low, high)
+            cross = rng.random((size, d)) < crossover
+            cross[np.arange(size), rng.integers(0, d, size)] = True
+            trial = np.where(cross, mutant, pop)
+            trial_scores = self.loss(targets, names, trial, weights)
+            better = trial_scores <= scores
+            pop[better] = trial[better]
+            scores[better] = trial_scores[better]
+            history.append(float(scores.min()))
+            spread = np.ptp(pop, axis=0) <= 1e-12 * np.maximum(1.0, np.abs(pop).max(axis=0))
+            if scores.min() <= tol or spread.all():
+                converged = True
+                break
+
+        best = pop[np.argmin(scores)]
+        metrics = {metric: float(self.evaluate(metric, names, best[None, :])[0]) for metric in targets}
+        return CalibrationResult(
+            values={name: float(value) for name, value in zip(names, best)},
+            metrics=metrics, loss=float(scores.min()), generations=generation,
+            evaluations=self.misses - start, converged=converged, history=history,
+        )
+
+def goal_seek(metric: str, target: float, parameter: str, bounds: Tuple[float, float],
+              model: EstateModel = NEURO_MODEL, years: int = 15, discount_rate: float = 0.10,
+              **kwargs) -> GoalSeekResult:
+    """Разовый goal-seek без сохранения кэша (One-off goal-seek)."""
+    return Calibrator(model, years, discount_rate).goal_seek(metric, target, parameter, bounds, **kwargs)
+
+def calibrate(targets: Dict[str, float], bounds: Dict[str, Tuple[float, float]],
+              model: EstateModel = NEURO_MODEL, years: int = 15, discount_rate: float = 0.10,
+              **kwargs) -> CalibrationResult:
+    """Разовая калибровка (One-off calibration)."""
+    return Calibrator(model, years, discount_rate).calibrate(targets, bounds, **kwargs)
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🏘  NEURO-ESTATE Cluster (Agro-Polis)
+=====================================
+Кластер поместий с общей инфраструктурой (Estate cluster with shared infrastructure).
+
+Манифест: поместья объединяются в поселения по 50-100 семей, у которых общие
+умная энергосеть, взлетная полоса и DAO. Здесь каждое поместье — строка в
+наборе массивов (struct-of-arrays): активы, год вступления, масштаб доходов,
+номер поселения. Год симуляции — несколько векторных операций над всеми
+поместьями сразу, поэтому 10 000 поместий × 30 лет считаются за доли секунды.
+
+  * Общие активы (SharedAsset) строит поселение; их CAPEX заменяет статьи
+    поместья (smart_grid_share, runway_contribution). Учет как у CAPEX в ядре:
+    вложение капитализируется и в расходы не попадает. Доля остаточной
+    стоимости (линейная амортизация) входит в капитал члена поселения, так что
+    износ уменьшает стоимость, но не деньги; из денег платится только
+    содержание (opex), поровну между активными членами.
+  * Доходы поселения (авиасервис, туристический хаб) делятся между членами
+    поровну или пропорционально масштабу их доходов.
+  * Поместья могут вступать постепенно (join_year): для каждого поместья год
+    модели — это его стаж, поэтому техно-апгрейды и рост идут от вступления.
+  * С графом соседства (Neuro_Estate_Graph) социальный капитал перетекает
+    между соседями: репутация, туристические рекомендации, общий труд.
+
+Без общих активов и доходов кластера каждое поместье совпадает с
+NeuroEstateKernel / BatchEstateEngine на той же матрице событий.
+
+Usage:
+    result = ClusterEngine().run(n_estates=10_000, years=30, seed=1, build_out_years=5)
+    result.totals()["net_income"]        # чистая прибыль кластера по годам
+    result.reports(42)                   # FinancialReport одного поместья
+"""
+
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from Neuro_Estate_Model import FLAT, CompoundGrowth, EstateModel, Stream
+from Neuro_Estate_MonteCarlo import NO_EVENT, sample_event_indices
+from Neuro_Estate_OS import NEURO_MODEL, FinancialReport, growth_table
+
+# --- CLUSTER MODEL ---
+
+@dataclass(frozen=True)
+class SharedAsset:
+    """Общий актив поселения (Shared village asset), построен в год 0."""
+    name: str
+    capex: float                    # Стоимость на одно поселение
+    lifetime: int                   # Срок линейной амортизации, лет
+    opex: float = 0.0               # Содержание в год (Yearly upkeep)
+    opex_growth: object = FLAT
+    replaces: Tuple[str, ...] = ()  # Статьи CAPEX поместья, которые он заменяет
+
+    def book_value(self, year: int) -> float:
+        """Остаточная стоимость на конец года (Straight-line book value)."""
+        return self.capex * max(0.0, 1.0 - year / self.lifetime)
+
+    def upkeep(self, year: int) -> float:
+        """Содержание за год — денежный расход (Yearly upkeep, the only cash cost)."""
+        return self.opex * self.opex_growth.factor(year)
+
+@dataclass(frozen=True)
+class ClusterModel:
+    name: str
+    member: EstateModel                       # Модель одного поместья
+    shared: Tuple[SharedAsset, ...] = ()
+    revenue: Tuple[Stream, ...] = ()          # Доходы поселения (Village-level revenue)
+    village_size: int = 100                   # Семей в поселении (манифест: 50-100)
+    split: str = "equal"                      # "equal" | "scale" — дележ доходов поселения
+    spillover: float = 0.02                   # Доля капитала соседей в год (только с графом)
+    spillover_asset: str = "social_capital"
+
+    def __post_init__(self):
+        if self.split not in ("equal", "scale"):
+            raise ValueError(f"split must be 'equal' or 'scale', got {self.split!r}")
+        if self.spillover and self.spillover_asset not in self.member.opening_balance():
+            raise ValueError(f"spillover_asset {self.spillover_asset!r} is not an asset of model "
+                             f"{self.member.name!r}; pass an existing asset or spillover=0")
+
+    @property
+    def member_model(self) -> EstateModel:
+        """Модель поместья без статей CAPEX, замененных общими активами."""
+        replaced = {item for asset in self.shared for item in asset.replaces}
+        if not replaced:
+            return self.member
+        return replace(self.member, capex=tuple((item, amount) for item, amount in self.member.capex
+                                                if item not in replaced))
+
+    def village_cost(self, year: int) -> float:
+        """Денежные расходы поселения: содержание общих активов (Cash upkeep of shared assets)."""
+        return sum(asset.upkeep(year) for asset in self.shared)
+
+    def village_book_value(self, year: int) -> float:
+        return sum(asset.book_value(year) for asset in self.shared)
+
+    def village_revenue(self, year: int) -> float:
+        return sum(stream.value(year) for stream in self.revenue)
+
+# Агро-Полис по умолчанию: доли семей в CAPEX (400k сеть, 100k ВПП) × 100 семей
+AGRO_POLIS = ClusterModel(
+    name="Agro-Polis",
+    member=NEURO_MODEL,
+    shared=(
+        SharedAsset("smart_grid", 40_000_000, lifetime=25, opex=1_200_000, opex_growth=CompoundGrowth(1.03),
+                    replaces=("smart_grid_share",)),
+        SharedAsset("runway", 10_000_000, lifetime=30, opex=500_000, opex_growth=CompoundGrowth(1.03),
+                    replaces=("runway_contribution",)),
+        SharedAsset("dao_platform", 3_000_000, lifetime=10, opex=300_000),
+    ),
+    revenue=(
+        Stream("aviation_services", 2_400_000, CompoundGrowth(1.08), first_year=2),  # Ангары, полеты, обучение
+        Stream("tourism_hub", 6_000_000, CompoundGrowth(1.10), first_year=3),       # Фестивали, эко-туры
+    ),
+)
+
+# --- MEMBERS (STRUCT OF ARRAYS) ---
+
+@dataclass
+class ClusterMembers:
+    """Неизменные признаки поместий (Static member attributes), массивы (N,)."""
+    village: np.ndarray      # int32, номер поселения
+    join_year: np.ndarray    # int32, год вступления (1 = с начала)
+    scale: np.ndarray        # float64, множитель выручки поместья
+
+    def __len__(self) -> int:
+        return len(self.village)
+
+    @property
+    def n_villages(self) -> int:
+        return int(self.village.max()) + 1 if len(self.village) else 0
+
+    @classmethod
+    def generate(cls, n: int, village_size: int = 100, rng: Optional[np.random.Generator] = None,
+                 build_out_years: int = 1, scale_sigma: float = 0.0) -> "ClusterMembers":
+        """
+        Поселения заполняются подряд по village_size; год вступления равномерно в
+        1..build_out_years; масштаб — логнормальный со средним 1.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        village = (np.arange(n) // village_size).astype(np.int32)
+        join_year = rng.integers(1, build_out_years + 1, size=n, dtype=np.int32) if build_out_years > 1 \
+            else np.ones(n, dtype=np.int32)
+        scale = np.exp(scale_sigma * rng.standard_normal(n) - scale_sigma ** 2 / 2) if scale_sigma > 0 \
+            else np.ones(n)
+        return cls(village, join_year, scale)
+
+# --- RESULTS ---
+
+@dataclass
+class ClusterResult:
+    year: np.ndarray                # (T,)
+    members: ClusterMembers
+    revenue: np.ndarray             # (N, T), с долей доходов поселения
+    expenses: np.ndarray            # (N, T), с долей содержания общих активов
+    net_income: np.ndarray          # (N, T)
+    capital_valuation: np.ndarray   # (N, T), с долей остаточной стоимости общих активов
+    event_index: np.ndarray         # (N, T)
+    unallocated: np.ndarray         # (T,) содержание поселений без активных членов
+    events: tuple = ()
+
+    def totals(self) -> Dict[str, np.ndarray]:
+        """Суммы по кластеру по годам (Cluster-wide yearly totals)."""
+        return {name: getattr(self, name).sum(axis=0)
+                for name in ("revenue", "expenses", "net_income", "capital_valuation")}
+
+    def village_totals(self, metric: str = "net_income") -> np.ndarray:
+        """(V, T) суммы по поселениям (Per-village totals via bincount)."""
+        values = getattr(self, metric)
+        villages = self.members.n_villages
+        return np.stack([np.bincount(self.members.village, weights=values[:, t], minlength=villages)
+                         for t in range(values.shape[1])], axis=1)
+
+    def reports(self, member: int) -> List[FinancialReport]:
+        """Годовые отчеты одного поместья (FinancialReport view of one member)."""
+        out = []
+        for t, year in enumerate(self.year):
+            code = int(self.event_index[member, t])
+            out.append(FinancialReport(
+                year=int(year),
+                revenue=float(self.revenue[member, t]),
+                expenses=float(self.expenses[member, t]),
+                net_income=float(self.net_income[member, t]),
+                capital_valuation=float(self.capital_valuation[member, t]),
+                events=[self.events[code][1]] if code != NO_EVENT else []
+            ))
+        return out
+
+# --- ENGINE ---
+
+class ClusterEngine:
+    """Векторный движок кластера (Vectorized cluster engine)."""
+
+    def __init__(self, cluster: ClusterModel = AGRO_POLIS):
+        self.cluster = cluster
+        self.model = cluster.member_model
+        self.event_impacts = np.array([evt[2] for evt in self.model.events] + [0.0], dtype=np.float64)
+
+    def run(self, n_estates: int, years: int, seed=None, members: Optional[ClusterMembers] = None,
+            build_out_years: int = 1, scale_sigma: float = 0.0,
+            event_index: Optional[np.ndarray] = None, graph=None) -> ClusterResult:
+        """
+        Симуляция кластера (Simulate the cluster). `members` — готовые признаки
+        поместий; иначе они генерируются из seed вместе с матрицей событий.
+        `graph` — NeighbourGraph (Neuro_Estate_Graph): переток spillover_asset от соседей.
+        """
+        cluster, model = self.cluster, self.model
+        rng = np.random.default_rng(seed)
+        if members is None:
+            members = ClusterMembers.generate(n_estates, cluster.village_size, rng, build_out_years, scale_sigma)
+        elif len(members) != n_estates:
+            raise ValueError(f"members has {len(members)} rows, expected {n_estates}")
+        if event_index is None:
+            event_index = sample_event_indices(n_estates, years, rng, model.events, model.event_threshold)
+        # До вступления событий нет (No events before a member joins)
+        event_index = np.where(np.arange(1, years + 1) < members.join_year[:, None], NO_EVENT, event_index)
+
+        # Таблицы модели поместья по стажу (Member tables indexed by tenure, 0 = not joined)
+        table = growth_table(model, years)
+        table_revenue = np.array(table.revenue[:years + 1])
+        table_expenses = np.array(table.expenses[:years + 1])
+        villages = members.n_villages
+        weights = members.scale if cluster.split == "scale" else np.ones(n_estates)
+
+        opening = model.opening_balance()
+        assets = {name: np.full(n_estates, value) for name, value in opening.items()}
+        rules = dict(model.asset_rules)
+
+        shape = (n_estates, years)
+        revenue, expenses = np.empty(shape), np.empty(shape)
+        net_income, valuation = np.empty(shape), np.empty(shape)
+        unallocated = np.zeros(years)
+
+        for t in range(years):
+            year = t + 1
+            tenure = np.maximum(year - members.join_year + 1, 0)
+            active = tenure > 0
+
+            # Доли поселения: делим на активных членов (Village items split across active members)
+            member_weight = np.where(active, weights, 0.0)
+            village_weight = np.bincount(members.village, weights=member_weight, minlength=villages)
+            village_members = np.bincount(members.village, weights=active, minlength=villages)
+            empty = village_members == 0
+            unallocated[t] = empty.sum() * cluster.village_cost(year)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                revenue_share = np.where(empty, 0.0, cluster.village_revenue(year) / village_weight)
+                per_member = np.where(empty, 0.0, 1.0 / village_members)
+            share = per_member[members.village] * active
+
+            year_revenue = (members.scale * table_revenue[tenure] + self.event_impacts[event_index[:, t]]
+                            + revenue_share[members.village] * member_weight)
+            year_expenses = table_expenses[tenure] + cluster.village_cost(year) * share
+            year_net = year_revenue - year_expenses
+
+            assets[model.cash_asset] += year_net
+            before = assets[cluster.spillover_asset] if graph is not None and cluster.spillover else None
+            for name, rule in rules.items():
+                assets[name] = np.where(active, rule.apply(assets[name], tenure), assets[name])
+            if graph is not None and cluster.spillover:
+                # Среднее по вступившим соседям: два SpMV на год (Mean over joined neighbours)
+                joined = graph.matvec(active.astype(np.float64))
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    neighbours = np.where(joined > 0, graph.matvec(np.where(active, before, 0.0)) / joined, 0.0)
+                assets[cluster.spillover_asset] += np.where(active, cluster.spillover * neighbours, 0.0)
+
+            # Тот же порядок сложения активов, что и в ядре (Kernel's summation order)
+            total = 0
+            for name in opening:
+                total = total + assets[name]
+            revenue[:, t] = year_revenue
+            expenses[:, t] = year_expenses
+            net_income[:, t] = year_net
+            valuation[:, t] = np.where(active, total + cluster.village_book_value(year) * share, 0.0)
+
+        return ClusterResult(np.arange(1, years + 1), members, revenue, expenses, net_income, valuation,
+                             event_index, unallocated, model.events)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🌦  NEURO-ESTATE Macro Drivers
+==============================
+Коррелированные случайные макро-факторы (Correlated stochastic macro drivers).
+
+Три фактора на каждую траекторию и год:
+  * inflation — избыточная инфляция расходов сверх темпа модели, AR(1):
+    π_t = φ·π_{t-1} + (1-φ)·μ + σ·ε;  расходы × Π(1 + π_s);
+  * crypto — логарифмическая доходность крипто-резервов (геометрическое
+    броуновское движение): r_t = μ - v·σ²/2 + σ·ε; резервы × exp(r_t);
+  * yield — шок урожайности органики, логнормальный со средним 1:
+    organic_sales × exp(σ·ε - v·σ²/2).
+
+Шоки ε — массив (paths × years × 3) за один проход: независимые N(0, 1),
+умноженные на множитель Холецкого корреляционной матрицы. Для тяжелых хвостов
+(df) шоки — смесь нормальных с общим для всех факторов года множителем
+дисперсии v = (df - 2) / χ²_df (как у t-распределения), который ограничен
+сверху max_variance: совместные обвалы (crypto winter + засуха) остаются, а у
+exp(ε) есть конечные моменты. Чистое t не годится: E[exp(t)] = ∞, и средний
+рост крипты улетает в тысячи. Поправка сноса берет реализованное v, поэтому
+E[exp(r_t)] = exp(μ) и E[yield] = 1 точно при любом df (martingale correction).
+
+Usage:
+    drivers = MacroDrivers(correlation=((1, 0.3, -0.2), (0.3, 1, 0), (-0.2, 0, 1)), df=4)
+    result = BatchEstateEngine().run(100_000, 30, seed=1, drivers=drivers)
+    result.drivers.crypto_return       # (N, T)
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+FACTORS = ("inflation", "crypto", "yield")
+
+@dataclass
+class DriverPaths:
+    """Реализации факторов (Realised driver paths), массивы (N, T)."""
+    shocks: np.ndarray          # (N, T, 3) коррелированные шоки ε
+    variance: np.ndarray        # (N, T) множитель дисперсии v года (1 без df)
+    inflation: np.ndarray       # Избыточная инфляция года π_t
+    crypto_return: np.ndarray   # Лог-доходность крипто r_t
+    yield_factor: np.ndarray    # Множитель урожая (среднее 1)
+
+    @property
+    def expense_index(self) -> np.ndarray:
+        """Накопленный множитель расходов Π(1 + π_s) (Cumulative expense index)."""
+        return np.cumprod(1.0 + self.inflation, axis=1)
+
+    @property
+    def crypto_growth(self) -> np.ndarray:
+        """Рост резервов за год exp(r_t) (Yearly reserve growth factor)."""
+        return np.exp(self.crypto_return)
+
+@dataclass(frozen=True)
+class MacroDrivers:
+    """Параметры факторов и их корреляция (Driver parameters and correlation)."""
+    inflation_mean: float = 0.0         # Средняя избыточная инфляция в год
+    inflation_vol: float = 0.02
+    inflation_persistence: float = 0.6  # φ в AR(1)
+    crypto_drift: float = 0.05          # μ = ln E[рост резервов за год]
+    crypto_vol: float = 0.60
+    crypto_share: float = 1.0           # Доля резервов в крипте (остальное — рубли)
+    yield_vol: float = 0.15
+    correlation: Tuple[Tuple[float, ...], ...] = ((1.0, 0.2, -0.3),
+                                                  (0.2, 1.0, 0.0),
+                                                  (-0.3, 0.0, 1.0))
+    df: Optional[float] = 5.0           # Степени свободы смеси; None — нормальные шоки
+    max_variance: float = 9.0           # Потолок v: масштаб шока не больше 3× нормального
+    yield_stream: str = "organic_sales"
+
+    def cholesky(self) -> np.ndarray:
+        """Нижний множитель L: L @ L.T = correlation (raises LinAlgError if not PD)."""
+        matrix = np.asarray(self.correlation, dtype=np.float64)
+        if matrix.shape != (len(FACTORS), len(FACTORS)) or not np.allclose(matrix, matrix.T):
+            raise ValueError(f"correlation must be a symmetric {len(FACTORS)}x{len(FACTORS)} matrix")
+        return np.linalg.cholesky(matrix)
+
+    def mixing_variance(self, n_paths: int, years: int, rng: np.random.Generator) -> np.ndarray:
+        """Множитель дисперсии v (N, T), общий для факторов года (Shared variance multiplier)."""
+        if self.df is None:
+            return np.ones((n_paths, years))
+        if self.df <= 2:
+            raise ValueError("df must be > 2 for finite variance")
+        variance = (self.df - 2.0) / rng.chisquare(self.df, size=(n_paths, years))
+        return np.minimum(variance, self.max_variance, out=variance)
+
+    def shocks(self, n_paths: int, years: int, rng: np.random.Generator,
+               variance: Optional[np.ndarray] = None) -> np.ndarray:
+        """Коррелированные шоки (N, T, 3) с дисперсией ≈ 1 (Correlated shocks, variance ≈ 1)."""
+        z = rng.standard_normal((n_paths, years, len(FACTORS)))
+        z = z @ self.cholesky().T
+        if variance is None:
+            variance = self.mixing_variance(n_paths, years, rng)
+        if self.df is not None:
+            z *= np.sqrt(variance)[..., None]
+        return z
+
+    def simulate(self, n_paths: int, years: int, rng: Optional[np.random.Generator] = None) -> DriverPaths:
+        """Траектории всех факторов (N, T) за один проход выборки (Simulate all driver paths)."""
+        rng = rng if rng is not None else np.random.default_rng()
+        variance = self.mixing_variance(n_paths, years, rng)
+        eps = self.shocks(n_paths, years, rng, variance)
+
+        # AR(1) по годам: цикл по T над векторами N (sampling is already done)
+        phi = self.inflation_persistence
+        inflation = np.empty((n_paths, years))
+        level = np.full(n_paths, self.inflation_mean)
+        for t in range(years):
+            level = phi * level + (1.0 - phi) * self.inflation_mean + self.inflation_vol * eps[:, t, 0]
+            inflation[:, t] = level
+        np.maximum(inflation, -0.99, out=inflation)
+
+        crypto = (self.crypto_drift - 0.5 * self.crypto_vol ** 2 * variance) + self.crypto_vol * eps[:, :, 1]
+        if self.crypto_share != 1.0:
+            # Смешанный портфель: рост = 1 + доля · (exp(r) - 1)
+            crypto = np.log1p(self.crypto_share * np.expm1(crypto))
+        yield_factor = np.exp(self.yield_vol * eps[:, :, 2] - 0.5 * self.yield_vol ** 2 * variance)
+        return DriverPaths(eps, variance, inflation, crypto, yield_factor)
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+💾 NEURO-ESTATE Result Export
+=============================
+Потоковая запись результатов (Streaming result writer): Parquet, Arrow IPC или CSV.
+
+Строки (траектория, год) пишутся группами по `row_group_size` по мере счета:
+пакетный движок гонится блоками по `chunk_paths` траекторий, каждый блок уходит
+в файл и освобождается. Память ограничена одним блоком и одной группой строк,
+поэтому 10M траекторий × 30 лет не требуют всего результата в RAM.
+
+Parquet и Arrow требуют pyarrow; без него запись идет в CSV (fallback) с
+предупреждением. `.csv.gz` сжимается на лету.
+
+Usage:
+    export_batch("paths.parquet", n_paths=10_000_000, years=30, seed=1)
+    with open_writer("sweep.arrow") as writer:
+        export_sweep(writer, SweepRunner().run(tasks))
+
+    python Neuro_Estate_Export.py paths.parquet --paths 10000000 --years 30 --seed 1
+"""
+
+import argparse
+import csv
+import gzip
+import os
+import sys
+import warnings
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from Neuro_Estate_OS import child_seed
+
+# Схема длинной таблицы (Long-format schema): одна строка на (path, year)
+SCHEMA: Dict[str, np.dtype] = {
+    "path": np.dtype(np.int64),
+    "year": np.dtype(np.int32),
+    "revenue": np.dtype(np.float64),
+    "expenses": np.dtype(np.float64),
+    "net_income": np.dtype(np.float64),
+    "capital_valuation": np.dtype(np.float64),
+    "event_code": np.dtype(np.int16),  # Индекс события модели, -1 = не было
+}
+
+DEFAULT_ROW_GROUP = 1_000_000
+
+# --- WRITERS ---
+
+class ResultWriter:
+    """
+    Базовый писатель: копит куски до row_group_size строк и пишет группу целиком.
+    (Buffers incoming chunks and writes exact-size row groups.)
+    """
+    format = ""
+
+    def __init__(self, path: str, row_group_size: int = DEFAULT_ROW_GROUP):
+        self.path = path
+        self.row_group_size = row_group_size
+        self.rows_written = 0
+        self._pending: List[Dict[str, np.ndarray]] = []
+        self._pending_rows = 0
+
+    def write(self, columns: Dict[str, np.ndarray]):
+        """Кусок строк по колонкам SCHEMA (A chunk of rows, one array per column)."""
+        chunk = {name: np.asarray(columns[name], dtype=dtype).ravel() for name, dtype in SCHEMA.items()}
+        size = len(chunk["path"])
+        if any(len(column) != size for column in chunk.values()):
+            raise ValueError("All columns of a chunk must have the same length")
+        self._pending.append(chunk)
+        self._pending_rows += size
+        while self._pending_rows >= self.row_group_size:
+            self._emit(self.row_group_size)
+
+    def flush(self):
+        if self._pending_rows:
+            self._emit(self._pending_rows)
+
+    def close(self):
+        self.flush()
+        self._close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _emit(self, rows: int):
+        pending = self._pending if len(self._pending) > 1 else None
+        merged = {name: np.concatenate([c[name] for c in pending]) if pending else self._pending[0][name]
+                  for name in SCHEMA}
+        self._write_group({name: column[:rows] for name, column in merged.items()})
+        rest = {name: column[rows:] for name, column in merged.items()}
+        self._pending = [rest] if len(rest["path"]) else []
+        self._pending_rows -= rows
+        self.rows_written += rows
+
+    def _write_group(self, columns: Dict[str, np.ndarray]):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+class ParquetWriter(ResultWriter):
+    format = "parquet"
+
+    def __init__(self, path: str, row_group_size: int = DEFAULT_ROW_GROUP, compression: str = "zstd"):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        super().__init__(path, row_group_size)
+        self._pa = pa
+        self._schema = pa.schema([(name, pa.from_numpy_dtype(dtype)) for name, dtype in SCHEMA.items()])
+        self._writer = pq.ParquetWriter(path, self._schema, compression=compression)
+
+    def _write_group(self, columns):
+        table = self._pa.Table.from_arrays([columns[name] for name in SCHEMA], schema=self._schema)
+        self._writer.write_table(table, row_group_size=len(table))
+
+    def _close(self):
+        self._writer.close()
+
+class ArrowWriter(ResultWriter):
+    """Arrow IPC (Feather v2) файл: одна record batch на группу строк."""
+    format = "arrow"
+
+    def __init__(self, path: str, row_group_size: int = DEFAULT_ROW_GROUP):
+        import pyarrow as pa
+
+        super().__init__(path, row_group_size)
+        self._pa = pa
+        self._schema = pa.schema([(name, pa.from_numpy_dtype(dtype)) for name, dtype in SCHEMA.items()])
+        self._sink = pa.OSFile(path, "wb")
+        self._writer = pa.ipc.new_file(self._sink, self._schema)
+
+    def _write_group(self, columns):
+        batch = self._pa.record_batch([columns[name] for name in SCHEMA], schema=self._schema)
+        self._writer.write_batch(batch)
+
+    def _close(self):
+        self._writer.close()
+        self._sink.close()
+
+class CsvWriter(ResultWriter):
+    """CSV с заголовком; `.gz` сжимается gzip (CSV, gzip-compressed for .gz)."""
+    format = "csv"
+    SLICE = 65_536
+
+    def __init__(self, path: str, row_group_size: int = DEFAULT_ROW_GROUP):
+        super().__init__(path, row_group_size)
+        opener = gzip.open if path.endswith(".gz") else open
+        self._file = opener(path, "wt", newline="", encoding="utf-8")
+        self._csv = csv.writer(self._file)
+        self._csv.writerow(SCHEMA)
+
+    def _write_group(self, columns):
+        # Срезами: tolist() всей группы раздул бы память объектами Python
+        for start in range(0, len(columns["path"]), self.SLICE):
+            self._csv.writerows(zip(*(columns[name][start:start + self.SLICE].tolist() for name in SCHEMA)))
+
+    def _close(self):
+        self._file.close()
+
+WRITERS = {".parquet": ParquetWriter, ".arrow": ArrowWriter, ".feather": ArrowWriter,
+           ".csv": CsvWriter, ".gz": CsvWriter}
+
+def open_writer(path: str, row_group_size: int = DEFAULT_ROW_GROUP, fallback: bool = True) -> ResultWriter:
+    """
+    Писатель по расширению файла (Writer chosen by extension). Если pyarrow нет,
+    а fallback=True — пишет CSV рядом (`paths.parquet` -> `paths.csv`).
+    """
+    ext = os.path.splitext(path)[1].lower()
+    writer_cls = WRITERS.get(ext)
+    if writer_cls is None:
+        raise ValueError(f"Неизвестный формат (Unknown format): {path!r}; "
+                         f"поддерживаются {', '.join(sorted(WRITERS))}")
+    try:
+        return writer_cls(path, row_group_size)
+    except ImportError:
+        if not fallback:
+            raise
+        csv_path = os.path.splitext(path)[0] + ".csv"
+        warnings.warn(f"pyarrow не установлен (not installed): пишем CSV в {csv_path}", RuntimeWarning,
+                      stacklevel=2)
+        return CsvWriter(csv_path, row_group_size)
+
+# --- SOURCES ---
+
+def batch_columns(result, first_path: int = 0) -> Dict[str, np.ndarray]:
+    """BatchResult -> длинная таблица; траектории нумеруются с first_path."""
+    n_paths, years = result.revenue.shape
+    return {
+        "path": np.repeat(np.arange(first_path, first_path + n_paths, dtype=np.int64), years),
+        "year": np.tile(result.year.astype(np.int32), n_paths),
+        "revenue": result.revenue,
+        "expenses": result.expenses,
+        "net_income": result.net_income,
+        "capital_valuation": result.capital_valuation,
+        "event_code": result.event_index,
+    }
+
+def _writer_for(target, row_group_size: int):
+    if isinstance(target, ResultWriter):
+        return target, False
+    return open_writer(target, row_group_size), True
+
+def export_batch(target, n_paths: int, years: int, seed: Optional[int] = None, engine=None,
+                 chunk_paths: int = 20_000, row_group_size: int = DEFAULT_ROW_GROUP,
+                 progress=None) -> int:
+    """
+    Пакетный Monte Carlo прямо в файл (Batch Monte Carlo streamed to disk).
+
+    `target` — путь или открытый ResultWriter. Блок i считается с
+    seed=child_seed(seed, i): результат зависит от chunk_paths, но не от памяти
+    машины. `progress(done_paths, n_paths)` вызывается после каждого блока.
+    Возвращает число записанных строк.
+    """
+    from Neuro_Estate_MonteCarlo import BatchEstateEngine
+
+    engine = engine if engine is not None else BatchEstateEngine()
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy)
+    writer, owned = _writer_for(target, row_group_size)
+    try:
+        rows = 0
+        for index, start in enumerate(range(0, n_paths, chunk_paths)):
+            size = min(chunk_paths, n_paths - start)
+            result = engine.run(size, years, seed=child_seed(seed, index))
+            writer.write(batch_columns(result, start))
+            rows += size * years
+            if progress is not None:
+                progress(start + size, n_paths)
+    finally:
+        if owned:
+            writer.close()
+        else:
+            writer.flush()
+    return rows
+
+def export_sweep(target, chunks: Iterable, row_group_size: int = DEFAULT_ROW_GROUP) -> int:
+    """Шарды свипа (SweepChunk) по мере готовности; path = task_id."""
+    writer, owned = _writer_for(target, row_group_size)
+    rows = 0
+    try:
+        for chunk in chunks:
+            columns = {name: getattr(chunk, name) for name in SCHEMA if name != "path"}
+            columns["path"] = chunk.task_id
+            writer.write(columns)
+            rows += len(chunk)
+    finally:
+        if owned:
+            writer.close()
+        else:
+            writer.flush()
+    return rows
+
+def history_columns(kernel, path: int = 0) -> Dict[str, np.ndarray]:
+    """История одного ядра в схеме SCHEMA (One kernel's history, global event codes)."""
+    columns = kernel.history.to_numpy()
+    codes = {evt[1]: i for i, evt in enumerate(kernel.model.events)}
+    remap = np.array([codes[name] for name in kernel.history.event_names] + [-1], dtype=np.int16)
+    columns["event_code"] = remap[columns["event_code"]]
+    columns["path"] = np.full(len(kernel.history), path, dtype=np.int64)
+    return columns
+
+# --- CLI ---
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="NEURO-ESTATE: потоковая выгрузка Monte Carlo")
+    parser.add_argument("output", help="Файл .parquet / .arrow / .csv / .csv.gz")
+    parser.add_argument("--paths", type=int, default=1_000_000, help="Число траекторий (Paths)")
+    parser.add_argument("--years", type=int, default=30, help="Горизонт (Horizon)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--scenario", help="Файл сценария или имя из scenarios/")
+    parser.add_argument("--chunk-paths", type=int, default=20_000, help="Траекторий в блоке счета")
+    parser.add_argument("--row-group", type=int, default=DEFAULT_ROW_GROUP, help="Строк в группе")
+    args = parser.parse_args(argv)
+
+    from Neuro_Estate_MonteCarlo import BatchEstateEngine
+
+    model = None
+    if args.scenario:
+        from Neuro_Estate_Scenario import load_scenario
+
+        model = load_scenario(args.scenario).model
+
+    def progress(done: int, total: int):
+        sys.stderr.write(f"\r{done:,}/{total:,} траекторий ({done / total:.0%})")
+        if done == total:
+            sys.stderr.write("\n")
+
+    writer = open_writer(args.output, args.row_group)
+    with writer:
+        rows = export_batch(writer, args.paths, args.years, args.seed, BatchEstateEngine(model=model),
+                            args.chunk_paths, progress=progress)
+    print(f"Записано (Written): {rows:,} строк -> {writer.path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
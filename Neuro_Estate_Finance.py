@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+💹 NEURO-ESTATE Financial Metrics
+=================================
+NPV, IRR, ROI и срок окупаемости по ТЭО, раздел 5.4 — сразу для N траекторий.
+(Batched NPV / IRR / ROI / payback over whole arrays of net-income paths.)
+
+Все функции принимают матрицу чистой прибыли (N, T) — годы 1..T — и сумму
+инвестиций IC в год 0 (по умолчанию CAPEX), число или массив (N,). Одномерный ряд считается одной
+траекторией.
+
+    NPV     = sum_t CF_t / (1 + r)^t - IC
+    IRR     = ставка, при которой NPV = 0
+    ROI     = sum_t CF_t / IC * 100%
+    Payback = IC / среднегодовой чистый доход
+
+IRR ищется векторным методом Ньютона с теплым стартом; траектории, где Ньютон
+не сошелся, досчитываются бисекцией на найденной вилке (bracket fallback).
+
+Usage:
+    result = BatchEstateEngine().run(100_000, 30, seed=1)
+    metrics = portfolio_metrics(result.net_income, discount_rate=0.10)
+"""
+
+from typing import Dict
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from Neuro_Estate_OS import CAPEX
+
+DEFAULT_INVESTMENT = float(sum(CAPEX.values()))  # IC: стартовый CAPEX
+MAX_IRR = 2.0 ** 20  # Правый край вилки после 20 удвоений (~1e6); выше IRR не ищется
+
+def _as_paths(cash_flows) -> np.ndarray:
+    flows = np.asarray(cash_flows, dtype=np.float64)
+    return flows[None, :] if flows.ndim == 1 else flows
+
+def _squeeze(values: np.ndarray, cash_flows):
+    return values[0] if np.ndim(cash_flows) == 1 else values
+
+def _per_path(investment, flows: np.ndarray) -> np.ndarray:
+    """IC как массив (N,): число или свой CAPEX у каждой траектории."""
+    return np.broadcast_to(np.asarray(investment, dtype=np.float64), flows.shape[:1])
+
+# --- NPV / ROI / PAYBACK ---
+
+def npv(cash_flows, discount_rate, investment: ArrayLike = DEFAULT_INVESTMENT):
+    """Чистая приведенная стоимость (NPV); discount_rate — число или массив (N,)."""
+    flows = _as_paths(cash_flows)
+    value, _ = _npv_with_slope(flows, np.broadcast_to(np.asarray(discount_rate, dtype=np.float64),
+                                                      flows.shape[:1]), investment)
+    return _squeeze(value, cash_flows)
+
+def roi(cash_flows, investment: ArrayLike = DEFAULT_INVESTMENT):
+    """ROI = накопленная чистая прибыль / инвестиции × 100%."""
+    flows = _as_paths(cash_flows)
+    return _squeeze(flows.sum(axis=1) / investment * 100.0, cash_flows)
+
+def payback_period(cash_flows, investment: ArrayLike = DEFAULT_INVESTMENT):
+    """Срок окупаемости по ТЭО: IC / среднегодовой чистый доход (inf при доходе <= 0)."""
+    flows = _as_paths(cash_flows)
+    mean = flows.mean(axis=1)
+    with np.errstate(divide="ignore"):
+        years = np.where(mean > 0, investment / mean, np.inf)
+    return _squeeze(years, cash_flows)
+
+def payback_year(cash_flows, investment: ArrayLike = DEFAULT_INVESTMENT, discount_rate: float = 0.0):
+    """
+    Фактический срок окупаемости (Cumulative payback): первый момент, когда накопленный
+    (при discount_rate > 0 — дисконтированный) поток покрывает IC, с интерполяцией
+    внутри года. NaN, если за горизонт не окупилось.
+    """
+    flows = _as_paths(cash_flows)
+    investment = _per_path(investment, flows)
+    t = np.arange(1, flows.shape[1] + 1)
+    discounted = flows / (1.0 + discount_rate) ** t
+    cumulative = np.cumsum(discounted, axis=1)
+    reached = cumulative >= investment[:, None]
+    hit = reached.any(axis=1)
+    first = np.argmax(reached, axis=1)
+    rows = np.arange(flows.shape[0])
+    before = np.where(first > 0, cumulative[rows, first - 1], 0.0)
+    step = discounted[rows, first]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        years = first + (investment - before) / step
+    return _squeeze(np.where(hit, years, np.nan), cash_flows)
+
+# --- IRR ---
+
+def _npv_with_slope(flows: np.ndarray, rate: np.ndarray, investment: np.ndarray):
+    """NPV и dNPV/dr схемой Горнера по v = 1/(1+r) (Horner in the discount factor)."""
+    v = 1.0 / (1.0 + rate)
+    q = np.zeros_like(v)
+    dq = np.zeros_like(v)
+    for t in range(flows.shape[1] - 1, -1, -1):
+        dq = dq * v + q
+        q = q * v + flows[:, t]
+    # P(v) = v*Q(v);  dP/dr = (Q + v*Q') * dv/dr,  dv/dr = -v^2
+    value = v * q - investment
+    slope = -(q + v * dq) * v * v
+    return value, slope
+
+def _initial_guess(flows: np.ndarray, investment: np.ndarray) -> np.ndarray:
+    """Оценка по среднему потоку (Guess from the mean-flow annuity multiple)."""
+    total = flows.sum(axis=1)
+    horizon = flows.shape[1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        guess = (np.maximum(total, 1e-9) / investment) ** (2.0 / (horizon + 1)) - 1.0
+    return np.clip(np.nan_to_num(guess, nan=0.1), -0.9, 10.0)
+
+def _bisect(flows, investment, lo, hi, iterations: int = 200, tol: float = 1e-12):
+    f_lo, _ = _npv_with_slope(flows, lo, investment)
+    for _ in range(iterations):
+        mid = 0.5 * (lo + hi)
+        f_mid, _ = _npv_with_slope(flows, mid, investment)
+        left = np.sign(f_mid) == np.sign(f_lo)
+        lo = np.where(left, mid, lo)
+        f_lo = np.where(left, f_mid, f_lo)
+        hi = np.where(left, hi, mid)
+        if np.all(hi - lo < tol):
+            break
+    return 0.5 * (lo + hi)
+
+def irr(cash_flows, investment: ArrayLike = DEFAULT_INVESTMENT, guess=None,
+        tol: float = 1e-10, max_iter: int = 50):
+    """
+    Внутренняя норма доходности для N траекторий (Vectorized IRR).
+
+    `guess` — теплый старт: число или массив (N,), например IRR прошлого прогона.
+    Траектории без смены знака NPV на [-99%, 1e6] или с переполнением NPV на
+    краях вилки дают NaN, без RuntimeWarning.
+    """
+    flows = _as_paths(cash_flows)
+    n = flows.shape[0]
+    investment = _per_path(investment, flows)
+    rate = _initial_guess(flows, investment) if guess is None else \
+        np.array(np.broadcast_to(np.asarray(guess, dtype=np.float64), (n,)))
+    scale = investment + np.abs(flows).sum(axis=1)
+    active = np.ones(n, dtype=bool)
+    converged = np.zeros(n, dtype=bool)
+
+    # Ньютон только по еще не сошедшимся траекториям
+    for _ in range(max_iter):
+        idx = np.flatnonzero(active)
+        if idx.size == 0:
+            break
+        with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+            value, slope = _npv_with_slope(flows[idx], rate[idx], investment[idx])
+            step = value / slope
+        # Переполнение NPV: шаг бессмыслен, траектория уходит в проверку вилкой
+        new_rate = np.where(np.isfinite(value) & np.isfinite(slope), rate[idx] - step, np.nan)
+        rate[idx] = new_rate
+        # Сходимость — только по NPV; шаг исчез при большом NPV — в вилку (stalled -> bracket)
+        done = np.abs(value) <= tol * scale[idx]
+        stalled = np.abs(step) <= tol * (1.0 + np.abs(new_rate))
+        converged[idx[done]] = True
+        active[idx[done | stalled | np.isnan(new_rate)]] = False
+
+    # Fallback: вилка [-0.99, hi] и бисекция там, где Ньютон ушел, застрял или не сошелся
+    bad = ~converged | ~np.isfinite(rate) | (rate <= -1.0) | (rate > MAX_IRR)
+    if bad.any():
+        idx = np.flatnonzero(bad)
+        sub = flows[idx]
+        lo = np.full(idx.size, -0.99)
+        hi = np.ones(idx.size)
+        with np.errstate(over="ignore", invalid="ignore"):
+            f_lo, _ = _npv_with_slope(sub, lo, investment[idx])
+            for _ in range(20):
+                f_hi, _ = _npv_with_slope(sub, hi, investment[idx])
+                widen = np.sign(f_hi) == np.sign(f_lo)
+                if not widen.any():
+                    break
+                hi = np.where(widen, hi * 2.0, hi)
+            # Переполнение на краю вилки — знаку не верим (Overflowed ends give no bracket)
+            bracketed = (np.sign(f_hi) != np.sign(f_lo)) & np.isfinite(f_lo) & np.isfinite(f_hi)
+            rate[idx] = np.where(bracketed, _bisect(sub, investment[idx], lo, hi), np.nan)
+    # Траектории, где расчет переполнился, дают NaN (Overflowed paths -> NaN)
+    rate[~np.isfinite(rate)] = np.nan
+    return _squeeze(rate, cash_flows)
+
+# --- PORTFOLIO ---
+
+def portfolio_metrics(cash_flows, investment: ArrayLike = DEFAULT_INVESTMENT,
+                      discount_rate: float = 0.10, guess=None) -> Dict[str, np.ndarray]:
+    """Все показатели раздела 5.4 по каждой траектории (All section 5.4 metrics per path)."""
+    flows = _as_paths(cash_flows)
+    return {
+        "npv": npv(flows, discount_rate, investment),
+        "irr": irr(flows, investment, guess=guess),
+        "roi": roi(flows, investment),
+        "payback_period": payback_period(flows, investment),
+        "payback_year": payback_year(flows, investment),
+    }
+
+def summarize(metrics: Dict[str, np.ndarray], percentiles=(5, 50, 95)) -> Dict[str, Dict[str, float]]:
+    """Перцентили и среднее по портфелю (Portfolio percentiles, NaN/inf-safe)."""
+    out = {}
+    for name, values in metrics.items():
+        finite = values[np.isfinite(values)]
+        row = {"mean": float(finite.mean()) if finite.size else float("nan"),
+               "finite_share": finite.size / max(1, values.size)}
+        for p in percentiles:
+            row[f"p{p}"] = float(np.percentile(finite, p)) if finite.size else float("nan")
+        out[name] = row
+    return out
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧮 NEURO-ESTATE Incremental What-If
+===================================
+Инкрементальный пересчет Monte Carlo при смене одного параметра
+(Incremental Monte Carlo recomputation for notebook sliders).
+
+Расчет — граф зависимостей (DependencyGraph) из трех слоев:
+
+  * параметры модели — листья с именами из EstateModel.parameters()
+    ("revenue.tourism.base", "autonomy.rate", ...);
+  * колонки по годам (T,): каждый поток выручки и расходов, каждый не-денежный
+    актив, стартовый остаток денег;
+  * агрегаты: суммы выручки и расходов, общая часть резервов и стоимости, и
+    матрицы (N, T) по траекториям.
+
+Траектории различаются только событиями, поэтому накопленное влияние событий
+(N, T) зависит лишь от event_threshold и считается один раз. Смена базы туризма
+пересчитывает колонку туризма, сумму выручки, общие ряды длины T и одно
+сложение (N, T) — миллисекунды даже на 100k траекторий. Результат совпадает с
+BatchEstateEngine.run(..., seed) с точностью до округления (другой порядок
+сложения резервов).
+
+Usage:
+    what_if = IncrementalEstate(n_paths=100_000, years=30, seed=42)
+    what_if["final_valuation"]                       # (N,)
+    what_if.set_parameter("revenue.tourism.base", 800_000)
+    what_if["final_valuation"]                       # пересчитаны 5 узлов, ~1 мс
+    what_if.last_recomputed                          # какие именно
+"""
+
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from Neuro_Estate_Model import EstateModel
+from Neuro_Estate_MonteCarlo import BatchResult, sample_event_indices
+from Neuro_Estate_OS import NEURO_MODEL
+
+# --- GRAPH ---
+
+class DependencyGraph:
+    """
+    Ленивый граф вычислений с кэшем (Lazy memoised computation graph).
+    Узел считается при первом запросе; смена входа сбрасывает только зависимые узлы.
+    """
+
+    def __init__(self):
+        self._compute: Dict[str, Optional[Callable]] = {}
+        self._deps: Dict[str, tuple] = {}
+        self._dependents: Dict[str, List[str]] = {}
+        self._values: Dict[str, object] = {}
+        self.computed: List[str] = []   # Журнал пересчетов (Recompute log)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._deps
+
+    def add_input(self, name: str, value):
+        self._add(name, None, ())
+        self._values[name] = value
+
+    def add(self, name: str, compute: Callable, deps: Sequence[str] = ()):
+        """Узел compute(*значения deps) (Node computed from its dependencies' values)."""
+        self._add(name, compute, tuple(deps))
+
+    def _add(self, name: str, compute, deps: tuple):
+        if name in self._deps:
+            raise ValueError(f"Node {name!r} already exists")
+        missing = [dep for dep in deps if dep not in self._deps]
+        if missing:
+            raise KeyError(f"Node {name!r} depends on unknown nodes {missing}")
+        self._compute[name] = compute
+        self._deps[name] = deps
+        self._dependents[name] = []
+        for dep in deps:
+            self._dependents[dep].append(name)
+
+    def set(self, name: str, value):
+        if self._compute.get(name, True) is not None:
+            raise KeyError(f"{name!r} is not an input node")
+        self._values[name] = value
+        self.invalidate(name)
+
+    def invalidate(self, name: str):
+        """Сбросить кэш всех узлов ниже name (Drop cached values downstream of a node)."""
+        stack = list(self._dependents[name])
+        while stack:
+            node = stack.pop()
+            if self._values.pop(node, None) is not None:
+                stack.extend(self._dependents[node])
+
+    def get(self, name: str):
+        try:
+            return self._values[name]
+        except KeyError:
+            pass
+        if name not in self._deps:
+            raise KeyError(f"Unknown node {name!r}")
+        value = self._compute[name](*(self.get(dep) for dep in self._deps[name]))
+        self._values[name] = value
+        self.computed.append(name)
+        return value
+
+    def dependents(self, name: str) -> List[str]:
+        """Все узлы ниже name (Transitive dependents)."""
+        seen: List[str] = []
+        stack = list(self._dependents[name])
+        while stack:
+            node = stack.pop()
+            if node not in seen:
+                seen.append(node)
+                stack.extend(self._dependents[node])
+        return seen
+
+# --- ESTATE ---
+
+class IncrementalEstate:
+    """
+    Monte Carlo поместья как граф зависимостей (Monte Carlo estate as a dependency graph).
+
+    Узлы: "revenue.<поток>", "expenses.<поток>", "assets.<актив>", "opening_cash"
+    — колонки (T,); "base_revenue", "expenses", "fixed_assets", "base_net_income",
+    "base_valuation" — общие ряды (T,); "event_index", "event_impact",
+    "event_cumulative", "revenue", "net_income", "capital_valuation" — (N, T);
+    "final_valuation" — (N,).
+    """
+
+    def __init__(self, n_paths: int, years: int, seed=None, model: Optional[EstateModel] = None,
+                 event_index: Optional[np.ndarray] = None):
+        self.model = model if model is not None else NEURO_MODEL
+        self.n_paths = n_paths
+        self.years = years
+        self.seed = seed
+        if event_index is not None and event_index.shape != (n_paths, years):
+            raise ValueError(f"event_index shape {event_index.shape} != {(n_paths, years)}")
+        self._fixed_events = event_index
+        self.graph = DependencyGraph()
+        self.last_recomputed: List[str] = []
+        self._build()
+
+    # --- graph layout ---
+
+    def _build(self):
+        graph = self.graph
+        model = self.model
+        params = model.parameters()
+        for name, value in params.items():
+            graph.add_input(name, value)
+
+        def group(prefix):
+            return [name for name in params if name.startswith(prefix)]
+
+        tech = group("tech.")
+        autonomy = group("autonomy.")
+        capex = group("capex.")
+
+        for stream in model.revenue:
+            deps = group(f"revenue.{stream.name}.") + (tech if stream.tech_sensitive else [])
+            graph.add(f"revenue.{stream.name}", self._column(self._revenue_value, stream.name), deps)
+        for stream in model.expenses:
+            deps = group(f"expenses.{stream.name}.") + autonomy + (tech if model.autonomy else [])
+            graph.add(f"expenses.{stream.name}", self._column(self._expense_value, stream.name), deps)
+
+        opening = model.opening_balance()
+        fixed = [name for name in opening if name != model.cash_asset]
+        for name in fixed:
+            deps = group(f"assets.{name}.")
+            if name in (model.capex_asset, model.capex_funding):
+                deps += capex
+            graph.add(f"assets.{name}", self._asset_column(name), deps)
+        cash_deps = capex if model.cash_asset in (model.capex_asset, model.capex_funding) else []
+        graph.add("opening_cash", lambda *_: self.model.opening_balance()[self.model.cash_asset], cash_deps)
+
+        # Суммы в порядке модели — те же операции, что EstateModel.cash_flows и ядро
+        graph.add("base_revenue", self._column_sum, [f"revenue.{s.name}" for s in model.revenue])
+        graph.add("expenses", self._column_sum, [f"expenses.{s.name}" for s in model.expenses])
+        graph.add("fixed_assets", self._column_sum, [f"assets.{name}" for name in fixed])
+        graph.add("base_net_income", np.subtract, ["base_revenue", "expenses"])
+        graph.add("base_valuation",
+                  lambda net, cash, assets: assets + (cash + np.cumsum(net)),
+                  ["base_net_income", "opening_cash", "fixed_assets"])
+
+        # Часть, зависящая от траектории: только события
+        graph.add("event_index", self._event_index, ["event_threshold"])
+        impacts = np.array([impact for _, _, impact in model.events] + [0.0], dtype=np.float64)
+        graph.add("event_impact", lambda index: impacts[index], ["event_index"])
+        graph.add("event_cumulative", lambda impact: np.cumsum(impact, axis=1), ["event_impact"])
+
+        graph.add("revenue", np.add, ["base_revenue", "event_impact"])
+        graph.add("net_income", np.add, ["base_net_income", "event_impact"])
+        graph.add("capital_valuation", np.add, ["base_valuation", "event_cumulative"])
+        graph.add("final_valuation", lambda base, cumulative: base[-1] + cumulative[:, -1],
+                  ["base_valuation", "event_cumulative"])
+
+    def _column(self, value: Callable, name: str) -> Callable:
+        def compute(*_):
+            return np.array([value(name, year) for year in range(1, self.years + 1)], dtype=np.float64)
+        return compute
+
+    def _revenue_value(self, name: str, year: int) -> float:
+        model = self.model
+        stream = next(s for s in model.revenue if s.name == name)
+        return stream.value(year, model.tech_multiplier(year))
+
+    def _expense_value(self, name: str, year: int) -> float:
+        model = self.model
+        stream = next(s for s in model.expenses if s.name == name)
+        if year < stream.first_year:
+            return 0
+        if model.autonomy is None:
+            return stream.base * stream.growth.factor(year)
+        discount = model.autonomy(year, model.tech_multiplier(year))
+        return stream.base * (1 - discount) * stream.growth.factor(year)
+
+    def _column_sum(self, *columns: np.ndarray) -> np.ndarray:
+        total = np.zeros(self.years)
+        for column in columns:
+            total = total + column
+        return total
+
+    def _asset_column(self, name: str) -> Callable:
+        def compute(*_):
+            model = self.model
+            rule = dict(model.asset_rules).get(name)
+            value = model.opening_balance()[name]
+            out = np.empty(self.years)
+            for t in range(self.years):
+                if rule is not None:
+                    value = rule.apply(value, t + 1)
+                out[t] = value
+            return out
+        return compute
+
+    def _event_index(self, threshold: float) -> np.ndarray:
+        if self._fixed_events is not None:
+            return self._fixed_events
+        # Тот же seed при новом пороге: общие случайные числа для сравнения сценариев
+        return sample_event_indices(self.n_paths, self.years, np.random.default_rng(self.seed),
+                                    self.model.events, threshold)
+
+    # --- what-if API ---
+
+    def set_parameter(self, name: str, value: float):
+        self.set_parameters({name: value})
+
+    def set_parameters(self, values: Dict[str, float]):
+        """Новые значения параметров; сбрасываются только зависимые узлы (Invalidate dependents only)."""
+        if "event_threshold" in values and self._fixed_events is not None:
+            raise ValueError("event_threshold cannot change when event_index is given explicitly")
+        self.model = self.model.with_parameters(values)
+        for name, value in values.items():
+            self.graph.set(name, value)
+
+    def set_streams(self, **bases):
+        """Новые базы потоков по имени (New stream bases by name), e.g. tourism=800_000."""
+        values = {}
+        for stream in self.model.revenue:
+            if stream.name in bases:
+                values[f"revenue.{stream.name}.base"] = bases[stream.name]
+        for stream in self.model.expenses:
+            if stream.name in bases:
+                values[f"expenses.{stream.name}.base"] = bases[stream.name]
+        unknown = set(bases) - {name.split(".")[1] for name in values}
+        if unknown:
+            raise KeyError(f"Unknown streams: {sorted(unknown)}")
+        self.set_parameters(values)
+
+    def get(self, node: str):
+        """Значение узла; пересчитанные узлы — в last_recomputed (Node value, computed lazily)."""
+        start = len(self.graph.computed)
+        value = self.graph.get(node)
+        self.last_recomputed = self.graph.computed[start:]
+        return value
+
+    __getitem__ = get
+
+    def result(self) -> BatchResult:
+        """Полный BatchResult, как у BatchEstateEngine.run (Full per-path result)."""
+        expenses = self.get("expenses")
+        return BatchResult(
+            year=np.arange(1, self.years + 1),
+            revenue=self.get("revenue"),
+            expenses=np.broadcast_to(expenses, (self.n_paths, self.years)),
+            net_income=self.get("net_income"),
+            capital_valuation=self.get("capital_valuation"),
+            event_index=self.get("event_index"),
+            events=self.model.events,
+        )
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧬 NEURO-ESTATE Model Core
+==========================
+Единое декларативное описание модели поместья.
+(One declarative estate model shared by every engine.)
+
+Модель — это набор потоков доходов и расходов, правил роста активов и CAPEX.
+Рост задается политикой: сложный процент (CompoundGrowth, как в NEURO-ESTATE OS)
+или линейный (LinearGrowth, как в Ancestral_Estate_Model). Политики
+взаимозаменяемы, а все движки — скалярное ядро, AncestralEstate, пакетный
+Monte Carlo и аналитический расчет — читают одну и ту же модель.
+
+Модуль не зависит ни от чего, кроме стандартной библиотеки.
+"""
+
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# --- GROWTH POLICIES ---
+
+@dataclass(frozen=True)
+class CompoundGrowth:
+    """Сложный рост (Compound): factor(year) = rate ** year."""
+    rate: float
+
+    def factor(self, year: int):
+        return self.rate ** year
+
+@dataclass(frozen=True)
+class LinearGrowth:
+    """Линейный рост (Linear): factor(year) = 1 + slope * year."""
+    slope: float
+
+    def factor(self, year: int):
+        return 1 + year * self.slope
+
+@dataclass(frozen=True)
+class FlatGrowth:
+    """Без роста (No growth): factor(year) = 1."""
+
+    def factor(self, year: int):
+        return 1
+
+FLAT = FlatGrowth()
+
+# --- STREAMS ---
+
+@dataclass(frozen=True)
+class Stream:
+    """Поток доходов или расходов (Revenue or expense stream)."""
+    name: str
+    base: float
+    growth: object = FLAT
+    first_year: int = 1           # Поток активен с этого года (Active from this year)
+    tech_sensitive: bool = False  # Умножается на множитель техно-апгрейда
+
+    def value(self, year: int, tech_multiplier: float = 1.0):
+        if year < self.first_year:
+            return 0
+        value = self.base * self.growth.factor(year)
+        return value * tech_multiplier if self.tech_sensitive else value
+
+@dataclass(frozen=True)
+class AutonomyDiscount:
+    """Скидка автономии на расходы (Autonomy discount): min(cap, rate * year * tech)."""
+    rate: float
+    cap: float
+
+    def __call__(self, year: int, tech_multiplier: float = 1.0) -> float:
+        return min(self.cap, self.rate * year * tech_multiplier)
+
+@dataclass(frozen=True)
+class TechUpgrade:
+    year: int
+    level: str          # Имя уровня TechLevel (e.g. "ADVANCED")
+    multiplier: float   # Множитель потоков в год апгрейда
+
+# --- ASSET RULES ---
+
+@dataclass(frozen=True)
+class Appreciation:
+    """Актив дорожает на rate в год (value *= rate)."""
+    rate: float
+
+    def apply(self, value, year: int):
+        return value * self.rate
+
+@dataclass(frozen=True)
+class Accrual:
+    """К активу прибавляется amount * growth.factor(year) в год."""
+    amount: float
+    growth: object = FLAT
+
+    def apply(self, value, year: int):
+        return value + self.amount * self.growth.factor(year)
+
+# --- EVENT SAMPLING ---
+
+class AliasTable:
+    """
+    Взвешенная выборка методом алиасов Уокера–Воуза (Walker/Vose alias method).
+
+    Построение O(k), выборка O(1) при любом числе событий k: одна равномерная
+    величина u ∈ [0, 1) выбирает столбец и сравнивается с его порогом `prob`.
+    """
+
+    def __init__(self, weights: Sequence[float]):
+        k = len(weights)
+        total = float(sum(weights))
+        if k == 0 or total <= 0 or min(weights) < 0:
+            raise ValueError(f"Weights must be non-negative with a positive sum: {list(weights)}")
+        scaled = [w * k / total for w in weights]
+        self.prob: List[float] = [1.0] * k
+        self.alias: List[int] = list(range(k))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            lo, hi = small.pop(), large.pop()
+            self.prob[lo] = scaled[lo]
+            self.alias[lo] = hi
+            scaled[hi] -= 1.0 - scaled[lo]
+            (small if scaled[hi] < 1.0 else large).append(hi)
+        # Остатки — полные столбцы (ошибки округления дают p ≈ 1)
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def __len__(self) -> int:
+        return len(self.prob)
+
+    def sample(self, u: float) -> int:
+        """Индекс события по одной равномерной величине u ∈ [0, 1)."""
+        x = u * len(self.prob)
+        i = int(x)
+        return i if x - i < self.prob[i] else self.alias[i]
+
+def _policy_fields(policy) -> Dict[str, float]:
+    """Числовые поля политики роста или правила актива (e.g. {"rate": 1.05})."""
+    return {key: value for key, value in vars(policy).items() if isinstance(value, (int, float))}
+
+# --- MODEL ---
+
+@dataclass(frozen=True)
+class EstateModel:
+    """
+    Полная модель поместья (The whole estate model). Все поля — кортежи, поэтому
+    модель хешируема и может быть ключом кэша (таблицы роста, сценарии).
+    """
+    name: str
+    revenue: Tuple[Stream, ...]
+    expenses: Tuple[Stream, ...]
+    initial_assets: Tuple[Tuple[str, float], ...]
+    asset_rules: Tuple[Tuple[str, object], ...]
+    capex: Tuple[Tuple[str, float], ...]
+    cash_asset: str                       # Сюда идет чистая прибыль (Receives net income)
+    capex_asset: Optional[str] = None     # Актив, равный сумме CAPEX (Capitalised CAPEX)
+    capex_funding: Optional[str] = None   # Актив, из которого оплачен CAPEX
+    autonomy: Optional[AutonomyDiscount] = None
+    tech_upgrades: Tuple[TechUpgrade, ...] = ()
+    events: Tuple[Tuple[float, str, float], ...] = ()  # (вес, описание, влияние)
+    event_threshold: float = 1.0          # Событие, если random() > порога
+    _upgrades: Dict[int, TechUpgrade] = field(init=False, compare=False, hash=False, repr=False)
+    event_table: Optional[AliasTable] = field(init=False, compare=False, hash=False, repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_upgrades", {u.year: u for u in self.tech_upgrades})
+        table = AliasTable([weight for weight, _, _ in self.events]) if self.events else None
+        object.__setattr__(self, "event_table", table)
+
+    @property
+    def total_capex(self):
+        return sum(amount for _, amount in self.capex)
+
+    def upgrade_for(self, year: int) -> Optional[TechUpgrade]:
+        return self._upgrades.get(year)
+
+    def tech_multiplier(self, year: int) -> float:
+        upgrade = self._upgrades.get(year)
+        return upgrade.multiplier if upgrade else 1.0
+
+    def cash_flows(self, year: int):
+        """Выручка и расходы года до случайных событий (Revenue and expenses before events)."""
+        tech_multiplier = self.tech_multiplier(year)
+        revenue = 0
+        for stream in self.revenue:
+            revenue += stream.value(year, tech_multiplier)
+        expenses = 0
+        for stream in self.expenses:
+            if year < stream.first_year:
+                continue
+            if self.autonomy is None:
+                expenses += stream.base * stream.growth.factor(year)
+            else:
+                discount = self.autonomy(year, tech_multiplier)
+                expenses += stream.base * (1 - discount) * stream.growth.factor(year)
+        return revenue, expenses
+
+    def opening_balance(self) -> Dict[str, float]:
+        """Активы после CAPEX (Assets right after the initial investment)."""
+        assets = dict(self.initial_assets)
+        total = self.total_capex
+        if self.capex_asset is not None:
+            assets[self.capex_asset] = total
+        if self.capex_funding is not None:
+            assets[self.capex_funding] -= total
+        return assets
+
+    def grow_assets(self, assets: Dict[str, float], year: int):
+        """Годовой рост не-денежных активов на месте (In-place yearly asset growth)."""
+        for name, rule in self.asset_rules:
+            assets[name] = rule.apply(assets[name], year)
+
+    def parameters(self) -> Dict[str, float]:
+        """
+        Плоский словарь числовых параметров (Flat dict of numeric parameters), ключи:
+        revenue.<поток>.base / .rate / .slope, expenses.<поток>.*, autonomy.rate / .cap,
+        tech.<год>.multiplier, assets.<актив>.rate / .amount, capex.<статья>, event_threshold.
+        """
+        out: Dict[str, float] = {}
+        for group, streams in (("revenue", self.revenue), ("expenses", self.expenses)):
+            for stream in streams:
+                out[f"{group}.{stream.name}.base"] = stream.base
+                for key, value in _policy_fields(stream.growth).items():
+                    out[f"{group}.{stream.name}.{key}"] = value
+        if self.autonomy is not None:
+            out["autonomy.rate"] = self.autonomy.rate
+            out["autonomy.cap"] = self.autonomy.cap
+        for upgrade in self.tech_upgrades:
+            out[f"tech.{upgrade.year}.multiplier"] = upgrade.multiplier
+        for name, rule in self.asset_rules:
+            for key, value in _policy_fields(rule).items():
+                out[f"assets.{name}.{key}"] = value
+        for item, amount in self.capex:
+            out[f"capex.{item}"] = amount
+        out["event_threshold"] = self.event_threshold
+        return out
+
+    def with_parameters(self, values: Dict[str, float]) -> "EstateModel":
+        """Копия с новыми значениями параметров из parameters() (Copy with parameters replaced)."""
+        unknown = set(values) - set(self.parameters())
+        if unknown:
+            raise KeyError(f"Unknown parameters: {sorted(unknown)}")
+        if not values:
+            return self
+
+        def patch(obj, prefix):
+            changes = {key: values[prefix + key] for key in _policy_fields(obj) if prefix + key in values}
+            return replace(obj, **changes) if changes else obj
+
+        def streams(group, items):
+            out = []
+            for stream in items:
+                prefix = f"{group}.{stream.name}."
+                out.append(replace(stream, base=values.get(prefix + "base", stream.base),
+                                   growth=patch(stream.growth, prefix)))
+            return tuple(out)
+
+        autonomy = self.autonomy
+        if autonomy is not None:
+            autonomy = AutonomyDiscount(values.get("autonomy.rate", autonomy.rate),
+                                        values.get("autonomy.cap", autonomy.cap))
+        return replace(
+            self,
+            revenue=streams("revenue", self.revenue),
+            expenses=streams("expenses", self.expenses),
+            autonomy=autonomy,
+            tech_upgrades=tuple(replace(u, multiplier=values.get(f"tech.{u.year}.multiplier", u.multiplier))
+                                for u in self.tech_upgrades),
+            asset_rules=tuple((name, patch(rule, f"assets.{name}.")) for name, rule in self.asset_rules),
+            capex=tuple((item, values.get(f"capex.{item}", amount)) for item, amount in self.capex),
+            event_threshold=values.get("event_threshold", self.event_threshold),
+        )
+
+    def with_streams(self, **bases) -> "EstateModel":
+        """Копия с новыми базами потоков (Copy with new stream bases), e.g. tourism=800_000."""
+        def rebase(streams):
+            return tuple(replace(s, base=bases[s.name]) if s.name in bases else s for s in streams)
+        unknown = set(bases) - {s.name for s in self.revenue + self.expenses}
+        if unknown:
+            raise KeyError(f"Unknown streams: {sorted(unknown)}")
+        return replace(self, revenue=rebase(self.revenue), expenses=rebase(self.expenses))
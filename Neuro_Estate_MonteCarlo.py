@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🎲 NEURO-ESTATE Monte Carlo Engine
+==================================
+Пакетный движок: N поместий × T лет за один проход NumPy.
+(Batched engine: N estates × T years in a single NumPy pass.)
+
+Детерминированная часть года (выручка, расходы, рост активов) одинакова для всех
+траекторий и считается один раз на год по той же EstateModel, что и в `NeuroEstateKernel`.
+Векторизуется только то, что различается между траекториями: случайные события
+и накопление крипто-резервов. С `drivers=MacroDrivers(...)` к ним добавляются
+коррелированные макро-факторы: инфляция расходов, курс крипты, урожай.
+
+Usage:
+    engine = BatchEstateEngine()
+    result = engine.run(n_paths=100_000, years=30, seed=42)
+    result.capital_valuation[:, -1]   # финальная стоимость всех поместий
+    stressed = engine.run(100_000, 30, seed=42, drivers=MacroDrivers(df=4))
+"""
+
+import random
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from Neuro_Estate_Model import AliasTable, EstateModel
+from Neuro_Estate_OS import (
+    EVENT_THRESHOLD,
+    RANDOM_EVENTS,
+    DEFAULT_GROWTH,
+    FinancialReport,
+    GrowthRates,
+    growth_table,
+    neuro_estate_model,
+)
+
+NO_EVENT = -1  # Код "события не было" в матрице событий (No event code)
+
+# --- EVENT DRAWS ---
+
+def sample_event_indices(n_paths: int, years: int, rng: Optional[np.random.Generator] = None,
+                         events=RANDOM_EVENTS, threshold: float = EVENT_THRESHOLD) -> np.ndarray:
+    """
+    Векторная выборка событий (Vectorized event draws): int16 матрица (N, T),
+    индекс в `events` (по умолчанию RANDOM_EVENTS) или NO_EVENT.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    n_events = len(events)
+    if n_events == 0 or threshold >= 1.0:
+        return np.full((n_paths, years), NO_EVENT, dtype=np.int16)
+    table = AliasTable([evt[0] for evt in events])
+    prob = np.array(table.prob)
+    alias = np.array(table.alias, dtype=np.int16)
+    # Одна равномерная величина на год: выше порога ее остаток, растянутый на
+    # [0, k), выбирает столбец алиас-таблицы и сравнивается с его порогом — O(1)
+    # на выборку при любом числе событий k
+    u = rng.random((n_paths, years))
+    fired = u > threshold
+    u -= threshold
+    u *= n_events / (1.0 - threshold)
+    np.clip(u, 0.0, np.nextafter(n_events, 0), out=u)
+    column = u.astype(np.int16)
+    u -= column
+    out = np.where(u < prob[column], column, alias[column])
+    out[~fired] = NO_EVENT
+    return out
+
+def python_event_indices(seed, n_paths: int, years: int, events=RANDOM_EVENTS,
+                         threshold: float = EVENT_THRESHOLD) -> np.ndarray:
+    """
+    Повтор потока скалярного ядра (Replays the scalar kernel's RNG stream).
+    При n_paths=1 совпадает с `NeuroEstateKernel(config, seed=seed)`; при n_paths > 1
+    траектории идут подряд, как N ядер с одним общим `random.Random(seed)`.
+    """
+    stream = random.Random(seed)
+    out = np.full((n_paths, years), NO_EVENT, dtype=np.int16)
+    if not events:
+        return out
+    table = AliasTable([evt[0] for evt in events])
+    for i in range(n_paths):
+        for t in range(years):
+            if stream.random() > threshold:
+                out[i, t] = table.sample(stream.random())
+    return out
+
+# --- RESULTS ---
+
+@dataclass
+class BatchResult:
+    """Матрицы (N, T) по всем траекториям (Per-path, per-year arrays)."""
+    year: np.ndarray               # (T,)
+    revenue: np.ndarray            # (N, T)
+    expenses: np.ndarray           # (N, T), без факторов — read-only broadcast of one row
+    net_income: np.ndarray         # (N, T)
+    capital_valuation: np.ndarray  # (N, T)
+    event_index: np.ndarray        # (N, T), индекс в events модели или NO_EVENT
+    events: tuple = tuple(RANDOM_EVENTS)
+    drivers: Optional[object] = None  # DriverPaths, если прогон с макро-факторами
+
+    @property
+    def n_paths(self) -> int:
+        return self.revenue.shape[0]
+
+    def reports(self, path: int = 0) -> List[FinancialReport]:
+        """Годовые отчеты одной траектории (FinancialReport view of one path)."""
+        out = []
+        for t, year in enumerate(self.year):
+            code = int(self.event_index[path, t])
+            out.append(FinancialReport(
+                year=int(year),
+                revenue=float(self.revenue[path, t]),
+                expenses=float(self.expenses[path, t]),
+                net_income=float(self.net_income[path, t]),
+                capital_valuation=float(self.capital_valuation[path, t]),
+                events=[self.events[code][1]] if code != NO_EVENT else []
+            ))
+        return out
+
+# --- ENGINE ---
+
+class BatchEstateEngine:
+    """
+    Векторизованный аналог `NeuroEstateKernel.run_year()` для N траекторий.
+    (Vectorized counterpart of the scalar kernel.)
+    """
+
+    def __init__(self, growth_rates: GrowthRates = DEFAULT_GROWTH, model: Optional[EstateModel] = None):
+        self.model = model if model is not None else neuro_estate_model(growth_rates)
+        # Последний элемент 0.0 — влияние NO_EVENT (индекс -1)
+        self.event_impacts = np.array([evt[2] for evt in self.model.events] + [0.0], dtype=np.float64)
+
+    def deterministic_paths(self, years: int):
+        """
+        Общие для всех траекторий ряды (Shared per-year series): выручка без событий,
+        расходы и сумма не-ликвидных активов, посчитанные теми же операциями, что и ядро.
+        """
+        model = self.model
+        table = growth_table(model, years)
+        base_revenue = np.array(table.revenue[1:years + 1])
+        expenses = np.array(table.expenses[1:years + 1])
+        fixed_assets = np.empty(years)
+
+        assets = model.opening_balance()
+        for t in range(years):
+            model.grow_assets(assets, t + 1)
+            # Тот же порядок сложения, что и sum(self.assets.values()) в ядре
+            fixed = 0
+            for name, value in assets.items():
+                if name != model.cash_asset:
+                    fixed += value
+            fixed_assets[t] = fixed
+        return base_revenue, expenses, fixed_assets
+
+    def stream_values(self, name: str, years: int) -> np.ndarray:
+        """Годовые значения одного потока выручки без событий (One revenue stream, years 1..T)."""
+        model = self.model
+        for stream in model.revenue:
+            if stream.name == name:
+                return np.array([stream.value(year, model.tech_multiplier(year)) for year in range(1, years + 1)],
+                                dtype=np.float64)
+        raise KeyError(f"No revenue stream {name!r} in model {model.name!r}")
+
+    def run(self, n_paths: int, years: int, seed=None,
+            event_index: Optional[np.ndarray] = None, drivers=None) -> BatchResult:
+        """
+        Симуляция N траекторий на `years` лет (Simulates N paths).
+
+        `event_index` позволяет подать готовую матрицу событий, например
+        `python_event_indices(seed, 1, years)` для точного совпадения со скалярным ядром.
+        Для шардов берите seed=child_seed(root_seed, shard): потоки будут независимы.
+        `drivers` — MacroDrivers (Neuro_Estate_Drivers): инфляция расходов, курс
+        крипто-резервов и урожай органики; события при том же seed не меняются.
+        """
+        rng = np.random.default_rng(seed)
+        if event_index is None:
+            event_index = sample_event_indices(n_paths, years, rng, self.model.events,
+                                               self.model.event_threshold)
+        elif event_index.shape != (n_paths, years):
+            raise ValueError(f"event_index shape {event_index.shape} != {(n_paths, years)}")
+
+        base_revenue, expenses, fixed_assets = self.deterministic_paths(years)
+        opening_cash = self.model.opening_balance()[self.model.cash_asset]
+
+        revenue = base_revenue + self.event_impacts[event_index]
+        if drivers is None:
+            net_income = revenue - expenses
+
+            # Крипто-резервы: последовательное накопление, как `+=` в ядре
+            reserves = np.empty((n_paths, years + 1))
+            reserves[:, 0] = opening_cash
+            reserves[:, 1:] = net_income
+            np.cumsum(reserves, axis=1, out=reserves)
+            reserves = reserves[:, 1:]
+            expenses = np.broadcast_to(expenses, (n_paths, years))
+            paths = None
+        else:
+            paths = drivers.simulate(n_paths, years, rng)
+            revenue += self.stream_values(drivers.yield_stream, years) * (paths.yield_factor - 1.0)
+            expenses = expenses * paths.expense_index
+            net_income = revenue - expenses
+            # Резервы за год меняются с курсом, затем зачисляется прибыль; долг не в крипте
+            growth = paths.crypto_growth
+            reserves = np.empty((n_paths, years))
+            level = np.full(n_paths, opening_cash, dtype=np.float64)
+            for t in range(years):
+                level = np.where(level > 0, level * growth[:, t], level) + net_income[:, t]
+                reserves[:, t] = level
+
+        return BatchResult(
+            year=np.arange(1, years + 1),
+            revenue=revenue,
+            expenses=expenses,
+            net_income=net_income,
+            capital_valuation=fixed_assets + reserves,
+            event_index=event_index,
+            events=self.model.events,
+            drivers=paths,
+        )
@@ -18,13 +18,30 @@ Target Audience: Engineers, Visionaries, and Future Settlers.
 License: MIT
 """
 
+import argparse
+from array import array
+from collections import OrderedDict
+import functools
+import hashlib
+import json
+import os
 import time
 import random
 import sys
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 from enum import Enum
 
+from Neuro_Estate_Model import (
+    Appreciation,
+    AutonomyDiscount,
+    CompoundGrowth,
+    EstateModel,
+    Stream,
+    TechUpgrade,
+)
+
 # --- CONFIGURATION & CONSTANTS ---
 
 class TerminalColors:
@@ -38,11 +55,46 @@ class TerminalColors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
 
+class PlainColors(TerminalColors):
+    """Палитра без escape-кодов для headless режима (No-escape palette)."""
+    HEADER = BLUE = CYAN = GREEN = WARNING = FAIL = ENDC = BOLD = UNDERLINE = ''
+
 def cprint(text: str, color: str = TerminalColors.ENDC, end: str = "\n"):
     """Print colored text to terminal."""
     sys.stdout.write(f"{color}{text}{TerminalColors.ENDC}{end}")
     sys.stdout.flush()
 
+class PhaseTimer:
+    """
+    Учет времени по фазам (Exclusive wall time per phase, e.g. model vs presentation).
+    Вложенная фаза забирает свое время у внешней.
+    """
+
+    def __init__(self):
+        self.totals: Dict[str, float] = {}
+        self._stack: List[str] = []
+        self._mark = 0.0
+
+    def _flush(self):
+        now = time.perf_counter()
+        if self._stack:
+            name = self._stack[-1]
+            self.totals[name] = self.totals.get(name, 0.0) + (now - self._mark)
+        self._mark = now
+
+    @contextmanager
+    def phase(self, name: str):
+        self._flush()
+        self._stack.append(name)
+        try:
+            yield
+        finally:
+            self._flush()
+            self._stack.pop()
+
+    def summary(self) -> str:
+        return " | ".join(f"{name}: {seconds * 1e3:.2f} ms" for name, seconds in self.totals.items())
+
 # --- DATA STRUCTURES ---
 
 class TechLevel(Enum):
@@ -66,6 +118,472 @@ class FinancialReport:
     capital_valuation: float
     events: List[str]
 
+class HistoryStore:
+    """
+    Колоночная история ядра (Columnar, array-backed kernel history).
+
+    Вместо списка FinancialReport хранит предвыделенные float64 колонки и
+    колонку интернированных кодов событий (-1 = событий не было). Для старого
+    кода ведет себя как список: `history[-1]`, `len(history)`, `for r in history`
+    отдают FinancialReport. `to_numpy()` и `to_pandas()` не копируют данные.
+    """
+
+    COLUMNS = ("year", "revenue", "expenses", "net_income", "capital_valuation")
+
+    def __init__(self, capacity: int = 32):
+        self._size = 0
+        self._capacity = max(1, capacity)
+        self._columns = {name: array('d', bytes(8 * self._capacity)) for name in self.COLUMNS}
+        self._event_code = array('h', bytes(2 * self._capacity))
+        self.event_names: List[str] = []
+        self._event_lookup: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self):
+        # Новый буфер, а не resize: выданные numpy-представления остаются валидными
+        self._capacity *= 2
+        for name, column in self._columns.items():
+            grown = array('d', bytes(8 * self._capacity))
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+        grown = array('h', bytes(2 * self._capacity))
+        grown[:self._size] = self._event_code[:self._size]
+        self._event_code = grown
+
+    def intern(self, event: str) -> int:
+        """Код события (Interned event code); "" -> -1."""
+        if not event:
+            return -1
+        code = self._event_lookup.get(event)
+        if code is None:
+            code = self._event_lookup[event] = len(self.event_names)
+            self.event_names.append(event)
+        return code
+
+    def record(self, year: int, revenue: float, expenses: float, net_income: float,
+               capital_valuation: float, event: str = ""):
+        if self._size == self._capacity:
+            self._grow()
+        i = self._size
+        columns = self._columns
+        columns["year"][i] = year
+        columns["revenue"][i] = revenue
+        columns["expenses"][i] = expenses
+        columns["net_income"][i] = net_income
+        columns["capital_valuation"][i] = capital_valuation
+        self._event_code[i] = self.intern(event)
+        self._size += 1
+
+    def append(self, report: FinancialReport):
+        """Совместимость со списком (List-compatible append)."""
+        if len(report.events) > 1:
+            raise ValueError(f"HistoryStore keeps one event per year, got {len(report.events)}")
+        self.record(report.year, report.revenue, report.expenses, report.net_income,
+                    report.capital_valuation, report.events[0] if report.events else "")
+
+    def _report(self, i: int) -> FinancialReport:
+        columns = self._columns
+        code = self._event_code[i]
+        return FinancialReport(
+            year=int(columns["year"][i]),
+            revenue=columns["revenue"][i],
+            expenses=columns["expenses"][i],
+            net_income=columns["net_income"][i],
+            capital_valuation=columns["capital_valuation"][i],
+            events=[self.event_names[code]] if code >= 0 else []
+        )
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._report(i) for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("history index out of range")
+        return self._report(index)
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self._report(i)
+
+    def to_numpy(self) -> Dict[str, "np.ndarray"]:
+        """Колонки как numpy-представления без копирования (Zero-copy NumPy views)."""
+        import numpy as np
+
+        out = {name: np.frombuffer(column, dtype=np.float64, count=self._size)
+               for name, column in self._columns.items()}
+        out["event_code"] = np.frombuffer(self._event_code, dtype=np.int16, count=self._size)
+        return out
+
+    def state(self) -> dict:
+        """Снимок для контрольной точки (Checkpoint snapshot): строки 0..len-1 и имена событий."""
+        return {
+            "size": self._size,
+            "columns": {name: column[:self._size].tolist() for name, column in self._columns.items()},
+            "event_code": self._event_code[:self._size].tolist(),
+            "event_names": list(self.event_names),
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "HistoryStore":
+        store = cls(max(32, state["size"]))
+        size = store._size = state["size"]
+        for name, values in state["columns"].items():
+            store._columns[name][:size] = array('d', values)
+        store._event_code[:size] = array('h', state["event_code"])
+        for name in state["event_names"]:
+            store.intern(name)
+        return store
+
+    def to_pandas(self) -> "pd.DataFrame":
+        """DataFrame поверх тех же буферов; события — Categorical по кодам."""
+        import pandas as pd
+
+        columns = self.to_numpy()
+        codes = columns.pop("event_code")
+        frame = pd.DataFrame(columns, copy=False)
+        frame["event"] = pd.Categorical.from_codes(codes, categories=self.event_names)
+        return frame
+
+# --- MODEL PARAMETERS ---
+
+# Капитальные Активы на старте (Баланс) / Initial Capital Assets
+INITIAL_ASSETS = {
+    "land_infrastructure": 0.0,      # Материальные активы (Tangible)
+    "ecosystem_services": 100_000.0, # Природный капитал (Natural Capital)
+    "human_capital": 500_000.0,      # Человеческий капитал (Human Capital)
+    "social_capital": 50_000.0,      # Социальный капитал (Social Capital)
+    "crypto_reserves": 0.0           # Ликвидные активы (Liquid assets)
+}
+
+# CAPEX (Капитальные затраты)
+CAPEX = {
+    "land_lease_99yr": 300_000,       # Аренда земли 99 лет
+    "prefab_module_45m": 2_500_000,   # Модульный дом (Prefab)
+    "smart_grid_share": 400_000,      # Доля в энергосети
+    "agri_bot_starter": 200_000,      # Агро-бот (старт)
+    "runway_contribution": 100_000    # Взнос на ВПП (Aviation)
+}
+
+# Рост стоимости активов (HODL effect)
+ASSET_GROWTH = {
+    "land_infrastructure": 1.08,  # Недвижимость
+    "ecosystem_services": 1.12,   # Природа восстанавливается
+    "human_capital": 1.05,        # Здоровье улучшается
+    "social_capital": 1.10        # Сообщество растет
+}
+
+# Черные лебеди и золотые гуси: (вес, описание, влияние на выручку)
+# Веса нормируются: вероятность события при срабатывании = вес / сумма весов
+RANDOM_EVENTS = [
+    (0.1, "🌪️  Легкая засуха (Агро урожай -10%)", -50_000),
+    (0.1, "📈  Crypto Bull Run (Накопления +20%)", 150_000),
+    (0.05, "🦄  Экзит стартапа (Статус Единорога!)", 5_000_000),
+    (0.2, "🦠  Новый вирус (Локдаун в городе, Ценность поместья +++)", 0), 
+    (0.3, "🎥  Вирусный TikTok о вашем поместье (Туризм +++)", 200_000),
+    (0.25, "🧘  Ничего особенного, просто счастье (Just happiness)", 0)
+]
+EVENT_THRESHOLD = 0.7  # Событие случается, если random() > порога (~30% лет)
+
+# Техно-апгрейды: год -> (уровень, множитель года апгрейда)
+TECH_UPGRADES = {
+    3: (TechLevel.ADVANCED, 1.2),    # Солнце + Автоматизация
+    7: (TechLevel.FUTURISTIC, 1.5),  # Рой ИИ + 3D-печать
+}
+
+# Потоки доходов: имя -> (база, первый год, зависит от технологий)
+REVENUE_STREAMS = {
+    "remote_work": (1_800_000, 1, False),   # Удаленка растет с инфляцией и опытом
+    "organic_sales": (600_000, 2, True),    # Агро-доход зависит от уровня технологий
+    "carbon_credits": (180_000, 4, False),  # Эко-услуги (Карбоновые кредиты)
+    "tourism": (720_000, 3, True),          # Туризм и Образование
+}
+
+# Расходы (Дефляционные благодаря автономии!)
+BASE_EXPENSE = 1_200_000
+AUTONOMY_RATE = 0.02  # Скидка автономии за год (Autonomy discount per year)
+AUTONOMY_CAP = 0.5    # Макс скидка 50%
+
+def tech_multiplier_for(year: int) -> float:
+    """Множитель техно-апгрейда (Tech upgrade multiplier) for the given year."""
+    upgrade = TECH_UPGRADES.get(year)
+    return upgrade[1] if upgrade else 1.0
+
+@dataclass(frozen=True)
+class GrowthRates:
+    """Годовые темпы роста потоков (Compound growth rates of the cash-flow streams)."""
+    remote_work: float = 1.05
+    organic_sales: float = 1.1
+    carbon_credits: float = 1.15
+    tourism: float = 1.1
+    expenses: float = 1.03
+
+DEFAULT_GROWTH = GrowthRates()
+
+def build_neuro_model(rates: GrowthRates = DEFAULT_GROWTH) -> EstateModel:
+    """
+    Модель NEURO-ESTATE из констант выше (The NEURO-ESTATE model built from the constants).
+    Темпы роста могут быть массивами NumPy — для аналитических расчетов.
+    """
+    revenue = tuple(
+        Stream(name, base, CompoundGrowth(getattr(rates, name)), first_year, tech_sensitive)
+        for name, (base, first_year, tech_sensitive) in REVENUE_STREAMS.items()
+    )
+    return EstateModel(
+        name="NEURO-ESTATE",
+        revenue=revenue,
+        expenses=(Stream("expenses", BASE_EXPENSE, CompoundGrowth(rates.expenses)),),
+        initial_assets=tuple(INITIAL_ASSETS.items()),
+        asset_rules=tuple((name, Appreciation(rate)) for name, rate in ASSET_GROWTH.items()),
+        capex=tuple(CAPEX.items()),
+        cash_asset="crypto_reserves",
+        capex_asset="land_infrastructure",
+        autonomy=AutonomyDiscount(AUTONOMY_RATE, AUTONOMY_CAP),
+        tech_upgrades=tuple(TechUpgrade(year, level.name, multiplier)
+                            for year, (level, multiplier) in TECH_UPGRADES.items()),
+        events=tuple(RANDOM_EVENTS),
+        event_threshold=EVENT_THRESHOLD,
+    )
+
+# Сколько моделей и таблиц роста держать в памяти: свипы, калибровка и Соболь
+# создают тысячи моделей, кэш без предела рос бы весь процесс (LRU bound)
+MODEL_CACHE_SIZE = 128
+
+# Одна модель на набор темпов (One cached model per rate set)
+neuro_estate_model = functools.lru_cache(maxsize=MODEL_CACHE_SIZE)(build_neuro_model)
+NEURO_MODEL = neuro_estate_model(DEFAULT_GROWTH)
+
+def year_cash_flows(year: int, rates: GrowthRates = DEFAULT_GROWTH) -> tuple[float, float]:
+    """
+    Детерминированные потоки года без случайных событий.
+    (Deterministic revenue and expenses of a year, before random events.)
+    """
+    return neuro_estate_model(rates).cash_flows(year)
+
+class GrowthTable:
+    """
+    Таблица факторов роста на весь горизонт (Horizon-wide growth factor table).
+
+    Строится один раз на модель и общая для всех ядер: готовые `revenue[year]` /
+    `expenses[year]` до случайных событий. Значения считаются той же политикой
+    роста, что и в модели, поэтому совпадают бит в бит.
+    При выходе за горизонт таблица удваивается.
+    """
+
+    def __init__(self, model: EstateModel = NEURO_MODEL, horizon: int = 64):
+        self.model = model
+        self.revenue: List[float] = []
+        self.expenses: List[float] = []
+        self._extend(horizon)
+
+    @property
+    def horizon(self) -> int:
+        return len(self.revenue) - 1
+
+    def _extend(self, horizon: int):
+        for year in range(len(self.revenue), horizon + 1):
+            revenue, expenses = self.model.cash_flows(year) if year else (0.0, 0.0)
+            self.revenue.append(revenue)
+            self.expenses.append(expenses)
+
+    def cash_flows(self, year: int) -> tuple[float, float]:
+        if year > self.horizon:
+            self._extend(max(2 * self.horizon, year))
+        return self.revenue[year], self.expenses[year]
+
+_GROWTH_TABLES: "OrderedDict[EstateModel, GrowthTable]" = OrderedDict()
+
+def growth_table(model=NEURO_MODEL, horizon: int = 64) -> GrowthTable:
+    """
+    Общая таблица на модель (Shared table per model, built once). Можно передать
+    и GrowthRates — тогда берется модель NEURO-ESTATE с этими темпами. Хранятся
+    последние MODEL_CACHE_SIZE таблиц; ядра держат ссылку на свою таблицу сами.
+    """
+    if isinstance(model, GrowthRates):
+        model = neuro_estate_model(model)
+    table = _GROWTH_TABLES.get(model)
+    if table is None:
+        table = _GROWTH_TABLES[model] = GrowthTable(model, horizon)
+        if len(_GROWTH_TABLES) > MODEL_CACHE_SIZE:
+            _GROWTH_TABLES.popitem(last=False)
+    else:
+        _GROWTH_TABLES.move_to_end(model)
+        if table.horizon < horizon:
+            table._extend(horizon)
+    return table
+
+def clear_growth_tables():
+    _GROWTH_TABLES.clear()
+
+# --- EVENT SINKS ---
+# Ядро только сообщает о событиях; показывать их или нет решает приемник.
+# (The kernel emits typed events; sinks decide whether and how to show them.)
+
+@dataclass(frozen=True)
+class BootEvent:
+    family_name: str
+    total_capex: float
+
+@dataclass(frozen=True)
+class UpgradeEvent:
+    year: int
+    tech_level: TechLevel
+
+@dataclass(frozen=True)
+class RandomEvent:
+    year: int
+    description: str
+    impact: float
+
+@dataclass(frozen=True)
+class YearClosed:
+    report: FinancialReport
+
+class NullSink:
+    """Ничего не делает (Discards everything). Ядро даже не создает события."""
+    active = False
+
+    def emit(self, event):
+        pass
+
+    def flush(self):
+        pass
+
+class CollectorSink:
+    """Собирает события в память (In-memory collector, e.g. for notebooks and checks)."""
+    active = True
+
+    def __init__(self):
+        self.events: list = []
+
+    def emit(self, event):
+        self.events.append(event)
+
+    def flush(self):
+        pass
+
+    def of_type(self, kind) -> list:
+        return [event for event in self.events if isinstance(event, kind)]
+
+class TerminalRenderer:
+    """
+    Буферизованный вывод в терминал (Buffered terminal renderer).
+    Строки копятся в буфере и пишутся одним вызовом write() на закрытии года.
+    """
+    active = True
+
+    UPGRADE_MESSAGES = {
+        TechLevel.ADVANCED: "\n[UPGRADE] ⚡ Система обновлена до ADVANCED (Солнце + Автоматизация)",
+        TechLevel.FUTURISTIC: "\n[UPGRADE] 🤖 Система обновлена до FUTURISTIC (Рой ИИ + 3D-печать)",
+    }
+
+    def __init__(self, stream=None, colors=TerminalColors, animate: bool = True,
+                 banners: bool = True, rows: bool = False, timer: Optional["PhaseTimer"] = None):
+        self.stream = stream if stream is not None else sys.stdout
+        self.colors = colors
+        self.animate = animate    # Паузы "для эффекта" (Cosmetic delays)
+        self.banners = banners    # Сообщения загрузки и апгрейдов (Boot and upgrade messages)
+        self.rows = rows          # Строка таблицы на каждый год (One table row per year)
+        self.timer = timer
+        self._buffer: List[str] = []
+
+    def _line(self, text: str, color: str = ''):
+        self._buffer.append(f"{color}{text}{self.colors.ENDC if color else ''}\n")
+
+    def _pause(self, seconds: float):
+        if self.animate:
+            self.flush()
+            time.sleep(seconds)
+
+    def emit(self, event):
+        if self.timer is None:
+            self._render(event)
+        else:
+            with self.timer.phase("presentation"):
+                self._render(event)
+
+    def _render(self, event):
+        c = self.colors
+        if isinstance(event, BootEvent) and self.banners:
+            self._line(f"\n[СИСТЕМА] Инициализация NEURO-ESTATE для семьи {event.family_name}...", c.BLUE)
+            self._pause(0.5)
+            self._line("├── 🏗️  Развертывание модульного дома (Prefab)... OK", c.GREEN)
+            self._pause(0.2)
+            self._line("├── 🛰️  Подключение узла Starlink/5G... OK", c.GREEN)
+            self._pause(0.2)
+            self._line("├── ✈️  Картирование ВПП и маршрутов дронов (Sky Mobility)... OK", c.GREEN)
+            self._pause(0.2)
+            self._line("└── 💳  Минтинг токенов управления DAO (Governance)... OK", c.GREEN)
+            self._line(f"\n[ФИНАНСЫ] Общий CAPEX: {event.total_capex:,.0f} RUB", c.WARNING)
+            self._line("[СТАТУС] Система онлайн. Симуляция запущена.", c.BOLD)
+            self.flush()
+        elif isinstance(event, UpgradeEvent) and self.banners:
+            # Уровни из сценария без своей строки — общее сообщение (Generic line for other levels)
+            message = self.UPGRADE_MESSAGES.get(
+                event.tech_level, f"\n[UPGRADE] ⚙️ Система обновлена до {event.tech_level.name}")
+            self._line(message, c.CYAN)
+        elif isinstance(event, YearClosed):
+            if self.rows:
+                self._pause(0.1)
+                report = event.report
+                event_str = report.events[0] if report.events else ""
+                income_color = c.GREEN if report.net_income > 0 else c.FAIL
+                self._buffer.append(
+                    f"{report.year:<5} | "
+                    f"{report.revenue/1e6:6.1f}M RUB      | "
+                    f"{income_color}{report.net_income/1e6:6.1f}M RUB{c.ENDC}      | "
+                    f"{report.capital_valuation/1e6:6.1f}M RUB         | "
+                    f"{event_str}\n")
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self.stream.write("".join(self._buffer))
+            self._buffer.clear()
+            self.stream.flush()
+
+# --- RANDOM STREAMS ---
+
+def child_seed(root_seed: int, index: int) -> int:
+    """
+    Seed дочернего потока (Seed of child stream `index`).
+
+    То же, что `numpy.random.SeedSequence(root_seed).spawn(n)[index]`: потоки с
+    разными index статистически независимы, а результат не зависит от того,
+    в каком процессе и в каком порядке их создают.
+    """
+    import numpy as np
+
+    sequence = np.random.SeedSequence(root_seed, spawn_key=(index,))
+    return int(sequence.generate_state(1, dtype=np.uint64)[0])
+
+def spawn_rngs(root_seed: int, n: int) -> List[random.Random]:
+    """N независимых генераторов для N ядер (One independent RNG per kernel)."""
+    return [random.Random(child_seed(root_seed, i)) for i in range(n)]
+
+# --- CHECKPOINTS ---
+
+CHECKPOINT_VERSION = 1
+
+def model_digest(model: EstateModel) -> str:
+    """Отпечаток модели (Model fingerprint): контрольная точка годится только для своей модели."""
+    return hashlib.sha256(repr(model).encode("utf-8")).hexdigest()
+
+def save_checkpoint(kernel: "NeuroEstateKernel", path: str):
+    """Атомарная запись состояния ядра в JSON (Atomic write: tmp file + os.replace)."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(kernel.checkpoint(), f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+def load_checkpoint(path: str, model: Optional[EstateModel] = None, **kwargs) -> "NeuroEstateKernel":
+    """Ядро из файла контрольной точки (Kernel resumed from a checkpoint file)."""
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+    return NeuroEstateKernel.from_checkpoint(state, model=model, **kwargs)
+
 # --- CORE LOGIC ---
 
 class NeuroEstateKernel:
@@ -74,113 +592,140 @@ class NeuroEstateKernel:
     (The core simulation engine. Treats the estate as a programmable asset class.)
     """
     
-    def __init__(self, config: EstateConfig):
+    def __init__(self, config: EstateConfig, headless: bool = False, sink=None,
+                 rng: Optional[random.Random] = None, seed=None,
+                 growth_rates: GrowthRates = DEFAULT_GROWTH, model: Optional[EstateModel] = None):
         self.config = config
         self.year = 0
+        # Модель поместья (Estate model); по умолчанию NEURO-ESTATE с темпами growth_rates
+        self.model = model if model is not None else neuro_estate_model(growth_rates)
+        # Собственный генератор ядра (Per-kernel RNG): не делится с другими ядрами
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.seed = seed if rng is None else None  # Для производных потоков (e.g. scheduler)
+        self.headless = headless  # Без пауз, цветов и баннеров (No sleeps, colours or banners)
+        if sink is None:
+            sink = NullSink() if headless else TerminalRenderer()
+        self.sink = sink
+        self._emitting = sink.active
         
-        # Капитальные Активы (Баланс) / Capital Assets
-        self.assets = {
-            "land_infrastructure": 0.0,      # Материальные активы (Tangible)
-            "ecosystem_services": 100_000.0, # Природный капитал (Natural Capital)
-            "human_capital": 500_000.0,      # Человеческий капитал (Human Capital)
-            "social_capital": 50_000.0,      # Социальный капитал (Social Capital)
-            "crypto_reserves": 0.0           # Ликвидные активы (Liquid assets)
-        }
-        
-        self.history: List[FinancialReport] = []
+        self.history = HistoryStore()
         self._initialize_system()
 
+    @property
+    def model(self) -> EstateModel:
+        return self._growth.model
+
+    @model.setter
+    def model(self, model: EstateModel):
+        # Новая модель -> другая таблица; старая для этого ядра больше не используется
+        self._growth = growth_table(model)
+
+    @property
+    def growth_rates(self) -> GrowthRates:
+        """Темпы роста потоков модели (Stream growth rates of the current model)."""
+        rates = {stream.name: stream.growth.rate for stream in self.model.revenue + self.model.expenses}
+        return GrowthRates(**rates)
+
+    @growth_rates.setter
+    def growth_rates(self, rates: GrowthRates):
+        self.model = neuro_estate_model(rates)
+
     def _initialize_system(self):
         """Bootstrapping the estate infrastructure."""
-        cprint(f"\n[СИСТЕМА] Инициализация NEURO-ESTATE для семьи {self.config.family_name}...", TerminalColors.BLUE)
-        time.sleep(0.5)
-        
-        # CAPEX (Капитальные затраты)
-        capex = {
-            "land_lease_99yr": 300_000,       # Аренда земли 99 лет
-            "prefab_module_45m": 2_500_000,   # Модульный дом (Prefab)
-            "smart_grid_share": 400_000,      # Доля в энергосети
-            "agri_bot_starter": 200_000,      # Агро-бот (старт)
-            "runway_contribution": 100_000    # Взнос на ВПП (Aviation)
-        }
-        
-        total_capex = sum(capex.values())
-        self.assets["land_infrastructure"] = total_capex
+        # Капитальные Активы (Баланс) после CAPEX / Capital Assets after CAPEX
+        self.assets = self.model.opening_balance()
+        total_capex = self.model.total_capex
         self.config.initial_capital -= total_capex
         
-        cprint(f"├── 🏗️  Развертывание модульного дома (Prefab)... OK", TerminalColors.GREEN)
-        time.sleep(0.2)
-        cprint(f"├── 🛰️  Подключение узла Starlink/5G... OK", TerminalColors.GREEN)
-        time.sleep(0.2)
-        cprint(f"├── ✈️  Картирование ВПП и маршрутов дронов (Sky Mobility)... OK", TerminalColors.GREEN)
-        time.sleep(0.2)
-        cprint(f"└── 💳  Минтинг токенов управления DAO (Governance)... OK", TerminalColors.GREEN)
-        
-        cprint(f"\n[ФИНАНСЫ] Общий CAPEX: {total_capex:,.0f} RUB", TerminalColors.WARNING)
-        cprint(f"[СТАТУС] Система онлайн. Симуляция запущена.", TerminalColors.BOLD)
+        if self._emitting:
+            self.sink.emit(BootEvent(self.config.family_name, total_capex))
+
+    def checkpoint(self) -> dict:
+        """
+        Полное состояние ядра после закрытого года (Full kernel state between years):
+        год, активы, конфигурация с tech_level, состояние RNG и история.
+        """
+        version, internal, gauss = self.rng.getstate()
+        return {
+            "version": CHECKPOINT_VERSION,
+            "year": self.year,
+            "assets": dict(self.assets),
+            "config": {
+                "family_name": self.config.family_name,
+                "region": self.config.region,
+                "initial_capital": self.config.initial_capital,
+                "tech_level": self.config.tech_level.name,
+            },
+            "rng": [version, list(internal), gauss],
+            "model": {"name": self.model.name, "digest": model_digest(self.model)},
+            "history": self.history.state(),
+        }
+
+    @classmethod
+    def from_checkpoint(cls, state: dict, model: Optional[EstateModel] = None, headless: bool = True,
+                        sink=None) -> "NeuroEstateKernel":
+        """
+        Продолжить прогон с контрольной точки (Resume from a checkpoint). Модель
+        передается явно, если это не NEURO-ESTATE по умолчанию; отпечаток сверяется.
+        """
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {state.get('version')!r}")
+        model = model if model is not None else NEURO_MODEL
+        if model_digest(model) != state["model"]["digest"]:
+            raise ValueError(f"Контрольная точка от другой модели (Checkpoint is for model "
+                             f"{state['model']['name']!r}); pass the matching model")
+        saved = state["config"]
+        config = EstateConfig(saved["family_name"], saved["region"], saved["initial_capital"])
+        kernel = cls(config, headless=headless, sink=NullSink(), model=model)
+        # Начальная загрузка уже была: CAPEX вычтен, активы берем из снимка
+        config.initial_capital = saved["initial_capital"]
+        config.tech_level = TechLevel[saved["tech_level"]]
+        kernel.year = state["year"]
+        kernel.assets = dict(state["assets"])
+        version, internal, gauss = state["rng"]
+        kernel.rng.setstate((version, tuple(internal), gauss))
+        kernel.history = HistoryStore.from_state(state["history"])
+        kernel.sink = sink if sink is not None else (NullSink() if headless else TerminalRenderer())
+        kernel._emitting = kernel.sink.active
+        return kernel
 
     def _generate_random_event(self, year: int) -> tuple[float, str]:
         """Симуляция черных лебедей и золотых гусей."""
-        events = [
-            (0.1, "🌪️  Легкая засуха (Агро урожай -10%)", -50_000),
-            (0.1, "📈  Crypto Bull Run (Накопления +20%)", 150_000),
-            (0.05, "🦄  Экзит стартапа (Статус Единорога!)", 5_000_000),
-            (0.2, "🦠  Новый вирус (Локдаун в городе, Ценность поместья +++)", 0), 
-            (0.3, "🎥  Вирусный TikTok о вашем поместье (Туризм +++)", 200_000),
-            (0.25, "🧘  Ничего особенного, просто счастье (Just happiness)", 0)
-        ]
-        
-        if random.random() > 0.7:
-            evt = random.choice(events)
+        events = self.model.events
+        if events and self.rng.random() > self.model.event_threshold:
+            # Выбор с учетом весов за O(1) (Weighted O(1) alias draw)
+            evt = events[self.model.event_table.sample(self.rng.random())]
             return evt[2], evt[1]
         return 0, ""
 
     def run_year(self):
-        self.year += 1
-        tech_multiplier = 1.0
-        
-        # Логика техно-апгрейдов
-        if self.year == 3:
-            self.config.tech_level = TechLevel.ADVANCED
-            cprint(f"\n[UPGRADE] ⚡ Система обновлена до ADVANCED (Солнце + Автоматизация)", TerminalColors.CYAN)
-            tech_multiplier = 1.2
-        elif self.year == 7:
-            self.config.tech_level = TechLevel.FUTURISTIC
-            cprint(f"\n[UPGRADE] 🤖 Система обновлена до FUTURISTIC (Рой ИИ + 3D-печать)", TerminalColors.CYAN)
-            tech_multiplier = 1.5
-
-        # Потоки доходов (Revenue Streams)
-        # Базовый доход растет с инфляцией и опытом
-        remote_work = 1_800_000 * (1.05 ** self.year) 
-        
-        # Агро-доход зависит от уровня технологий
-        organic_sales = 600_000 * (1.1 ** self.year) * tech_multiplier if self.year > 1 else 0
-        
-        # Эко-услуги (Карбоновые кредиты)
-        carbon_credits = 180_000 * (1.15 ** self.year) if self.year > 3 else 0
-        
-        # Туризм и Образование
-        tourism = 720_000 * (1.1 ** self.year) * tech_multiplier if self.year > 2 else 0
-        
-        revenue = remote_work + organic_sales + carbon_credits + tourism
-        
-        # Расходы (Дефляционные благодаря автономии!)
-        base_expense = 1_200_000
-        autonomy_discount = min(0.5, 0.02 * self.year * tech_multiplier) # Макс скидка 50%
-        expenses = base_expense * (1 - autonomy_discount) * (1.03 ** self.year) 
+        self._begin_year()
+        revenue, expenses = self._growth.cash_flows(self.year)
         
         # Случайные события
         event_impact, event_desc = self._generate_random_event(self.year)
+        return self._close_year(revenue, expenses, event_impact, event_desc)
+
+    def _begin_year(self):
+        self.year += 1
+        
+        # Логика техно-апгрейдов
+        upgrade = self.model.upgrade_for(self.year)
+        if upgrade is not None:
+            upgrade = TechLevel[upgrade.level]
+            self.config.tech_level = upgrade
+            if self._emitting:
+                self.sink.emit(UpgradeEvent(self.year, upgrade))
+
+    def _close_year(self, revenue: float, expenses: float, event_impact: float, event_desc: str) -> FinancialReport:
+        """Итоги года (Year close): деньги, рост активов, отчет и история."""
         revenue += event_impact
         
         net_income = revenue - expenses
-        self.assets["crypto_reserves"] += net_income
+        self.assets[self.model.cash_asset] += net_income
         
         # Рост стоимости активов (HODL effect)
-        self.assets["land_infrastructure"] *= 1.08 # Недвижимость
-        self.assets["ecosystem_services"] *= 1.12  # Природа восстанавливается
-        self.assets["human_capital"] *= 1.05       # Здоровье улучшается
-        self.assets["social_capital"] *= 1.10      # Сообщество растет
+        self.model.grow_assets(self.assets, self.year)
         
         total_valuation = sum(self.assets.values())
         
@@ -192,7 +737,11 @@ class NeuroEstateKernel:
             capital_valuation=total_valuation,
             events=[event_desc] if event_desc else []
         )
-        self.history.append(report)
+        self.history.record(self.year, revenue, expenses, net_income, total_valuation, event_desc)
+        if self._emitting:
+            if event_desc:
+                self.sink.emit(RandomEvent(self.year, event_desc, event_impact))
+            self.sink.emit(YearClosed(report))
         return report
 
 # --- INTERFACE & VISUALIZATION ---
@@ -207,23 +756,59 @@ def print_progress_bar(iteration, total, prefix='', suffix='', decimals=1, lengt
     if iteration == total: 
         sys.stdout.write('\n')
 
-def main():
-    # Header
-    print("\n" * 2)
-    cprint("   🌲 NEURO-ESTATE SIMULATION v2.5   ", TerminalColors.HEADER)
-    cprint("   =================================   ", TerminalColors.HEADER)
-    print("   Загрузка Ядра (Initializing Kernel)... [OK]")
-    print("   Загрузка Экономических Моделей (Loading Models)... [OK]")
-    print("   Подключение к Глобальному DAO (Connecting to DAO)... [OK]")
-    print("\n")
-
-    # User Input
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="NEURO-ESTATE OS: симуляция родового поместья")
+    parser.add_argument("--headless", action="store_true",
+                        help="Без пауз, цветов, баннеров и вопросов (No sleeps, colours, banners or prompts)")
+    parser.add_argument("--family", help="Фамилия семьи (Family name)")
+    parser.add_argument("--years", type=int, help="Горизонт планирования (Simulation horizon)")
+    parser.add_argument("--seed", type=int, help="Seed случайных событий для воспроизводимого прогона (Reproducible run)")
+    parser.add_argument("--scenario", help="Файл сценария .toml/.json или имя из scenarios/ (e.g. pessimistic)")
+    parser.add_argument("--export", help="Выгрузить историю в .parquet / .arrow / .csv (Export the yearly history)")
+    parser.add_argument("--checkpoint", help="Файл контрольной точки: сохраняется после каждого года (Checkpoint file)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Продолжить с --checkpoint (Resume from the checkpoint file)")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    if args.resume and not args.checkpoint:
+        raise SystemExit("--resume требует --checkpoint (--resume needs --checkpoint)")
+    headless = args.headless
+    colors = PlainColors if headless else TerminalColors
+    # Показатели ТЭО требуют NumPy: импорт до замера фаз (Section 5.4 metrics, imported before timing)
     try:
-        family = input(f"{TerminalColors.BOLD}Введите Фамилию Семьи (Enter Family Name) [Sokolov]: {TerminalColors.ENDC}") or "Sokolov"
-        years_input = input(f"{TerminalColors.BOLD}Горизонт планирования (Simulation Horizon) [15]: {TerminalColors.ENDC}") or "15"
-        years = int(years_input)
-    except ValueError:
-        years = 15
+        from Neuro_Estate_Finance import irr, npv, payback_year
+    except ImportError:
+        irr = None
+    timer = PhaseTimer()
+
+    def pause(seconds: float):
+        if not headless:
+            time.sleep(seconds)
+
+    with timer.phase("presentation"):
+        # Header
+        if not headless:
+            print("\n" * 2)
+            cprint("   🌲 NEURO-ESTATE SIMULATION v2.5   ", TerminalColors.HEADER)
+            cprint("   =================================   ", TerminalColors.HEADER)
+            print("   Загрузка Ядра (Initializing Kernel)... [OK]")
+            print("   Загрузка Экономических Моделей (Loading Models)... [OK]")
+            print("   Подключение к Глобальному DAO (Connecting to DAO)... [OK]")
+            print("\n")
+
+        # User Input
+        family = args.family or ("Sokolov" if headless or args.resume else None)
+        years = args.years if args.years is not None else (15 if headless else None)
+        try:
+            if family is None:
+                family = input(f"{TerminalColors.BOLD}Введите Фамилию Семьи (Enter Family Name) [Sokolov]: {TerminalColors.ENDC}") or "Sokolov"
+            if years is None:
+                years_input = input(f"{TerminalColors.BOLD}Горизонт планирования (Simulation Horizon) [15]: {TerminalColors.ENDC}") or "15"
+                years = int(years_input)
+        except ValueError:
+            years = 15
 
     # Config
     config = EstateConfig(
@@ -232,59 +817,93 @@ def main():
         initial_capital=10_000_000 # Виртуальная кредитная линия
     )
     
-    kernel = NeuroEstateKernel(config)
+    # Таблица по годам рисуется приемником событий (rows are rendered by the sink)
+    renderer = TerminalRenderer(colors=colors, animate=not headless, banners=not headless,
+                                rows=True, timer=timer)
+    with timer.phase("model"):
+        model = None
+        if args.scenario:
+            from Neuro_Estate_Scenario import load_scenario
+
+            model = load_scenario(args.scenario).model
+        if args.resume:
+            kernel = load_checkpoint(args.checkpoint, model=model, headless=headless, sink=renderer)
+            family = kernel.config.family_name
+        else:
+            kernel = NeuroEstateKernel(config, headless=headless, sink=renderer, seed=args.seed, model=model)
     
     # Simulation Loop
-    print("\n")
-    cprint(f"{'ГОД':<5} | {'ВЫРУЧКА (REV)':<15} | {'ЧИСТАЯ ПРИБЫЛЬ':<16} | {'АКТИВЫ (ASSETS)':<18} | {'СОБЫТИЕ (EVENT)'}", TerminalColors.BLUE)
-    print("-" * 95)
+    with timer.phase("presentation"):
+        if not headless:
+            print("\n")
+        print(f"{colors.BLUE}{'ГОД':<5} | {'ВЫРУЧКА (REV)':<15} | {'ЧИСТАЯ ПРИБЫЛЬ':<16} | {'АКТИВЫ (ASSETS)':<18} | {'СОБЫТИЕ (EVENT)'}{colors.ENDC}")
+        print("-" * 95)
+        if kernel.year:
+            print(f"... продолжение после года {kernel.year} (resumed after year {kernel.year})")
     
-    for y in range(years):Kokorin
-    
-        time.sleep(0.1) 
-        report = kernel.run_year()
+    with timer.phase("model"):
+        try:
+            for y in range(kernel.year, years):
+                kernel.run_year()
+                if args.checkpoint:
+                    with timer.phase("checkpoint"):
+                        save_checkpoint(kernel, args.checkpoint)
+        except KeyboardInterrupt:
+            # Точка пишется между годами, поэтому она всегда целостна
+            if args.checkpoint and os.path.exists(args.checkpoint):
+                print(f"\n💾 Контрольная точка (Checkpoint): {args.checkpoint} — продолжить с --resume")
+            raise
+
+    # Final Report
+    with timer.phase("presentation"):
+        print("\n")
+        if not headless:
+            cprint("✨ СИМУЛЯЦИЯ ЗАВЕРШЕНА. ГЕНЕРАЦИЯ ОТЧЕТА...", TerminalColors.HEADER)
+        pause(1)
+        
+        final_assets = kernel.assets
+        total_value = sum(final_assets.values())
+        roi = (total_value - 4_000_000) / 4_000_000 * 100 
         
-        event_str = report.events[0] if report.events else ""
+        print("-" * 60)
+        print(f"{colors.BOLD}🏆 СЕМЬЯ (FAMILY): {family.upper()}{colors.ENDC}")
+        print(f"{colors.BOLD}📅 СРОК (TIMEFRAME): {years} Лет (Years){colors.ENDC}")
+        print("-" * 60)
         
-        income_color = TerminalColors.GREEN if report.net_income > 0 else TerminalColors.FAIL
+        print(f"{colors.GREEN}💰 ОБЩАЯ СТОИМОСТЬ АКТИВОВ: {total_value:,.0f} RUB{colors.ENDC}")
+        print(f"{colors.CYAN}📈 ROI (Возврат инвестиций): {roi:.1f}%{colors.ENDC}")
+        if irr is not None:
+            flows = kernel.history.to_numpy()["net_income"]
+            invested = kernel.model.total_capex
+            print(f"{colors.CYAN}📊 NPV @10%: {npv(flows, 0.10, invested):,.0f} RUB | "
+                  f"IRR: {irr(flows, invested) * 100:.1f}% | "
+                  f"Окупаемость (Payback): {payback_year(flows, invested):.1f} лет{colors.ENDC}")
+        print("-" * 60)
         
-        print(f"{report.year:<5} | "
-              f"{report.revenue/1e6:6.1f}M RUB      | "
-              f"{income_color}{report.net_income/1e6:6.1f}M RUB{TerminalColors.ENDC}      | "
-              f"{report.capital_valuation/1e6:6.1f}M RUB         | "
-              f"{event_str}")
+        print("СТРУКТУРА АКТИВОВ (ASSET BREAKDOWN):")
+        print(f"  🏡 Недвижимость и Инфра (Real Estate): {final_assets['land_infrastructure']:,.0f}")
+        print(f"  🌳 Природный Капитал (Natural Capital): {final_assets['ecosystem_services']:,.0f}")
+        print(f"  🧠 Человеческий Капитал (Human Capital): {final_assets['human_capital']:,.0f}")
+        print(f"  💳 Крипто/Кэш Резервы (Crypto Reserves): {final_assets['crypto_reserves']:,.0f}")
+        
+        if not headless:
+            print("\n")
+            cprint("🔮 ВЕРДИКТ ИИ (AI VERDICT):", TerminalColors.HEADER)
+            print("Модель показывает, что 'Родовое Поместье 2.0' — это не дауншифтинг,")
+            print("а высокодоходный венчурный актив. Сочетая низкие расходы на жизнь")
+            print("с хай-тек доходами, вы достигаете финансовой сингулярности к 7-му году.")
+            print("\n> Добро пожаловать в будущее. С возвращением домой.")
+            print("\n")
 
-    # Final Report
-    print("\n")
-    cprint("✨ СИМУЛЯЦИЯ ЗАВЕРШЕНА. ГЕНЕРАЦИЯ ОТЧЕТА...", TerminalColors.HEADER)
-    time.sleep(1)
-    
-    final_assets = kernel.assets
-    total_value = sum(final_assets.values())
-    roi = (total_value - 4_000_000) / 4_000_000 * 100 
-    
-    print("-" * 60)
-    cprint(f"🏆 СЕМЬЯ (FAMILY): {family.upper()}", TerminalColors.BOLD)
-    cprint(f"📅 СРОК (TIMEFRAME): {years} Лет (Years)", TerminalColors.BOLD)
-    print("-" * 60)
-    
-    cprint(f"💰 ОБЩАЯ СТОИМОСТЬ АКТИВОВ: {total_value:,.0f} RUB", TerminalColors.GREEN)
-    cprint(f"📈 ROI (Возврат инвестиций): {roi:.1f}%", TerminalColors.CYAN)
-    print("-" * 60)
-    
-    print("СТРУКТУРА АКТИВОВ (ASSET BREAKDOWN):")
-    print(f"  🏡 Недвижимость и Инфра (Real Estate): {final_assets['land_infrastructure']:,.0f}")
-    print(f"  🌳 Природный Капитал (Natural Capital): {final_assets['ecosystem_services']:,.0f}")
-    print(f"  🧠 Человеческий Капитал (Human Capital): {final_assets['human_capital']:,.0f}")
-    print(f"  💳 Крипто/Кэш Резервы (Crypto Reserves): {final_assets['crypto_reserves']:,.0f}")
-    
-    print("\n")
-    cprint("🔮 ВЕРДИКТ ИИ (AI VERDICT):", TerminalColors.HEADER)
-    print("Модель показывает, что 'Родовое Поместье 2.0' — это не дауншифтинг,")
-    print("а высокодоходный венчурный актив. Сочетая низкие расходы на жизнь")
-    print("с хай-тек доходами, вы достигаете финансовой сингулярности к 7-му году.")
-    print("\n> Добро пожаловать в будущее. С возвращением домой.")
-    print("\n")
+    if args.export:
+        from Neuro_Estate_Export import history_columns, open_writer
+
+        with timer.phase("export"):
+            with open_writer(args.export) as writer:
+                writer.write(history_columns(kernel))
+        print(f"💾 Экспорт (Export): {writer.path}")
+
+    print(f"⏱  ВРЕМЯ (TIMING): {timer.summary()}")
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🗂  NEURO-ESTATE Scenarios
+==========================
+Декларативные сценарии в TOML / JSON (Declarative scenario files).
+
+Сценарий описывает CAPEX, потоки доходов и расходов, рост активов, годы
+техно-апгрейдов и случайные события. Файл переопределяет только то, что
+отличается от базового NEURO-ESTATE (таблицы сливаются, списки заменяются),
+поэтому optimistic / pessimistic занимают пару десятков строк. Готовые сценарии
+ТЭО, раздел 5.5, лежат в `scenarios/`.
+
+Каждый файл проверяется и компилируется в EstateModel один раз — ее читают все
+движки: ядро, пакетный Monte Carlo, свипы, чувствительность. Кэш ключуется
+SHA-256 содержимого — неизмененный файл повторно не разбирается, сколько бы
+раз и под каким путем его ни загружали.
+
+Usage:
+    scenario = load_scenario("scenarios/pessimistic.toml")
+    kernel = NeuroEstateKernel(config, model=scenario.model, seed=1)
+    BatchEstateEngine(model=scenario.model).run(10_000, 30, seed=1)
+"""
+
+import copy
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, List
+
+from Neuro_Estate_Model import (
+    FLAT,
+    Accrual,
+    Appreciation,
+    AutonomyDiscount,
+    CompoundGrowth,
+    EstateModel,
+    LinearGrowth,
+    Stream,
+    TechUpgrade,
+)
+from Neuro_Estate_OS import (
+    ASSET_GROWTH,
+    AUTONOMY_CAP,
+    AUTONOMY_RATE,
+    BASE_EXPENSE,
+    CAPEX,
+    DEFAULT_GROWTH,
+    EVENT_THRESHOLD,
+    INITIAL_ASSETS,
+    RANDOM_EVENTS,
+    REVENUE_STREAMS,
+    TECH_UPGRADES,
+    TechLevel,
+)
+
+SCENARIO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios")
+
+# --- DEFAULTS ---
+
+def default_scenario() -> dict:
+    """Базовый сценарий из констант Neuro_Estate_OS (Baseline built from the constants)."""
+    revenue = {
+        name: {"base": base, "growth": getattr(DEFAULT_GROWTH, name),
+               "first_year": first_year, "tech_sensitive": tech_sensitive}
+        for name, (base, first_year, tech_sensitive) in REVENUE_STREAMS.items()
+    }
+    assets = {name: {"initial": value} for name, value in INITIAL_ASSETS.items()}
+    for name, rate in ASSET_GROWTH.items():
+        assets[name]["appreciation"] = rate
+    return {
+        "name": "baseline",
+        "description": "",
+        "capex": dict(CAPEX),
+        "revenue": revenue,
+        "expenses": {"expenses": {"base": BASE_EXPENSE, "growth": DEFAULT_GROWTH.expenses}},
+        "autonomy": {"rate": AUTONOMY_RATE, "cap": AUTONOMY_CAP},
+        "assets": assets,
+        "balance": {"cash_asset": "crypto_reserves", "capex_asset": "land_infrastructure"},
+        "tech_upgrades": [{"year": year, "level": level.name, "multiplier": multiplier}
+                          for year, (level, multiplier) in TECH_UPGRADES.items()],
+        "events": {"threshold": EVENT_THRESHOLD,
+                   "list": [{"weight": w, "description": d, "impact": i} for w, d, i in RANDOM_EVENTS]},
+    }
+
+def merge(base: dict, override: dict) -> dict:
+    """Таблицы сливаются рекурсивно, остальное (в т.ч. списки) заменяется."""
+    out = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(out.get(key), dict):
+            out[key] = merge(out[key], value)
+        else:
+            out[key] = value
+    return out
+
+# --- VALIDATION ---
+
+class ScenarioError(ValueError):
+    """Ошибка в файле сценария (Invalid scenario); сообщение содержит путь к полю."""
+
+_TOP_LEVEL = {"name", "description", "capex", "revenue", "expenses", "autonomy",
+              "assets", "balance", "tech_upgrades", "events"}
+
+def _check_keys(where: str, table, allowed, required=()):
+    if not isinstance(table, dict):
+        raise ScenarioError(f"{where}: ожидалась таблица (expected a table)")
+    unknown = set(table) - set(allowed)
+    if unknown:
+        raise ScenarioError(f"{where}: неизвестные ключи (unknown keys) {sorted(unknown)}")
+    missing = set(required) - set(table)
+    if missing:
+        raise ScenarioError(f"{where}: нет ключей (missing keys) {sorted(missing)}")
+
+def _check_table(where: str, table):
+    if not isinstance(table, dict):
+        raise ScenarioError(f"{where}: ожидалась таблица (expected a table)")
+
+def _number(where: str, value, low: float = -float("inf"), high: float = float("inf"), integer: bool = False):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ScenarioError(f"{where}: ожидалось число (expected a number), got {value!r}")
+    if integer and value != int(value):
+        raise ScenarioError(f"{where}: ожидалось целое (expected an integer), got {value!r}")
+    if not (low <= value <= high):
+        raise ScenarioError(f"{where}: {value!r} вне [{low}, {high}]")
+    return int(value) if integer else value
+
+def _growth(where: str, spec):
+    """1.05 | {compound = 1.05} | {linear = 0.02} | "flat"."""
+    if spec == "flat":
+        return FLAT
+    if isinstance(spec, dict):
+        _check_keys(where, spec, ("compound", "linear"))
+        if len(spec) != 1:
+            raise ScenarioError(f"{where}: нужна ровно одна политика (exactly one of compound/linear)")
+        if "linear" in spec:
+            return LinearGrowth(_number(f"{where}.linear", spec["linear"]))
+        spec = spec["compound"]
+    return CompoundGrowth(_number(where, spec, low=0.0))
+
+def _streams(where: str, table, tech_allowed: bool) -> tuple:
+    _check_table(where, table)
+    allowed = ("base", "growth", "first_year", "tech_sensitive") if tech_allowed else \
+        ("base", "growth", "first_year")
+    streams = []
+    for name, spec in table.items():
+        path = f"{where}.{name}"
+        _check_keys(path, spec, allowed, required=("base",))
+        tech = spec.get("tech_sensitive", False)
+        if not isinstance(tech, bool):
+            raise ScenarioError(f"{path}.tech_sensitive: ожидалось true/false")
+        streams.append(Stream(
+            name,
+            _number(f"{path}.base", spec["base"], low=0.0),
+            _growth(f"{path}.growth", spec.get("growth", "flat")),
+            _number(f"{path}.first_year", spec.get("first_year", 1), low=1, integer=True),
+            tech,
+        ))
+    return tuple(streams)
+
+def compile_model(data: dict) -> EstateModel:
+    """Проверка и сборка EstateModel из полного (слитого) словаря сценария."""
+    _check_keys("scenario", data, _TOP_LEVEL)
+    name = data.get("name", "scenario")
+    if not isinstance(name, str):
+        raise ScenarioError("name: ожидалась строка (expected a string)")
+
+    capex_table = data.get("capex", {})
+    _check_table("capex", capex_table)
+    capex = tuple((item, _number(f"capex.{item}", amount, low=0.0)) for item, amount in capex_table.items())
+
+    revenue = _streams("revenue", data.get("revenue", {}), tech_allowed=True)
+    expenses = _streams("expenses", data.get("expenses", {}), tech_allowed=False)
+    if not revenue:
+        raise ScenarioError("revenue: нужен хотя бы один поток (at least one stream)")
+
+    autonomy = None
+    if data.get("autonomy"):  # autonomy = false отключает скидку (disables the discount)
+        _check_keys("autonomy", data["autonomy"], ("rate", "cap"), required=("rate", "cap"))
+        autonomy = AutonomyDiscount(_number("autonomy.rate", data["autonomy"]["rate"], low=0.0),
+                                    _number("autonomy.cap", data["autonomy"]["cap"], low=0.0, high=1.0))
+
+    assets_table = data.get("assets", {})
+    _check_table("assets", assets_table)
+    initial_assets, asset_rules = [], []
+    for asset, spec in assets_table.items():
+        path = f"assets.{asset}"
+        _check_keys(path, spec, ("initial", "appreciation", "accrual", "accrual_growth"))
+        initial_assets.append((asset, _number(f"{path}.initial", spec.get("initial", 0.0))))
+        if "appreciation" in spec and "accrual" in spec:
+            raise ScenarioError(f"{path}: appreciation и accrual взаимоисключающие")
+        if "appreciation" in spec:
+            asset_rules.append((asset, Appreciation(_number(f"{path}.appreciation", spec["appreciation"], low=0.0))))
+        elif "accrual" in spec:
+            asset_rules.append((asset, Accrual(_number(f"{path}.accrual", spec["accrual"]),
+                                               _growth(f"{path}.accrual_growth", spec.get("accrual_growth", "flat")))))
+
+    balance = data.get("balance", {})
+    _check_keys("balance", balance, ("cash_asset", "capex_asset", "capex_funding"), required=("cash_asset",))
+    asset_names = {asset for asset, _ in initial_assets}
+    for key in ("cash_asset", "capex_asset", "capex_funding"):
+        if balance.get(key) is not None and balance[key] not in asset_names:
+            raise ScenarioError(f"balance.{key}: нет актива (no asset) {balance[key]!r}")
+    if balance["cash_asset"] in dict(asset_rules):
+        raise ScenarioError("balance.cash_asset: у денежного актива не может быть правила роста")
+
+    upgrades = []
+    years_seen = set()
+    for i, spec in enumerate(data.get("tech_upgrades", [])):
+        path = f"tech_upgrades[{i}]"
+        _check_keys(path, spec, ("year", "level", "multiplier"), required=("year", "level", "multiplier"))
+        if spec["level"] not in TechLevel.__members__:
+            raise ScenarioError(f"{path}.level: {spec['level']!r} не из {list(TechLevel.__members__)}")
+        year = _number(f"{path}.year", spec["year"], low=1, integer=True)
+        if year in years_seen:
+            raise ScenarioError(f"{path}.year: повтор года {year} (duplicate year)")
+        years_seen.add(year)
+        upgrades.append(TechUpgrade(year, spec["level"], _number(f"{path}.multiplier", spec["multiplier"], low=0.0)))
+
+    events_table = data.get("events", {})
+    _check_keys("events", events_table, ("threshold", "list"))
+    events = []
+    for i, spec in enumerate(events_table.get("list", [])):
+        path = f"events.list[{i}]"
+        _check_keys(path, spec, ("weight", "description", "impact"), required=("description", "impact"))
+        if not isinstance(spec["description"], str):
+            raise ScenarioError(f"{path}.description: ожидалась строка (expected a string)")
+        events.append((_number(f"{path}.weight", spec.get("weight", 1.0), low=0.0),
+                       spec["description"], _number(f"{path}.impact", spec["impact"])))
+    if events and sum(w for w, _, _ in events) <= 0:
+        raise ScenarioError("events.list: сумма весов должна быть > 0 (weights must sum to > 0)")
+
+    return EstateModel(
+        name=name,
+        revenue=revenue,
+        expenses=expenses,
+        initial_assets=tuple(initial_assets),
+        asset_rules=tuple(asset_rules),
+        capex=capex,
+        cash_asset=balance["cash_asset"],
+        capex_asset=balance.get("capex_asset"),
+        capex_funding=balance.get("capex_funding"),
+        autonomy=autonomy,
+        tech_upgrades=tuple(sorted(upgrades, key=lambda u: u.year)),
+        events=tuple(events),
+        event_threshold=_number("events.threshold", events_table.get("threshold", 1.0), low=0.0, high=1.0),
+    )
+
+# --- LOADING & CACHE ---
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    description: str
+    digest: str                 # SHA-256 содержимого файла (Content hash)
+    model: EstateModel
+
+def _parse(content: bytes, fmt: str) -> dict:
+    if fmt == "json":
+        return json.loads(content.decode("utf-8"))
+    if fmt == "toml":
+        import tomllib  # Python 3.11+
+
+        return tomllib.loads(content.decode("utf-8"))
+    raise ScenarioError(f"Неизвестный формат (Unknown format): {fmt!r}; поддерживаются toml и json")
+
+_SCENARIOS: Dict[str, Scenario] = {}
+
+def compile_scenario(content: bytes, fmt: str = "toml") -> Scenario:
+    """Разбор, проверка и компиляция; результат кэшируется по SHA-256 содержимого."""
+    digest = hashlib.sha256(fmt.encode() + b"\0" + content).hexdigest()
+    scenario = _SCENARIOS.get(digest)
+    if scenario is None:
+        data = merge(copy.deepcopy(default_scenario()), _parse(content, fmt))
+        model = compile_model(data)
+        scenario = _SCENARIOS[digest] = Scenario(
+            name=model.name,
+            description=str(data.get("description", "")),
+            digest=digest,
+            model=model,
+        )
+    return scenario
+
+def load_scenario(path: str) -> Scenario:
+    """Сценарий из файла .toml / .json; короткое имя ищется в scenarios/ ("pessimistic")."""
+    if not os.path.exists(path) and not os.path.splitext(path)[1]:
+        path = os.path.join(SCENARIO_DIR, path + ".toml")
+    fmt = os.path.splitext(path)[1].lstrip(".").lower()
+    with open(path, "rb") as f:
+        content = f.read()
+    try:
+        return compile_scenario(content, fmt)
+    except ScenarioError as exc:
+        raise ScenarioError(f"{path}: {exc}") from None
+
+def load_scenarios(paths) -> List[Scenario]:
+    return [load_scenario(path) for path in paths]
+
+def builtin_scenarios() -> Dict[str, Scenario]:
+    """Сценарии ТЭО 5.5 из scenarios/ (baseline, optimistic, pessimistic)."""
+    names = sorted(os.path.splitext(f)[0] for f in os.listdir(SCENARIO_DIR) if f.endswith(".toml"))
+    return {name: load_scenario(os.path.join(SCENARIO_DIR, name + ".toml")) for name in names}
+
+def clear_scenario_cache():
+    _SCENARIOS.clear()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🗓  NEURO-ESTATE Seasonal Scheduler
+===================================
+Сезонный планировщик с шагом месяц или неделя (Monthly / weekly event scheduler).
+
+Год ядра разбивается на такты (12 месяцев или 52 недели). Обработчики —
+поступления выручки, оплаты расходов, случайные события, закрытие года —
+лежат в очереди с приоритетом (heapq) по (такт, приоритет). Все проводки
+одного такта — один обработчик с готовыми суммами. Планировщик прыгает сразу
+к ближайшему запланированному такту: такты без проводок не перебираются,
+поэтому недельный шаг стоит немногим больше месячного.
+
+  * Годовые суммы потоков раскладываются по сезонным профилям
+    (SEASONAL_PROFILES): урожай осенью, туризм летом, отопление зимой.
+    Месячная доля проводится в начале месяца (зарплата, счета, продажи).
+  * На недельном шаге поток дробится по неделям только в своем окне
+    WEEKLY_WINDOWS: в пик сезона гости платят понедельно. Остальные
+    недели без проводок пропускаются.
+  * Событие года тянется тем же генератором, что и в ядре, а его влияние
+    приходится на окно сезона (EVENT_WINDOWS): засуха летом и т.п. Месяц
+    (или неделю) внутри окна выбирает свой генератор с seed от seed ядра,
+    поэтому леджер воспроизводим вместе с ядром.
+  * Закрытие года — обычный `NeuroEstateKernel._close_year`: годовой
+    FinancialReport, история и приемники те же, что у run_year(), бит в бит.
+    Внутригодовой кэш (ledger) показывает кассовые разрывы между сезонами.
+
+Usage:
+    scheduler = EstateScheduler(NeuroEstateKernel(config, headless=True, seed=1), resolution="week")
+    reports = scheduler.run(15)                 # == [kernel.run_year() for ...]
+    times, cash = scheduler.cash_curve()        # остаток денег по тактам
+    scheduler.schedule(scheduler.tick(3, month=7), my_handler)   # свой обработчик
+"""
+
+import hashlib
+import heapq
+import random
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from Neuro_Estate_OS import RANDOM_EVENTS, FinancialReport, NeuroEstateKernel, child_seed
+
+TICKS_PER_YEAR = {"month": 12, "week": 52}
+
+# Приоритеты внутри такта (Dispatch order within one tick)
+PRIORITY_YEAR_START = -1
+PRIORITY_POSTING = 0
+PRIORITY_EVENT = 1
+PRIORITY_YEAR_CLOSE = 9
+
+# Доли годовой суммы по месяцам янв..дек (Monthly shares, sum = 1)
+FLAT_PROFILE = (1 / 12,) * 12
+SEASONAL_PROFILES: Dict[str, Tuple[float, ...]] = {
+    "remote_work": FLAT_PROFILE,
+    "organic_sales": (0, 0, 0, 0, 0, 0.05, 0.10, 0.25, 0.30, 0.20, 0.10, 0),      # Урожай
+    "carbon_credits": (0,) * 11 + (1.0,),                                      # Годовая выплата
+    "tourism": (0.05, 0, 0, 0, 0.08, 0.20, 0.25, 0.25, 0.12, 0, 0, 0.05),      # Лето + Новый год
+    "expenses": (0.12, 0.11, 0.09, 0.07, 0.06, 0.06, 0.06, 0.06, 0.07, 0.09, 0.10, 0.11),  # Отопление
+}
+
+# Месяцы 1..12, где поток на недельном шаге идет понедельно (Weekly-paid months per stream)
+WEEKLY_WINDOWS: Dict[str, Tuple[int, int]] = {
+    "tourism": (6, 8),             # Пик сезона: заезды каждую неделю
+}
+
+# Окна событий, месяцы 1..12 включительно (Event windows by description)
+EVENT_WINDOWS: Dict[str, Tuple[int, int]] = {
+    RANDOM_EVENTS[0][1]: (6, 8),   # Засуха — лето
+    RANDOM_EVENTS[4][1]: (5, 9),   # Вирусный TikTok — туристический сезон
+}
+
+@dataclass(frozen=True)
+class Posting:
+    """Проводка на такте (Ledger entry at a tick)."""
+    time: int
+    kind: str        # "revenue" | "expense" | "event"
+    name: str
+    amount: float    # Со знаком: расходы отрицательны
+    cash: float      # Остаток денежного актива после проводки
+
+class EstateScheduler:
+    """
+    Очередь обработчиков поверх ядра (Priority-queue scheduler over a kernel).
+    Обработчик — функция handler(scheduler, time).
+    """
+
+    def __init__(self, kernel: NeuroEstateKernel, resolution: str = "month",
+                 profiles: Optional[Dict[str, Tuple[float, ...]]] = None,
+                 event_windows: Optional[Dict[str, Tuple[int, int]]] = None,
+                 placement_seed=None, weekly_windows: Optional[Dict[str, Tuple[int, int]]] = None):
+        if resolution not in TICKS_PER_YEAR:
+            raise ValueError(f"resolution must be one of {sorted(TICKS_PER_YEAR)}, got {resolution!r}")
+        self.kernel = kernel
+        self.resolution = resolution
+        self.ticks_per_year = TICKS_PER_YEAR[resolution]
+        self.profiles = SEASONAL_PROFILES if profiles is None else profiles
+        self.event_windows = EVENT_WINDOWS if event_windows is None else event_windows
+        self.weekly_windows = WEEKLY_WINDOWS if weekly_windows is None else weekly_windows
+        # Свой генератор для дня события: поток ядра остается как у run_year()
+        if placement_seed is None:
+            placement_seed = _placement_seed(kernel)
+        self.placement_rng = random.Random(placement_seed)
+        self.now = kernel.year * self.ticks_per_year
+        self.ledger: List[Posting] = []
+        self.dispatched = 0
+        self.ticks_visited = 0
+        self._queue: List[tuple] = []
+        self._sequence = 0
+        self._cash = 0.0
+        self._year: Dict[str, object] = {}
+        self._report: Optional[FinancialReport] = None
+
+    # --- queue ---
+
+    def tick(self, year: int, month: int = 1, week: Optional[int] = None) -> int:
+        """Абсолютный такт начала месяца / недели года (Absolute tick, 1-based month/week)."""
+        start = (year - 1) * self.ticks_per_year
+        if week is not None:
+            return start + min(week - 1, self.ticks_per_year - 1) if self.resolution == "week" \
+                else start + (week - 1) * 12 // 52
+        return start + (month - 1) * self.ticks_per_year // 12
+
+    def schedule(self, time: int, handler: Callable[["EstateScheduler", int], None],
+                 priority: int = PRIORITY_POSTING):
+        if time < self.now:
+            raise ValueError(f"Cannot schedule in the past: tick {time} < now {self.now}")
+        heapq.heappush(self._queue, (time, priority, self._sequence, handler))
+        self._sequence += 1
+
+    def run_until(self, time: int):
+        """Выполнить все обработчики до такта time включительно (Dispatch up to a tick)."""
+        queue = self._queue
+        while queue and queue[0][0] <= time:
+            at, _, _, handler = heapq.heappop(queue)
+            if at != self.now or not self.dispatched:
+                self.ticks_visited += 1
+            self.now = at
+            self.dispatched += 1
+            handler(self, at)
+        self.now = max(self.now, time)
+
+    # --- years ---
+
+    def run_year(self) -> FinancialReport:
+        """Один год ядра по тактам; возвращает тот же FinancialReport, что и run_year()."""
+        start = self.kernel.year * self.ticks_per_year
+        self._report = None
+        self.schedule(start, _start_year, PRIORITY_YEAR_START)
+        self.run_until(start + self.ticks_per_year - 1)
+        return self._report
+
+    def run(self, years: int) -> List[FinancialReport]:
+        return [self.run_year() for _ in range(years)]
+
+    def post(self, time: int, kind: str, name: str, amount: float):
+        """Проводка по денежному активу внутри года (Intra-year cash posting)."""
+        self._cash += amount
+        self.ledger.append(Posting(time, kind, name, amount, self._cash))
+
+    def cash_curve(self) -> Tuple[List[int], List[float]]:
+        """Такты и остаток денег после каждой проводки (Cash balance after each posting)."""
+        return [p.time for p in self.ledger], [p.cash for p in self.ledger]
+
+    def month_span(self, year: int, month: int) -> Tuple[int, int]:
+        """Первый и последний такт месяца (First and last tick of a month)."""
+        first = self.tick(year, month)
+        last = self.tick(year, month + 1) - 1 if month < 12 else year * self.ticks_per_year - 1
+        return first, max(first, last)
+
+    def _month_ticks(self, year: int, profile, name: str) -> List[Tuple[int, float]]:
+        """
+        Такты и доли по месячному профилю: начало месяца, а внутри окна
+        weekly_windows[name] на недельном шаге — каждая неделя поровну.
+        """
+        window = self.weekly_windows.get(name) if self.resolution == "week" else None
+        out = []
+        for month, share in enumerate(profile, start=1):
+            if not share:
+                continue
+            first, last = self.month_span(year, month)
+            if window is not None and window[0] <= month <= window[1]:
+                weeks = last - first + 1
+                out.extend((at, share / weeks) for at in range(first, last + 1))
+            else:
+                out.append((first, share))
+        return out
+
+def _placement_seed(kernel: NeuroEstateKernel) -> int:
+    """Seed дня событий из seed ядра (Placement seed derived from the kernel seed)."""
+    seed = getattr(kernel, "seed", None)
+    if isinstance(seed, int) and seed >= 0:
+        return child_seed(seed, 1)
+    # Ядро с чужим rng или из контрольной точки: отпечаток состояния генератора
+    digest = hashlib.sha256(repr(kernel.rng.getstate()).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "little")
+
+# --- BUILT-IN HANDLERS ---
+
+def _start_year(scheduler: EstateScheduler, time: int):
+    kernel = scheduler.kernel
+    kernel._begin_year()
+    year = kernel.year
+    model = kernel.model
+    revenue, expenses = kernel._growth.cash_flows(year)
+    impact, desc = kernel._generate_random_event(year)
+    scheduler._year = {"revenue": revenue, "expenses": expenses, "impact": impact, "desc": desc}
+    scheduler._cash = kernel.assets[model.cash_asset]
+
+    # Годовые суммы потоков по сезонам, сгруппированные по тактам (Postings grouped per tick)
+    batches: Dict[int, List[Tuple[str, str, float]]] = {}
+    tech = model.tech_multiplier(year)
+    for stream in model.revenue:
+        value = stream.value(year, tech)
+        if value:
+            profile = scheduler.profiles.get(stream.name, FLAT_PROFILE)
+            for at, share in scheduler._month_ticks(year, profile, stream.name):
+                batches.setdefault(at, []).append(("revenue", stream.name, value * share))
+    expense_profile = scheduler.profiles.get("expenses", FLAT_PROFILE)
+    for at, share in scheduler._month_ticks(year, expense_profile, "expenses"):
+        batches.setdefault(at, []).append(("expense", "expenses", -expenses * share))
+    for at in sorted(batches):
+        scheduler.schedule(at, _batch(batches[at]))
+
+    if desc:
+        first, last = scheduler.event_windows.get(desc, (1, 12))
+        at = scheduler.placement_rng.randint(scheduler.month_span(year, first)[0],
+                                             scheduler.month_span(year, last)[1])
+        scheduler.schedule(at, _posting("event", desc, impact), PRIORITY_EVENT)
+    scheduler.schedule(time + scheduler.ticks_per_year - 1, _close_year, PRIORITY_YEAR_CLOSE)
+
+def _batch(entries: List[Tuple[str, str, float]]):
+    def handler(scheduler: EstateScheduler, time: int):
+        for kind, name, amount in entries:
+            scheduler.post(time, kind, name, amount)
+    return handler
+
+def _posting(kind: str, name: str, amount: float):
+    def handler(scheduler: EstateScheduler, time: int):
+        scheduler.post(time, kind, name, amount)
+    return handler
+
+def _close_year(scheduler: EstateScheduler, time: int):
+    # Годовая свертка — ровно как в run_year() (Annual rollup, identical to run_year)
+    year = scheduler._year
+    scheduler._report = scheduler.kernel._close_year(year["revenue"], year["expenses"],
+                                                     year["impact"], year["desc"])
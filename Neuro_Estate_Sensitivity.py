@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🌪  NEURO-ESTATE Sensitivity
+============================
+Анализ "что-если" и торнадо-диаграммы по ТЭО, раздел 5.6.
+(One-at-a-time sensitivity analysis and tornado charts.)
+
+Каждый параметр модели (базы потоков, темпы роста, скидка автономии,
+множители апгрейдов, рост активов) сдвигается вниз и вверх при остальных на
+базовом уровне. Все варианты — одна пачка задач для пула процессов; каждая
+задача — пакетный Monte Carlo с одним и тем же seed, т.е. на общих случайных
+числах (common random numbers): разница между вариантами — эффект параметра,
+а не шум выборки.
+
+Темпы и множители вида 1.xx сдвигаются по надбавке: 1.10 ±10% -> 1.09 / 1.11.
+
+Usage:
+    result = run_sensitivity(n_paths=20_000, years=15, seed=1)
+    for bar in result.tornado("npv"):
+        print(bar.parameter, bar.low_metric, bar.high_metric)
+    result.plot("npv")
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from Neuro_Estate_Finance import irr, npv, payback_year
+from Neuro_Estate_Model import EstateModel
+from Neuro_Estate_OS import NEURO_MODEL
+
+# Показатели прогона (Metrics of one run) по траекториям: npv и valuation — среднее;
+# irr и payback — медиана без NaN (у части траекторий их нет, а хвосты тяжелые);
+# prob_loss — доля траекторий
+METRICS = ("npv", "irr", "valuation", "payback", "prob_loss")
+METRIC_LABELS = {
+    "npv": "NPV (среднее), руб.",
+    "irr": "IRR (медиана)",
+    "valuation": "Стоимость активов на конец горизонта (среднее), руб.",
+    "payback": "Срок окупаемости (медиана), лет",
+    "prob_loss": "Доля траекторий с убыточным годом",
+}
+
+# Группы параметров по умолчанию (Default parameter groups): без CAPEX и порога событий
+DEFAULT_GROUPS = ("revenue.", "expenses.", "autonomy.", "tech.", "assets.")
+
+# --- PARAMETER RANGES ---
+
+def _is_factor(name: str) -> bool:
+    """Множители вида 1.xx: темпы роста, рост активов и техно-апгрейды."""
+    return name.startswith("tech.") or (name.endswith(".rate") and not name.startswith("autonomy."))
+
+def default_ranges(model: EstateModel = NEURO_MODEL, delta: float = 0.10,
+                   groups: Sequence[str] = DEFAULT_GROUPS) -> Dict[str, Tuple[float, float]]:
+    """
+    Диапазоны ±delta вокруг базы (±delta ranges around the baseline). Для множителей
+    сдвигается надбавка над 1, потолок автономии не выходит за 1.
+    """
+    ranges = {}
+    for name, value in model.parameters().items():
+        if not name.startswith(tuple(groups)) or value == 0:
+            continue
+        if _is_factor(name):
+            low, high = 1 + (value - 1) * (1 - delta), 1 + (value - 1) * (1 + delta)
+        else:
+            low, high = value * (1 - delta), value * (1 + delta)
+        if name == "autonomy.cap":
+            high = min(high, 1.0)
+        ranges[name] = (low, high)
+    return ranges
+
+# --- EVALUATION ---
+
+@dataclass(frozen=True)
+class Variant:
+    parameter: str      # "" = базовый вариант (baseline)
+    side: str           # "base" | "low" | "high"
+    value: float
+    model: EstateModel
+
+def evaluate(model: EstateModel, n_paths: int, years: int, seed: int,
+             discount_rate: float = 0.10) -> Dict[str, float]:
+    """Один вариант: пакетный прогон и показатели ТЭО 5.4 (One variant, all metrics)."""
+    from Neuro_Estate_MonteCarlo import BatchEstateEngine
+
+    result = BatchEstateEngine(model=model).run(n_paths, years, seed=seed)
+    flows = result.net_income
+    invested = float(model.total_capex)
+    return {
+        "npv": float(np.mean(npv(flows, discount_rate, invested))),
+        "irr": float(np.nanmedian(irr(flows, invested))),
+        "valuation": float(result.capital_valuation[:, -1].mean()),
+        "payback": float(np.nanmedian(payback_year(flows, invested))),
+        "prob_loss": float((flows < 0).any(axis=1).mean()),
+    }
+
+def _evaluate_variant(args):
+    variant, n_paths, years, seed, discount_rate = args
+    return evaluate(variant.model, n_paths, years, seed, discount_rate)
+
+# --- RESULTS ---
+
+@dataclass(frozen=True)
+class TornadoBar:
+    parameter: str
+    low_value: float
+    high_value: float
+    low_metric: float
+    high_metric: float
+
+    @property
+    def swing(self) -> float:
+        return abs(self.high_metric - self.low_metric)
+
+@dataclass
+class SensitivityResult:
+    baseline: Dict[str, float]
+    base_values: Dict[str, float]
+    rows: List[Tuple[Variant, Dict[str, float]]]
+
+    def tornado(self, metric: str = "npv") -> List[TornadoBar]:
+        """Столбики по убыванию размаха (Bars ranked by swing, widest first)."""
+        sides: Dict[str, Dict[str, Tuple[float, float]]] = {}
+        for variant, metrics in self.rows:
+            if variant.parameter:
+                sides.setdefault(variant.parameter, {})[variant.side] = (variant.value, metrics[metric])
+        bars = [TornadoBar(name, s["low"][0], s["high"][0], s["low"][1], s["high"][1])
+                for name, s in sides.items()]
+        return sorted(bars, key=lambda bar: bar.swing, reverse=True)
+
+    def table(self, metric: str = "npv") -> List[dict]:
+        """Строки для таблицы / DataFrame (Rows for a table or DataFrame)."""
+        base = self.baseline[metric]
+        return [{"parameter": bar.parameter, "base_value": self.base_values[bar.parameter],
+                 "low_value": bar.low_value, "high_value": bar.high_value,
+                 "low_metric": bar.low_metric, "high_metric": bar.high_metric,
+                 "low_delta": bar.low_metric - base, "high_delta": bar.high_metric - base,
+                 "swing": bar.swing}
+                for bar in self.tornado(metric)]
+
+    def plot(self, metric: str = "npv", top: Optional[int] = 15, ax=None):
+        """Торнадо-диаграмма в matplotlib (Tornado chart)."""
+        import matplotlib.pyplot as plt
+
+        bars = self.tornado(metric)[:top]
+        base = self.baseline[metric]
+        ax = ax if ax is not None else plt.gca()
+        positions = np.arange(len(bars))[::-1]
+        ax.barh(positions, [b.low_metric - base for b in bars], left=base, color="tab:red", alpha=0.7, label="-")
+        ax.barh(positions, [b.high_metric - base for b in bars], left=base, color="tab:blue", alpha=0.7, label="+")
+        ax.set_yticks(positions)
+        ax.set_yticklabels([b.parameter for b in bars])
+        ax.axvline(base, color="black", linewidth=1)
+        ax.set_xlabel(METRIC_LABELS.get(metric, metric))
+        ax.set_title("Торнадо-диаграмма (Tornado)")
+        ax.legend()
+        return ax
+
+# --- RUNNER ---
+
+def build_variants(model: EstateModel, ranges: Dict[str, Tuple[float, float]]) -> List[Variant]:
+    variants = [Variant("", "base", float("nan"), model)]
+    for name, (low, high) in ranges.items():
+        variants.append(Variant(name, "low", low, model.with_parameters({name: low})))
+        variants.append(Variant(name, "high", high, model.with_parameters({name: high})))
+    return variants
+
+def run_sensitivity(model: EstateModel = NEURO_MODEL, n_paths: int = 20_000, years: int = 15,
+                    seed: int = 0, ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+                    delta: float = 0.10, discount_rate: float = 0.10,
+                    max_workers: Optional[int] = None) -> SensitivityResult:
+    """
+    Все варианты одной пачкой в пуле процессов (All variants in one process-pool batch).
+    Один seed на все варианты — общие случайные числа. max_workers=0 — без пула.
+    """
+    ranges = default_ranges(model, delta) if ranges is None else ranges
+    variants = build_variants(model, ranges)
+    jobs = [(variant, n_paths, years, seed, discount_rate) for variant in variants]
+    workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+    if workers == 0:
+        metrics = [_evaluate_variant(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            metrics = list(pool.map(_evaluate_variant, jobs, chunksize=max(1, len(jobs) // (4 * workers))))
+    rows = list(zip(variants, metrics))
+    base_values = model.parameters()
+    return SensitivityResult(baseline=rows[0][1], base_values=base_values, rows=rows[1:])
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🎯 NEURO-ESTATE Sobol Indices
+=============================
+Глобальный анализ чувствительности по дисперсии (Variance-based global sensitivity).
+
+Индексы Соболя первого порядка S_i и полные S_Ti по схеме Сальтелли:
+матрицы A, B (N × d) и A_B^(i) — A со столбцом i из B, всего N·(d+2) моделей.
+
+    S_i  = mean(f_B · (f_AB_i − f_A)) / V        (Saltelli 2010)
+    S_Ti = mean((f_A − f_AB_i)^2) / (2V)         (Jansen 1999)
+
+Модель считается векторно: один вызов AnalyticEstate на блок из chunk_size
+точек, параметры — массивы (`EstateModel.with_parameters`). Выход — ожидаемое
+значение с учетом случайных событий: их средний вклад в год
+(1 − порог) · Σ w_i·impact_i / Σ w_i добавляется к денежному потоку.
+
+Доверительные интервалы — бутстрап по уже посчитанным строкам A/B/AB,
+без повторной симуляции.
+
+Usage:
+    result = run_sobol(n_samples=100_000, years=30, output="valuation", progress=print_progress)
+    result.ranking()        # [(parameter, S_i, S_Ti), ...] по убыванию S_Ti
+"""
+
+import sys
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from Neuro_Estate_Analytic import AnalyticEstate
+from Neuro_Estate_Model import EstateModel
+from Neuro_Estate_OS import NEURO_MODEL
+from Neuro_Estate_Sensitivity import default_ranges
+
+OUTPUTS = ("valuation", "npv", "cumulative_net_income")
+
+# --- SAMPLING ---
+
+def saltelli_matrices(n_samples: int, d: int, seed=None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    A и B на [0, 1)^d. С SciPy — скрэмблированная последовательность Соболя
+    (2d измерений), без него — обычные псевдослучайные числа. Баланс Соболя есть
+    только у первых 2^m точек, поэтому n_samples округляется вверх до степени
+    двойки: строк может быть больше, чем запрошено.
+    """
+    try:
+        from scipy.stats import qmc
+    except ImportError:
+        base = np.random.default_rng(seed).random((n_samples, 2 * d))
+    else:
+        sampler = qmc.Sobol(2 * d, scramble=True, seed=seed)
+        base = sampler.random_base2(int(np.ceil(np.log2(max(n_samples, 2)))))
+    return base[:, :d], base[:, d:]
+
+# --- MODEL OUTPUT ---
+
+def expected_event_impact(model: EstateModel, threshold=None):
+    """Средний вклад событий в выручку за год (Expected yearly event impact)."""
+    if not model.events:
+        return 0.0
+    threshold = model.event_threshold if threshold is None else threshold
+    weights = np.array([w for w, _, _ in model.events], dtype=np.float64)
+    impacts = np.array([i for _, _, i in model.events], dtype=np.float64)
+    return (1.0 - np.asarray(threshold)) * float(weights @ impacts / weights.sum())
+
+def evaluate_points(model: EstateModel, names: Sequence[str], points: np.ndarray, years: int,
+                    output: str = "valuation", discount_rate: float = 0.10) -> np.ndarray:
+    """Выход модели для каждой строки points (n, d) одним векторным вызовом."""
+    values = {name: points[:, j] for j, name in enumerate(names)}
+    varied = model.with_parameters(values)
+    analytic = AnalyticEstate(model=varied)
+    events = expected_event_impact(varied, values.get("event_threshold"))
+    if output == "valuation":
+        return analytic.valuation(years) + years * events
+    if output == "cumulative_net_income":
+        return analytic.cumulative_net_income(years) + years * events
+    if output == "npv":
+        t = np.arange(1, years + 1)[:, None]
+        flows = analytic.net_income(t) + events
+        return (flows / (1.0 + discount_rate) ** t).sum(axis=0) - varied.total_capex
+    raise ValueError(f"Unknown output {output!r}; expected one of {OUTPUTS}")
+
+# --- ESTIMATORS ---
+
+def sobol_indices(f_a: np.ndarray, f_b: np.ndarray, f_ab: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """S_i и S_Ti; f_ab имеет форму (d, N) или (R, d, N) для бутстрапа."""
+    variance = np.var(np.concatenate([f_a, f_b], axis=-1), axis=-1)[..., None]
+    first = np.mean(f_b[..., None, :] * (f_ab - f_a[..., None, :]), axis=-1) / variance
+    total = 0.5 * np.mean((f_a[..., None, :] - f_ab) ** 2, axis=-1) / variance
+    return first, total
+
+@dataclass
+class SobolResult:
+    names: List[str]
+    first: np.ndarray          # S_i, (d,)
+    total: np.ndarray          # S_Ti, (d,)
+    first_ci: np.ndarray       # (d, 2) — нижняя и верхняя граница
+    total_ci: np.ndarray
+    output: str
+    n_samples: int
+    f_a: np.ndarray            # Оценки сохраняются для повторного бутстрапа
+    f_b: np.ndarray
+    f_ab: np.ndarray
+
+    @property
+    def n_evaluations(self) -> int:
+        return self.n_samples * (len(self.names) + 2)
+
+    def ranking(self) -> List[Tuple[str, float, float]]:
+        """Параметры по убыванию полного индекса (By total-effect index, largest first)."""
+        order = np.argsort(self.total)[::-1]
+        return [(self.names[i], float(self.first[i]), float(self.total[i])) for i in order]
+
+    def bootstrap(self, resamples: int = 200, confidence: float = 0.95, seed=None):
+        """Перерасчет интервалов на тех же оценках (Re-bootstrap from stored evaluations)."""
+        self.first_ci, self.total_ci = bootstrap_ci(self.f_a, self.f_b, self.f_ab, resamples,
+                                                    confidence, seed)
+        return self
+
+def bootstrap_ci(f_a, f_b, f_ab, resamples: int = 200,
+                 confidence: float = 0.95, seed=None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Перцентильный бутстрап по строкам выборки. Повтор — вектор кратностей строк
+    c (bincount одного вектора индексов); средние sobol_indices по повтору —
+    это c @ слагаемые / N, поэтому на повтор нужен один проход d × N без копий.
+    """
+    rng = np.random.default_rng(seed)
+    n = f_a.shape[0]
+    first_terms = f_b * (f_ab - f_a)            # (d, N), как в sobol_indices
+    total_terms = 0.5 * (f_a - f_ab) ** 2
+    # Моменты для дисперсии — после центрирования, чтобы не терять точность
+    shift = 0.5 * (f_a.mean() + f_b.mean())
+    a, b = f_a - shift, f_b - shift
+    moments = np.stack([a + b, a * a + b * b])
+    firsts = np.empty((resamples, f_ab.shape[0]))
+    totals = np.empty_like(firsts)
+    for r in range(resamples):
+        counts = np.bincount(rng.integers(0, n, size=n), minlength=n).astype(np.float64)
+        mean, square = moments @ counts / (2 * n)
+        variance = square - mean * mean
+        firsts[r] = first_terms @ counts / (n * variance)
+        totals[r] = total_terms @ counts / (n * variance)
+    tail = (1.0 - confidence) / 2.0 * 100.0
+    bounds = (tail, 100.0 - tail)
+    return (np.percentile(firsts, bounds, axis=0).T,
+            np.percentile(totals, bounds, axis=0).T)
+
+# --- RUNNER ---
+
+def print_progress(done: int, total: int):
+    sys.stderr.write(f"\rSobol: {done:,}/{total:,} моделей ({done / total:.0%})")
+    if done == total:
+        sys.stderr.write("\n")
+
+def run_sobol(model: EstateModel = NEURO_MODEL, n_samples: int = 100_000, years: int = 30,
+              output: str = "valuation", ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+              delta: float = 0.20, chunk_size: int = 50_000, discount_rate: float = 0.10,
+              resamples: int = 200, confidence: float = 0.95, seed=None,
+              progress: Optional[Callable[[int, int], None]] = None) -> SobolResult:
+    """
+    Индексы Соболя по равномерным диапазонам параметров (по умолчанию ±delta
+    вокруг базы, как в торнадо). Оценка идет блоками по chunk_size строк;
+    progress(done, total) получает число посчитанных моделей. С SciPy n_samples
+    округляется вверх до степени двойки (100_000 -> 131_072).
+    """
+    ranges = default_ranges(model, delta) if ranges is None else ranges
+    names = list(ranges)
+    d = len(names)
+    low = np.array([ranges[name][0] for name in names])
+    span = np.array([ranges[name][1] for name in names]) - low
+    a, b = saltelli_matrices(n_samples, d, seed)
+    n_samples = len(a)  # Степень двойки для последовательности Соболя
+    a = low + a * span
+    b = low + b * span
+
+    f_a = np.empty(n_samples)
+    f_b = np.empty(n_samples)
+    f_ab = np.empty((d, n_samples))
+    total = n_samples * (d + 2)
+    done = 0
+
+    def run(points):
+        return evaluate_points(model, names, points, years, output, discount_rate)
+
+    for start in range(0, n_samples, chunk_size):
+        stop = min(start + chunk_size, n_samples)
+        block_a, block_b = a[start:stop], b[start:stop]
+        f_a[start:stop] = run(block_a)
+        f_b[start:stop] = run(block_b)
+        for i in range(d):
+            mixed = block_a.copy()
+            mixed[:, i] = block_b[:, i]
+            f_ab[i, start:stop] = run(mixed)
+        done += (stop - start) * (d + 2)
+        if progress is not None:
+            progress(done, total)
+
+    first, total_effect = sobol_indices(f_a, f_b, f_ab)
+    first_ci, total_ci = bootstrap_ci(f_a, f_b, f_ab, resamples, confidence, seed)
+    return SobolResult(names, first, total_effect, first_ci, total_ci, output, n_samples, f_a, f_b, f_ab)
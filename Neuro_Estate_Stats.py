@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+📈 NEURO-ESTATE Streaming Statistics
+====================================
+Потоковые агрегаты Monte Carlo в постоянной памяти (Constant-memory aggregates).
+
+Для каждого года и показателя копятся:
+  * моменты Уэлфорда (Welford mean / variance), слияние по формуле Чана;
+  * гистограмма с фиксированными корзинами в шкале asinh(x / scale) — одна сетка
+    покрывает и убытки, и оценки до 1e13 с постоянной относительной точностью
+    (~0.4% ширина корзины), поэтому P5/P50/P95 не требуют хранить траектории;
+  * точные счетчики x < 0 — вероятность отрицательного денежного потока.
+
+Агрегаты складываются (merge), поэтому воркеры считают свои блоки, а главный
+процесс только сливает их. Память не зависит от числа траекторий.
+
+Usage:
+    stats = aggregate_batch(n_paths=10_000_000, years=30, seed=1)
+    stats.fan_chart("capital_valuation", (5, 50, 95))
+    stats.prob_negative("net_income")
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+
+from Neuro_Estate_OS import YearClosed, child_seed
+
+METRICS = ("revenue", "expenses", "net_income", "capital_valuation")
+
+# --- MOMENTS ---
+
+class RunningMoments:
+    """Среднее и дисперсия по годам (Per-year Welford moments), shape (years,)."""
+
+    def __init__(self, years: int):
+        self.count = np.zeros(years, dtype=np.int64)
+        self.mean = np.zeros(years)
+        self.m2 = np.zeros(years)
+
+    def add(self, t: int, x: float):
+        """Одно значение года t (индекс 0..years-1) — классический шаг Уэлфорда."""
+        self.count[t] += 1
+        delta = x - self.mean[t]
+        self.mean[t] += delta / self.count[t]
+        self.m2[t] += delta * (x - self.mean[t])
+
+    def update(self, values: np.ndarray, t: Optional[int] = None):
+        """Блок значений: (n, years) или (n,) для одного года t."""
+        values = np.asarray(values, dtype=np.float64)
+        if t is None:
+            n = values.shape[0]
+            self._combine(slice(None), n, values.mean(axis=0), ((values - values.mean(axis=0)) ** 2).sum(axis=0))
+        elif values.size:
+            mean = values.mean()
+            self._combine(t, values.size, mean, ((values - mean) ** 2).sum())
+
+    def merge(self, other: "RunningMoments"):
+        self._combine(slice(None), other.count, other.mean, other.m2)
+
+    def _combine(self, where, n_b, mean_b, m2_b):
+        # Формула Чана для объединения двух выборок (Chan et al. parallel update)
+        n_a = self.count[where]
+        n = n_a + n_b
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = mean_b - self.mean[where]
+            share = np.where(n > 0, n_b / np.maximum(n, 1), 0.0)
+            self.mean[where] = self.mean[where] + delta * share
+            self.m2[where] = self.m2[where] + m2_b + delta ** 2 * n_a * share
+        self.count[where] = n
+
+    @property
+    def variance(self) -> np.ndarray:
+        """Несмещенная дисперсия (Sample variance); NaN при count < 2."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > 1, self.m2 / (self.count - 1), np.nan)
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.variance)
+
+# --- HISTOGRAM ---
+
+class AsinhHistogram:
+    """
+    Гистограмма по годам в шкале asinh(x / scale) (Per-year fixed-bin histogram).
+    Корзины одинаковы у всех экземпляров с теми же параметрами, поэтому слияние —
+    это сложение счетчиков.
+    """
+
+    def __init__(self, years: int, bins: int = 16_384, scale: float = 1_000.0, limit: float = 32.0):
+        self.years = years
+        self.bins = bins
+        self.scale = scale
+        self.limit = limit  # asinh-граница: ±limit покрывает |x| до scale * sinh(limit)
+        self.width = 2.0 * limit / bins
+        self.counts = np.zeros((years, bins), dtype=np.int64)
+        self.minimum = np.full(years, np.inf)
+        self.maximum = np.full(years, -np.inf)
+        self.negative = np.zeros(years, dtype=np.int64)
+
+    def _bin(self, values):
+        index = ((np.arcsinh(np.asarray(values) / self.scale) + self.limit) / self.width).astype(np.int64)
+        return np.clip(index, 0, self.bins - 1)
+
+    def add(self, t: int, x: float):
+        self.counts[t, min(max(int((math.asinh(x / self.scale) + self.limit) / self.width), 0), self.bins - 1)] += 1
+        self.minimum[t] = min(self.minimum[t], x)
+        self.maximum[t] = max(self.maximum[t], x)
+        self.negative[t] += x < 0
+
+    def update(self, values: np.ndarray, t: Optional[int] = None):
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        if t is not None:
+            self.counts[t] += np.bincount(self._bin(values), minlength=self.bins)
+            self.minimum[t] = min(self.minimum[t], values.min())
+            self.maximum[t] = max(self.maximum[t], values.max())
+            self.negative[t] += int(np.count_nonzero(values < 0))
+            return
+        flat = self._bin(values) + np.arange(self.years) * self.bins
+        self.counts += np.bincount(flat.ravel(), minlength=self.years * self.bins).reshape(self.years, self.bins)
+        np.minimum(self.minimum, values.min(axis=0), out=self.minimum)
+        np.maximum(self.maximum, values.max(axis=0), out=self.maximum)
+        self.negative += np.count_nonzero(values < 0, axis=0)
+
+    def merge(self, other: "AsinhHistogram"):
+        if (other.bins, other.scale, other.limit, other.years) != (self.bins, self.scale, self.limit, self.years):
+            raise ValueError("Histograms with different bins cannot be merged")
+        self.counts += other.counts
+        np.minimum(self.minimum, other.minimum, out=self.minimum)
+        np.maximum(self.maximum, other.maximum, out=self.maximum)
+        self.negative += other.negative
+
+    def quantile(self, q) -> np.ndarray:
+        """
+        Квантили по годам (Per-year quantiles), shape (len(q), years) или (years,).
+        Линейная интерполяция внутри корзины в шкале asinh, обрезка по min/max.
+        """
+        qs = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        cumulative = np.cumsum(self.counts, axis=1)
+        total = cumulative[:, -1]
+        out = np.full((qs.size, self.years), np.nan)
+        for i, level in enumerate(qs):
+            rank = level * total
+            index = np.minimum((cumulative < rank[:, None]).sum(axis=1), self.bins - 1)
+            rows = np.arange(self.years)
+            before = np.where(index > 0, cumulative[rows, np.maximum(index - 1, 0)], 0)
+            inside = self.counts[rows, index]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                frac = np.clip(np.where(inside > 0, (rank - before) / inside, 0.5), 0.0, 1.0)
+            z = -self.limit + (index + frac) * self.width
+            value = np.clip(np.sinh(z) * self.scale, self.minimum, self.maximum)
+            out[i] = np.where(total > 0, value, np.nan)
+        return out if np.ndim(q) else out[0]
+
+# --- AGGREGATOR ---
+
+class YearlyAggregator:
+    """
+    Моменты + гистограмма для каждого показателя FinancialReport по годам.
+    (Moments and histogram per metric and year; mergeable across processes.)
+    """
+
+    def __init__(self, years: int, metrics: Sequence[str] = METRICS, **histogram):
+        self.years = years
+        self.metrics = tuple(metrics)
+        self.moments = {name: RunningMoments(years) for name in self.metrics}
+        self.histograms = {name: AsinhHistogram(years, **histogram) for name in self.metrics}
+
+    @property
+    def count(self) -> np.ndarray:
+        return self.moments[self.metrics[0]].count
+
+    def add_report(self, report):
+        """Один FinancialReport (годы с 1) — для скалярного ядра."""
+        t = report.year - 1
+        for name in self.metrics:
+            x = getattr(report, name)
+            self.moments[name].add(t, x)
+            self.histograms[name].add(t, x)
+
+    def update_year(self, year: int, columns: Dict[str, np.ndarray]):
+        """Один год по блоку траекторий (One year of a block of paths)."""
+        for name in self.metrics:
+            self.moments[name].update(columns[name], year - 1)
+            self.histograms[name].update(columns[name], year - 1)
+
+    def update_batch(self, result):
+        """BatchResult / колонки (n, years) целиком."""
+        for name in self.metrics:
+            values = getattr(result, name) if not isinstance(result, dict) else result[name]
+            self.moments[name].update(values)
+            self.histograms[name].update(values)
+
+    def merge(self, other: "YearlyAggregator") -> "YearlyAggregator":
+        for name in self.metrics:
+            self.moments[name].merge(other.moments[name])
+            self.histograms[name].merge(other.histograms[name])
+        return self
+
+    # --- queries ---
+
+    def mean(self, metric: str) -> np.ndarray:
+        return self.moments[metric].mean.copy()
+
+    def std(self, metric: str) -> np.ndarray:
+        return self.moments[metric].std
+
+    def quantile(self, metric: str, q) -> np.ndarray:
+        return self.histograms[metric].quantile(q)
+
+    def fan_chart(self, metric: str = "capital_valuation", percentiles=(5, 50, 95)) -> Dict[str, np.ndarray]:
+        """Полосы перцентилей по годам (Percentile bands), ключи "p5", "p50", ..."""
+        values = self.quantile(metric, np.asarray(percentiles) / 100.0)
+        return {f"p{p}": row for p, row in zip(percentiles, values)}
+
+    def prob_negative(self, metric: str = "net_income") -> np.ndarray:
+        """Доля траекторий с metric < 0 по годам (Share of paths below zero)."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.histograms[metric].negative / self.count
+
+class StatsSink:
+    """Приемник событий ядра: годовые отчеты сразу в агрегатор (Kernel sink)."""
+    active = True
+
+    def __init__(self, aggregator: YearlyAggregator):
+        self.aggregator = aggregator
+
+    def emit(self, event):
+        if isinstance(event, YearClosed):
+            self.aggregator.add_report(event.report)
+
+    def flush(self):
+        pass
+
+# --- PARALLEL DRIVER ---
+
+def _aggregate_shard(args) -> YearlyAggregator:
+    engine, blocks, years, metrics = args
+    stats = YearlyAggregator(years, metrics)
+    for size, seed in blocks:
+        stats.update_batch(engine.run(size, years, seed=seed))
+    return stats
+
+def aggregate_batch(n_paths: int, years: int, seed: Optional[int] = None, engine=None,
+                    chunk_paths: int = 50_000, max_workers: Optional[int] = 0,
+                    metrics: Sequence[str] = METRICS) -> YearlyAggregator:
+    """
+    Monte Carlo без хранения траекторий: блоки (seed=child_seed(seed, i), как в
+    export_batch / store_batch) агрегируются в воркерах, главный процесс сливает по
+    одному агрегату на шард. max_workers=0 — в текущем процессе, None — по числу ядер.
+    """
+    from Neuro_Estate_MonteCarlo import BatchEstateEngine
+
+    engine = engine if engine is not None else BatchEstateEngine()
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy)
+    blocks = [(min(chunk_paths, n_paths - start), child_seed(seed, index))
+              for index, start in enumerate(range(0, n_paths, chunk_paths))]
+    workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+    if workers == 0 or not blocks:
+        # Без блоков (n_paths=0) — пустой агрегат без пула (Empty aggregate, no pool)
+        return _aggregate_shard((engine, blocks, years, metrics))
+    # Шард на воркер: агрегат (~16 MB на показатель) пересылается один раз
+    shards = [blocks[i::workers] for i in range(min(workers, len(blocks)))]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return merge_all(pool.map(_aggregate_shard, [(engine, shard, years, metrics) for shard in shards]))
+
+def merge_all(parts: Iterable[YearlyAggregator]) -> YearlyAggregator:
+    """Слить агрегаты воркеров (Merge worker aggregates)."""
+    parts = iter(parts)
+    total = next(parts, None)
+    if total is None:
+        raise ValueError("merge_all needs at least one aggregate (no years to build an empty one)")
+    for part in parts:
+        total.merge(part)
+    return total
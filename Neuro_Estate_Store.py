@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🗄  NEURO-ESTATE Result Store
+=============================
+Колоночное хранилище на диске поверх numpy.memmap (On-disk columnar result store).
+
+Каталог хранилища:
+    meta.json                 — n_paths, years, first_year, описания событий
+    revenue.npy, expenses.npy, net_income.npy, capital_valuation.npy  (float64)
+    event_code.npy            — int16, индекс в events, -1 = события не было
+
+Каждая колонка — матрица (n_paths, years) в C-порядке с фиксированным шагом:
+траектория — непрерывная строка, год по всем траекториям — срез с шагом
+years * itemsize. Чтение — срезы memmap без копирования (zero-copy), поэтому
+одну траекторию или один год из 10M траекторий можно взять, не читая файл целиком.
+
+Usage:
+    store = store_batch("mc_store", n_paths=1_000_000, years=30, seed=1)
+    store.path(42)["capital_valuation"]     # одна траектория
+    store.at_year(30)["net_income"]         # 30-й год всех траекторий
+    ResultStore.open("mc_store").reports(42)
+"""
+
+import json
+import os
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from Neuro_Estate_OS import NEURO_MODEL, RANDOM_EVENTS, FinancialReport, child_seed
+
+COLUMNS: Dict[str, np.dtype] = {
+    "revenue": np.dtype(np.float64),
+    "expenses": np.dtype(np.float64),
+    "net_income": np.dtype(np.float64),
+    "capital_valuation": np.dtype(np.float64),
+    "event_code": np.dtype(np.int16),
+}
+NO_EVENT = -1
+
+class ResultStore:
+    """Матрицы (n_paths, years) на memmap (Memory-mapped (paths, years) columns)."""
+
+    META = "meta.json"
+
+    def __init__(self, root: str, meta: dict, mode: str):
+        self.root = root
+        self.meta = meta
+        self.mode = mode
+        self.columns: Dict[str, np.memmap] = {
+            name: np.load(self._file(name), mmap_mode=mode) for name in COLUMNS
+        }
+
+    # --- lifecycle ---
+
+    @classmethod
+    def create(cls, root: str, n_paths: int, years: int, events: Optional[Sequence[str]] = None,
+               first_year: int = 1, overwrite: bool = False) -> "ResultStore":
+        """Новое хранилище, заполненное нулями и NO_EVENT (sparse files on most filesystems)."""
+        meta_path = os.path.join(root, cls.META)
+        if os.path.exists(meta_path) and not overwrite:
+            raise FileExistsError(f"Хранилище уже есть (Store exists): {root}")
+        os.makedirs(root, exist_ok=True)
+        events = [evt[1] for evt in RANDOM_EVENTS] if events is None else list(events)
+        meta = {"n_paths": n_paths, "years": years, "first_year": first_year,
+                "columns": {name: dtype.str for name, dtype in COLUMNS.items()}, "events": events}
+        for name, dtype in COLUMNS.items():
+            column = np.lib.format.open_memmap(os.path.join(root, name + ".npy"), mode="w+",
+                                               dtype=dtype, shape=(n_paths, years))
+            if name == "event_code":
+                column[:] = NO_EVENT
+            column.flush()
+            del column
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        return cls(root, meta, "r+")
+
+    @classmethod
+    def open(cls, root: str, mode: str = "r") -> "ResultStore":
+        """Открыть на чтение ("r") или запись ("r+")."""
+        with open(os.path.join(root, cls.META), encoding="utf-8") as f:
+            meta = json.load(f)
+        return cls(root, meta, mode)
+
+    @classmethod
+    def from_reports(cls, root: str, reports: Sequence[FinancialReport], events: Optional[Sequence[str]] = None,
+                     overwrite: bool = True) -> "ResultStore":
+        """Одна траектория из списка FinancialReport (e.g. the notebook's kernel.history)."""
+        reports = list(reports)
+        events = [evt[1] for evt in RANDOM_EVENTS] if events is None else list(events)
+        # Незнакомые события дописываются в конец списка (Unknown descriptions are appended)
+        for report in reports:
+            for desc in report.events:
+                if desc not in events:
+                    events.append(desc)
+        store = cls.create(root, 1, len(reports), events,
+                           first_year=reports[0].year if reports else 1, overwrite=overwrite)
+        codes = {desc: i for i, desc in enumerate(events)}
+        store.write_path(0, {
+            "revenue": [r.revenue for r in reports],
+            "expenses": [r.expenses for r in reports],
+            "net_income": [r.net_income for r in reports],
+            "capital_valuation": [r.capital_valuation for r in reports],
+            "event_code": [codes[r.events[0]] if r.events else NO_EVENT for r in reports],
+        })
+        store.flush()
+        return store
+
+    def flush(self):
+        if self.mode != "r":
+            for column in self.columns.values():
+                column.flush()
+
+    def close(self):
+        self.flush()
+        self.columns = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # --- shape ---
+
+    @property
+    def n_paths(self) -> int:
+        return self.meta["n_paths"]
+
+    @property
+    def years(self) -> int:
+        return self.meta["years"]
+
+    @property
+    def year_index(self) -> np.ndarray:
+        first = self.meta["first_year"]
+        return np.arange(first, first + self.years)
+
+    @property
+    def events(self) -> List[str]:
+        return self.meta["events"]
+
+    # --- reads (zero-copy) ---
+
+    def column(self, name: str) -> np.memmap:
+        """Вся колонка (n_paths, years) как memmap."""
+        return self.columns[name]
+
+    def path(self, index: int) -> Dict[str, np.ndarray]:
+        """Одна траектория: непрерывные строки (Contiguous rows of one path)."""
+        return {name: column[index] for name, column in self.columns.items()}
+
+    def paths(self, start: int, stop: int) -> Dict[str, np.ndarray]:
+        """Блок траекторий [start, stop) без копирования."""
+        return {name: column[start:stop] for name, column in self.columns.items()}
+
+    def at_year(self, year: int) -> Dict[str, np.ndarray]:
+        """Один год по всем траекториям: срезы с шагом years (Strided views)."""
+        t = year - self.meta["first_year"]
+        if not 0 <= t < self.years:
+            raise IndexError(f"year {year} вне {self.year_index[0]}..{self.year_index[-1]}")
+        return {name: column[:, t] for name, column in self.columns.items()}
+
+    def reports(self, index: int) -> List[FinancialReport]:
+        """Годовые отчеты одной траектории (FinancialReport view of one path)."""
+        row = self.path(index)
+        out = []
+        for t, year in enumerate(self.year_index):
+            code = int(row["event_code"][t])
+            out.append(FinancialReport(
+                year=int(year),
+                revenue=float(row["revenue"][t]),
+                expenses=float(row["expenses"][t]),
+                net_income=float(row["net_income"][t]),
+                capital_valuation=float(row["capital_valuation"][t]),
+                events=[self.events[code]] if code != NO_EVENT else []
+            ))
+        return out
+
+    # --- writes ---
+
+    def write_path(self, index: int, columns: Dict[str, Sequence]):
+        for name, column in self.columns.items():
+            column[index] = columns[name]
+
+    def write_batch(self, result, first_path: int = 0):
+        """BatchResult в строки [first_path, first_path + N)."""
+        stop = first_path + result.n_paths
+        for name in COLUMNS:
+            source = result.event_index if name == "event_code" else getattr(result, name)
+            self.columns[name][first_path:stop] = source
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.root, name + ".npy")
+
+# --- FILLERS ---
+
+def store_batch(root: str, n_paths: int, years: int, seed: Optional[int] = None, engine=None,
+                chunk_paths: int = 20_000, overwrite: bool = False) -> ResultStore:
+    """
+    Пакетный Monte Carlo прямо в хранилище блоками по chunk_paths. Сиды блоков те
+    же, что в Neuro_Estate_Export.export_batch: оба дают одинаковые траектории.
+    """
+    from Neuro_Estate_MonteCarlo import BatchEstateEngine
+
+    engine = engine if engine is not None else BatchEstateEngine()
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy)
+    store = ResultStore.create(root, n_paths, years, [evt[1] for evt in engine.model.events],
+                               overwrite=overwrite)
+    for index, start in enumerate(range(0, n_paths, chunk_paths)):
+        size = min(chunk_paths, n_paths - start)
+        store.write_batch(engine.run(size, years, seed=child_seed(seed, index)), start)
+        store.flush()  # Грязные страницы уходят на диск по блокам (Bounded dirty pages)
+    return store
+
+def store_sweep(root: str, tasks, runner=None, overwrite: bool = False) -> ResultStore:
+    """
+    Свип в хранилище: строка = task_id. Шаг фиксированный, поэтому у всех задач
+    должен быть один горизонт и одни события (одна модель).
+    """
+    from Neuro_Estate_Sweep import SweepRunner
+
+    tasks = list(tasks)  # Проходим несколько раз: генератор не подходит (Iterated more than once)
+    horizons = {task.years for task in tasks}
+    # None и NEURO_MODEL — одна модель, как в свипе (None means the default model)
+    models = {task.model if task.model is not None else NEURO_MODEL for task in tasks}
+    if len(horizons) != 1 or len(models) != 1:
+        raise ValueError("store_sweep needs one horizon and one model per store; split the grid")
+    model = models.pop()
+    events = [evt[1] for evt in model.events]
+    years = horizons.pop()
+    store = ResultStore.create(root, max(task.task_id for task in tasks) + 1, years, events,
+                               overwrite=overwrite)
+    runner = runner if runner is not None else SweepRunner()
+    for chunk in runner.run(tasks):
+        rows = chunk.task_id.reshape(-1, years)[:, 0]
+        for name, column in store.columns.items():
+            column[rows] = getattr(chunk, name).reshape(-1, years)
+    store.flush()
+    return store
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧭 NEURO-ESTATE Scenario Sweep
+==============================
+Параллельный прогон сетки сценариев (Parallel scenario sweep).
+
+Сетка EstateConfig × сценарии × seeds × горизонты режется на шарды и раздается в
+ProcessPoolExecutor. Каждая задача получает свой независимый поток случайных
+чисел из SeedSequence(seed, spawn_key=(ключ,)), где ключ — хеш (config, модель,
+горизонт), а не номер задачи в сетке. Поэтому результат не зависит ни от числа
+воркеров, ни от размера шардов, ни от того, что в сетку добавили новые
+сценарии: пара (config, seed) дает те же события, что и раньше. Назад приходят колонки
+NumPy (SweepChunk), а не пиклы ядер.
+
+Usage:
+    tasks = build_grid(configs, seeds=range(100), horizons=[15, 30],
+                       models=[s.model for s in load_scenarios(glob.glob("scenarios/*.toml"))])
+    for chunk in SweepRunner(max_workers=8).run(tasks):
+        ...
+
+    # Готовые шарды пишутся в каталог; повторный запуск досчитывает только остальные
+    for chunk in SweepRunner(max_workers=8).run(tasks, checkpoint="sweep_ckpt"):
+        ...
+"""
+
+import dataclasses
+import functools
+import hashlib
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from Neuro_Estate_Model import EstateModel
+from Neuro_Estate_OS import NEURO_MODEL, RANDOM_EVENTS, EstateConfig, NeuroEstateKernel, child_seed, model_digest
+
+# Глобальные коды событий: индекс в RANDOM_EVENTS (-1 = события не было)
+EVENT_CODES: Dict[str, int] = {evt[1]: i for i, evt in enumerate(RANDOM_EVENTS)}
+
+# --- TASKS ---
+
+@dataclass(frozen=True)
+class SweepTask:
+    task_id: int
+    config: EstateConfig
+    seed: int
+    years: int
+    model: Optional[EstateModel] = None  # None = модель NEURO-ESTATE по умолчанию
+
+def build_grid(configs: Sequence[EstateConfig], seeds: Iterable[int],
+               horizons: Iterable[int], models: Iterable[Optional[EstateModel]] = (None,)) -> List[SweepTask]:
+    """Декартово произведение (Cartesian grid) config × model × seed × horizon."""
+    seeds, horizons, models = list(seeds), list(horizons), list(models)
+    tasks = []
+    for config in configs:
+        for model in models:
+            for years in horizons:
+                for seed in seeds:
+                    tasks.append(SweepTask(len(tasks), config, seed, years, model))
+    return tasks
+
+# Схема потоков входит в отпечаток сетки: старые контрольные точки не смешаются с новыми
+STREAM_SCHEME = "config-model-years/1"
+
+@functools.lru_cache(maxsize=128)
+def _model_key(model: EstateModel) -> str:
+    return model_digest(model)
+
+def task_stream_key(task: SweepTask) -> int:
+    """
+    Стабильный 64-битный ключ потока (Stable stream key): хеш config, модели и
+    горизонта, не зависящий от места задачи в сетке. None и NEURO_MODEL — одна модель.
+    """
+    model = task.model if task.model is not None else NEURO_MODEL
+    text = f"{task.config!r}|{_model_key(model)}|{task.years}"
+    return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+
+def task_stream_seed(task: SweepTask) -> int:
+    """Независимый и воспроизводимый seed задачи (Independent, reproducible task seed)."""
+    return child_seed(task.seed, task_stream_key(task))
+
+# --- RESULTS ---
+
+@dataclass
+class SweepChunk:
+    """Плоские колонки по строкам (task, year) одного шарда (Flat per-row columns)."""
+    task_id: np.ndarray
+    year: np.ndarray
+    revenue: np.ndarray
+    expenses: np.ndarray
+    net_income: np.ndarray
+    capital_valuation: np.ndarray
+    event_code: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.task_id)
+
+    @classmethod
+    def concat(cls, chunks: Sequence["SweepChunk"]) -> "SweepChunk":
+        fields = [f.name for f in dataclasses.fields(cls)]
+        return cls(**{name: np.concatenate([getattr(c, name) for c in chunks]) for name in fields})
+
+    def save(self, path: str):
+        """Атомарная запись .npz (Atomic write): шард либо целиком на диске, либо его нет."""
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, **{f.name: getattr(self, f.name) for f in dataclasses.fields(self)})
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "SweepChunk":
+        with np.load(path) as data:
+            return cls(**{f.name: data[f.name] for f in dataclasses.fields(cls)})
+
+# --- WORKER ---
+
+def run_task(task: SweepTask) -> Dict[str, np.ndarray]:
+    """Один сценарий на скалярном ядре (One scenario on the scalar kernel)."""
+    kernel = NeuroEstateKernel(dataclasses.replace(task.config), headless=True,
+                               seed=task_stream_seed(task), model=task.model)
+    for _ in range(task.years):
+        kernel.run_year()
+    columns = kernel.history.to_numpy()
+    # Локальные коды истории -> индексы в событиях модели (RANDOM_EVENTS по умолчанию)
+    codes = EVENT_CODES if task.model is None else {evt[1]: i for i, evt in enumerate(task.model.events)}
+    remap = np.array([codes[name] for name in kernel.history.event_names] + [-1], dtype=np.int16)
+    columns["event_code"] = remap[columns["event_code"]]
+    return columns
+
+def run_shard(tasks: Sequence[SweepTask]) -> SweepChunk:
+    parts = []
+    for task in tasks:
+        columns = run_task(task)
+        columns["task_id"] = np.full(task.years, task.task_id, dtype=np.int64)
+        parts.append(columns)
+    fields = [f.name for f in dataclasses.fields(SweepChunk)]
+    return SweepChunk(**{name: np.concatenate([p[name] for p in parts]) for name in fields})
+
+# --- CHECKPOINTS ---
+
+class SweepCheckpoint:
+    """
+    Каталог готовых шардов (Directory of committed shards):
+        manifest.json        — отпечаток сетки, число задач, размер шарда
+        shard_000042.npz     — SweepChunk шарда 42, пишется атомарно воркером
+    Размер шарда фиксируется при первом запуске, поэтому продолжение с другим
+    числом воркеров режет сетку так же.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, root: str, tasks: Sequence[SweepTask], shard_size: int):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        digest = grid_digest(tasks)
+        manifest_path = os.path.join(root, self.MANIFEST)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest["digest"] != digest:
+                raise ValueError(f"Каталог {root} от другой сетки задач (checkpoint is for another grid)")
+            shard_size = manifest["shard_size"]
+        else:
+            manifest = {"digest": digest, "n_tasks": len(tasks), "shard_size": shard_size}
+            with open(manifest_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+        self.shard_size = shard_size
+
+    def path(self, index: int) -> str:
+        return os.path.join(self.root, f"shard_{index:06d}.npz")
+
+    def done(self, index: int) -> bool:
+        return os.path.exists(self.path(index))
+
+    def completed(self, n_shards: int) -> List[int]:
+        return [i for i in range(n_shards) if self.done(i)]
+
+def grid_digest(tasks: Sequence[SweepTask]) -> str:
+    """Отпечаток сетки задач (Fingerprint of the task grid)."""
+    digest = hashlib.sha256(STREAM_SCHEME.encode("utf-8"))
+    for task in tasks:
+        digest.update(repr(task).encode("utf-8"))
+    return digest.hexdigest()
+
+def _run_committed_shard(args) -> SweepChunk:
+    tasks, path = args
+    chunk = run_shard(tasks)
+    chunk.save(path)
+    return chunk
+
+# --- RUNNER ---
+
+class SweepRunner:
+    """
+    Шардирует задачи по процессам (Shards tasks across a process pool).
+    max_workers=0 — все в текущем процессе (in-process, for debugging).
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, shard_size: Optional[int] = None):
+        self.max_workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+        self.shard_size = shard_size
+
+    def shards(self, tasks: Sequence[SweepTask], size: Optional[int] = None) -> List[Sequence[SweepTask]]:
+        size = size if size is not None else self._shard_size(tasks)
+        return [tasks[i:i + size] for i in range(0, len(tasks), size)]
+
+    def _shard_size(self, tasks: Sequence[SweepTask]) -> int:
+        if self.shard_size is not None:
+            return self.shard_size
+        # ~4 шарда на воркер: баланс нагрузки без лишних пересылок
+        return max(1, math.ceil(len(tasks) / (4 * max(1, self.max_workers))))
+
+    def run(self, tasks: Sequence[SweepTask], checkpoint: Optional[str] = None) -> Iterator[SweepChunk]:
+        """
+        Шарды в порядке задач по мере готовности (Chunks stream back in task order).
+        С checkpoint=<каталог> каждый шард сохраняется сразу по готовности, а
+        при повторном запуске готовые шарды читаются с диска, не пересчитываясь.
+        """
+        if checkpoint is None:
+            shards = self.shards(tasks)
+            if self.max_workers == 0:
+                yield from map(run_shard, shards)
+                return
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                yield from pool.map(run_shard, shards)
+            return
+
+        store = SweepCheckpoint(checkpoint, tasks, self._shard_size(tasks))
+        shards = self.shards(tasks, store.shard_size)
+        # Список готовых фиксируется до запуска: новые шарды пишутся уже во время счета
+        done = set(store.completed(len(shards)))
+        jobs = [(shards[i], store.path(i)) for i in range(len(shards)) if i not in done]
+        if self.max_workers == 0 or not jobs:
+            yield from self._merge(store, len(shards), done, map(_run_committed_shard, jobs))
+            return
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            yield from self._merge(store, len(shards), done, pool.map(_run_committed_shard, jobs))
+
+    @staticmethod
+    def _merge(store: SweepCheckpoint, n_shards: int, done: set,
+               computed: Iterator[SweepChunk]) -> Iterator[SweepChunk]:
+        # Готовые шарды с диска вперемешку с новыми, в порядке задач
+        for index in range(n_shards):
+            yield SweepChunk.load(store.path(index)) if index in done else next(computed)
+
+def run_sweep(configs: Sequence[EstateConfig], seeds: Iterable[int], horizons: Iterable[int],
+              max_workers: Optional[int] = None,
+              models: Iterable[Optional[EstateModel]] = (None,),
+              checkpoint: Optional[str] = None) -> SweepChunk:
+    """Весь свип одной таблицей (Whole sweep as one table) — для небольших сеток."""
+    tasks = build_grid(configs, seeds, horizons, models)
+    return SweepChunk.concat(list(SweepRunner(max_workers).run(tasks, checkpoint)))
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+⏱  NEURO-ESTATE Benchmarks
+==========================
+Замеры скорости и памяти ядра, моделей и генераторов базы знаний.
+(Times the kernel, both models and the knowledge-base builders.)
+
+Каждый кейс прогоняется на нескольких масштабах (1 / 1k / 100k поместий,
+горизонты 15 и 100 лет). Для каждого пишутся ops/sec (поместье-лет в секунду)
+и пиковая память (tracemalloc). Результат сравнивается с JSON-базой и регрессии
+помечаются; код выхода 1, если они есть.
+
+Usage:
+    python benchmark.py                # сравнить с benchmark_baseline.json
+    python benchmark.py --save         # записать новую базу
+    python benchmark.py --quick        # только малые масштабы
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import runpy
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from Ancestral_Estate_Model import AncestralEstate
+from Neuro_Estate_OS import EstateConfig, NeuroEstateKernel
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BASE_DIR, "benchmark_baseline.json")
+
+SCALES = (1, 1_000, 100_000)
+HORIZONS = (15, 100)
+
+# Входы генераторов базы знаний (Inputs of the knowledge-base builders)
+KNOWLEDGE_BASE_INPUTS = (
+    "README.md",
+    "FULL_ARTICLE_RESTORED.md",
+    "Manifesto_Ancestral_Estates_2.0.md",
+    "USER_GUIDE.md",
+    "Neuro_Estate_OS.py",
+    "Neuro_Estate_Simulation.ipynb",
+    "Pack_for_GitHub_and_Media/ARTICLE_VC_VK.md",
+)
+
+# --- CASES ---
+# Каждый кейс возвращает число единиц работы (units) для ops/sec.
+
+def _config() -> EstateConfig:
+    return EstateConfig(family_name="Bench", region="Central Russia", initial_capital=10_000_000)
+
+def kernel_construction(n: int, years: int) -> int:
+    for i in range(n):
+        NeuroEstateKernel(_config(), headless=True, seed=i)
+    return n
+
+def kernel_run_year(n: int, years: int) -> int:
+    for i in range(n):
+        kernel = NeuroEstateKernel(_config(), headless=True, seed=i)
+        for _ in range(years):
+            kernel.run_year()
+    return n * years
+
+def batch_engine(n: int, years: int) -> int:
+    from Neuro_Estate_MonteCarlo import BatchEstateEngine
+
+    BatchEstateEngine().run(n, years, seed=0)
+    return n * years
+
+def ancestral_report(n: int, years: int) -> int:
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(n):
+            AncestralEstate(f"Bench{i}", headless=True).generate_report(years)
+    return n * years
+
+def knowledge_base(script: str):
+    def run(n: int, years: int) -> int:
+        # Копия входов во временной папке: рабочее дерево не трогаем
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in KNOWLEDGE_BASE_INPUTS + (script,):
+                target = os.path.join(tmp, name)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copy(os.path.join(BASE_DIR, name), target)
+            cwd = os.getcwd()
+            os.chdir(tmp)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    runpy.run_path(os.path.join(tmp, script), run_name="__main__")
+            finally:
+                os.chdir(cwd)
+        return 1
+    return run
+
+# (имя, функция, масштабы, горизонты, тяжелый скалярный кейс)
+CASES = (
+    ("kernel_construction", kernel_construction, SCALES, (0,), True),
+    ("kernel_run_year", kernel_run_year, SCALES, HORIZONS, True),
+    ("batch_engine", batch_engine, SCALES, HORIZONS, False),
+    ("ancestral_report", ancestral_report, SCALES, (20, 100), True),
+    ("generate_full_context", knowledge_base("generate_full_context.py"), (1,), (0,), False),
+    ("create_context_for_ai", knowledge_base("create_context_for_ai.py"), (1,), (0,), False),
+)
+
+# --- RUNNER ---
+
+def measure(fn, n: int, years: int, repeat: int, min_time: float = 0.2) -> dict:
+    """
+    Лучшее из repeat окон по min_time секунд (best-of windows: short cases loop until
+    min_time so that noise does not dominate) + отдельный прогон под tracemalloc.
+    """
+    best = float("inf")
+    units = 0
+    for _ in range(repeat):
+        calls = 0
+        started = time.perf_counter()
+        while True:
+            units = fn(n, years)
+            calls += 1
+            elapsed = time.perf_counter() - started
+            if elapsed >= min_time:
+                break
+        best = min(best, elapsed / calls)
+    tracemalloc.start()
+    try:
+        fn(n, years)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "seconds": best,
+        "units": units,
+        "ops_per_sec": units / best if best > 0 else float("inf"),
+        "peak_mb": peak / 2**20,
+    }
+
+def run_suite(max_scalar: int, repeat: int, only=None, max_scale=None) -> dict:
+    results = {}
+    for name, fn, scales, horizons, scalar in CASES:
+        if only and name not in only:
+            continue
+        for n in scales:
+            if (scalar and n > max_scalar) or (max_scale is not None and n > max_scale):
+                continue
+            for years in horizons:
+                key = f"{name}[n={n},T={years}]"
+                results[key] = measure(fn, n, years, repeat if n * max(years, 1) < 1_000_000 else 1)
+                row = results[key]
+                print(f"{key:<45} {row['ops_per_sec']:>14,.0f} ops/s  {row['peak_mb']:>9.2f} MB")
+    return results
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Регрессии: ops/sec ниже базы или память выше базы больше чем на threshold."""
+    regressions = []
+    for key, row in current.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if row["ops_per_sec"] < base["ops_per_sec"] * (1.0 - threshold):
+            regressions.append(f"{key}: ops/sec {base['ops_per_sec']:,.0f} -> {row['ops_per_sec']:,.0f}")
+        if row["peak_mb"] > base["peak_mb"] * (1.0 + threshold) and row["peak_mb"] - base["peak_mb"] > 1.0:
+            regressions.append(f"{key}: peak {base['peak_mb']:.2f} MB -> {row['peak_mb']:.2f} MB")
+    return regressions
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="NEURO-ESTATE benchmark suite")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="JSON-файл базы (Baseline file)")
+    parser.add_argument("--save", action="store_true", help="Записать результат как новую базу")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Допуск регрессии (default 20%%)")
+    parser.add_argument("--repeat", type=int, default=3, help="Повторов на кейс (best-of)")
+    parser.add_argument("--max-scalar", type=int, default=1_000,
+                        help="Макс. число поместий для скалярных кейсов (100k занимает минуты)")
+    parser.add_argument("--quick", action="store_true", help="Только масштабы до 1k")
+    parser.add_argument("--only", nargs="*", help="Только указанные кейсы")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.max_scalar, args.repeat, args.only, max_scale=1_000 if args.quick else None)
+    payload = {
+        "python": sys.version.split()[0],
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+    if args.save:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+        print(f"\nБаза записана (Baseline saved): {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nБазы нет (No baseline at {args.baseline}); запустите с --save.")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print("\n❌ РЕГРЕССИИ (REGRESSIONS):")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("\n✅ Регрессий нет (No regressions).")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+"""
+Корневой conftest: pytest кладет каталог репозитория в sys.path, и тесты
+импортируют модули Neuro_Estate_* напрямую (Rootdir conftest for plain imports).
+"""
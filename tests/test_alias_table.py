@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""Частоты выборки алиасов (Alias table sampling frequencies)."""
+
+import random
+
+import numpy as np
+import pytest
+
+from Neuro_Estate_Model import AliasTable
+
+
+@pytest.mark.parametrize("weights", [[0.3, 0.3, 0.15, 0.15, 0.1], [1, 0, 5, 2], [7.0]])
+def test_alias_frequencies_match_weights(weights):
+    table = AliasTable(weights)
+    rng = random.Random(9)
+    draws = 200_000
+    counts = np.bincount([table.sample(rng.random()) for _ in range(draws)], minlength=len(weights))
+    expected = np.asarray(weights, dtype=float) / sum(weights)
+    assert np.allclose(counts / draws, expected, atol=0.005)
+    assert counts[expected == 0].sum() == 0
+
+
+def test_alias_rejects_bad_weights():
+    for weights in ([], [0, 0], [1, -1]):
+        with pytest.raises(ValueError):
+            AliasTable(weights)
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""Аналитическая траектория против ядра без событий (Closed form vs. event-free kernel)."""
+
+import dataclasses
+
+import numpy as np
+
+from Neuro_Estate_Analytic import AnalyticEstate
+from Neuro_Estate_OS import NEURO_MODEL, EstateConfig, GrowthRates, NeuroEstateKernel, build_neuro_model
+
+
+def _kernel_reports(model, years):
+    quiet = dataclasses.replace(model, events=())
+    kernel = NeuroEstateKernel(EstateConfig("Test", "Region", 10_000_000), headless=True, seed=1, model=quiet)
+    return [kernel.run_year() for _ in range(years)]
+
+
+def test_analytic_matches_event_free_kernel():
+    years = np.arange(1, 31)
+    reports = _kernel_reports(NEURO_MODEL, len(years))
+    analytic = AnalyticEstate()
+    assert np.allclose(analytic.valuation(years), [r.capital_valuation for r in reports], rtol=1e-12)
+    assert np.allclose(analytic.net_income(years), [r.net_income for r in reports], rtol=1e-12)
+
+
+def test_analytic_custom_growth_rates():
+    rates = GrowthRates(remote_work=1.02, organic_sales=1.0, carbon_credits=1.2, tourism=1.07, expenses=1.05)
+    years = np.arange(1, 21)
+    reports = _kernel_reports(build_neuro_model(rates), len(years))
+    assert np.allclose(AnalyticEstate(rates).valuation(years), [r.capital_valuation for r in reports], rtol=1e-12)
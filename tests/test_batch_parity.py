@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""Векторный движок против скалярного ядра (Batch engine vs. scalar kernel parity)."""
+
+import pytest
+
+from Neuro_Estate_MonteCarlo import BatchEstateEngine, python_event_indices
+from Neuro_Estate_OS import EstateConfig, NeuroEstateKernel
+
+
+@pytest.mark.parametrize("seed", [0, 7, 42])
+def test_batch_matches_kernel_bit_for_bit(seed):
+    years = 30
+    result = BatchEstateEngine().run(1, years, event_index=python_event_indices(seed, 1, years))
+    kernel = NeuroEstateKernel(EstateConfig("Test", "Region", 10_000_000), headless=True, seed=seed)
+    assert result.reports() == [kernel.run_year() for _ in range(years)]
+
+
+def test_python_event_indices_chain_paths():
+    # N траекторий подряд — как N ядер с одним общим потоком
+    years = 10
+    together = python_event_indices(3, 4, years)
+    assert together.shape == (4, years)
+    assert (together[0] == python_event_indices(3, 1, years)[0]).all()
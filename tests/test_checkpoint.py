@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""Контрольная точка и продолжение (Checkpoint / resume)."""
+
+import pytest
+
+from Neuro_Estate_OS import EstateConfig, NeuroEstateKernel, load_checkpoint, save_checkpoint
+
+
+def _kernel():
+    return NeuroEstateKernel(EstateConfig("Test", "Region", 10_000_000), headless=True, seed=11)
+
+
+def test_resume_equals_continuous_run(tmp_path):
+    continuous = _kernel()
+    expected = [continuous.run_year() for _ in range(20)]
+
+    first = _kernel()
+    head = [first.run_year() for _ in range(8)]
+    path = str(tmp_path / "estate.json")
+    save_checkpoint(first, path)
+    resumed = load_checkpoint(path)
+    tail = [resumed.run_year() for _ in range(12)]
+
+    assert head + tail == expected
+    assert list(resumed.history) == expected
+    assert resumed.assets == continuous.assets
+
+
+def test_checkpoint_rejects_other_version(tmp_path):
+    state = _kernel().checkpoint()
+    state["version"] = -1
+    with pytest.raises(ValueError):
+        NeuroEstateKernel.from_checkpoint(state)
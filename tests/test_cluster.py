@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""Кластер поместий: переток капитала от соседей (Cluster neighbour spillover)."""
+
+import dataclasses
+
+import numpy as np
+import pytest
+
+from Neuro_Estate_Cluster import AGRO_POLIS, ClusterEngine, ClusterMembers
+from Neuro_Estate_Graph import NeighbourGraph
+from Neuro_Estate_MonteCarlo import NO_EVENT
+
+
+def test_spillover_is_mean_over_joined_neighbours():
+    # Поместье 0 связано с 1 (вступило сразу) и 2 (вступит на 5-й год)
+    members = ClusterMembers(village=np.zeros(3, dtype=np.int32),
+                             join_year=np.array([1, 1, 5], dtype=np.int32), scale=np.ones(3))
+    graph = NeighbourGraph.from_edges(3, [0, 0], [1, 2])
+    events = np.full((3, 1), NO_EVENT, dtype=np.int16)
+    engine = ClusterEngine()
+    alone = engine.run(3, 1, members=members, event_index=events)
+    linked = engine.run(3, 1, members=members, event_index=events, graph=graph)
+    opening = AGRO_POLIS.member.opening_balance()[AGRO_POLIS.spillover_asset]
+    gain = linked.capital_valuation[0, 0] - alone.capital_valuation[0, 0]
+    assert gain == pytest.approx(AGRO_POLIS.spillover * opening)
+
+
+def test_unknown_spillover_asset_rejected():
+    with pytest.raises(ValueError):
+        dataclasses.replace(AGRO_POLIS, spillover_asset="no_such_asset")
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""Моменты макро-факторов (Driver moment checks)."""
+
+import numpy as np
+import pytest
+
+from Neuro_Estate_Drivers import MacroDrivers
+
+
+@pytest.mark.parametrize("df", [None, 5.0, 4.0, 3.0])
+def test_growth_and_yield_means(df):
+    drivers = MacroDrivers(df=df)
+    paths = drivers.simulate(200_000, 10, np.random.default_rng(7))
+    assert paths.crypto_growth.mean() == pytest.approx(np.exp(drivers.crypto_drift), rel=0.01)
+    assert paths.yield_factor.mean() == pytest.approx(1.0, rel=0.005)
+    assert np.isfinite(paths.crypto_growth).all()
+
+
+def test_shock_correlation():
+    drivers = MacroDrivers()
+    paths = drivers.simulate(100_000, 10, np.random.default_rng(3))
+    corr = np.corrcoef(paths.shocks.reshape(-1, 3).T)
+    assert np.allclose(corr, np.asarray(drivers.correlation), atol=0.01)
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""NPV и IRR против замкнутых формул (NPV / IRR closed forms)."""
+
+import numpy as np
+import pytest
+
+from Neuro_Estate_Finance import irr, npv
+
+
+def test_npv_annuity_closed_form():
+    flow, rate, years, investment = 1_000.0, 0.08, 20, 5_000.0
+    annuity = flow * (1 - (1 + rate) ** -years) / rate
+    assert npv(np.full(years, flow), rate, investment) == pytest.approx(annuity - investment, rel=1e-12)
+
+
+def test_irr_perpetuity_and_single_flow():
+    # Один поток в год T: IC(1+r)^T = CF
+    assert irr([0, 0, 1_331.0], 1_000.0) == pytest.approx(0.1, abs=1e-10)
+    # Ровный поток: IRR — корень аннуитета с известной ставкой
+    rates = np.array([0.05, 0.12, 0.3])
+    years = 15
+    investment = 1_000.0 * (1 - (1 + rates) ** -years) / rates
+    flows = np.full((3, years), 1_000.0)
+    assert np.allclose(irr(flows, investment), rates, atol=1e-10)
+
+
+def test_irr_without_sign_change_is_nan():
+    assert np.isnan(irr([-1.0, -2.0, -3.0], 10.0))
+
+
+def test_irr_beyond_bracket_is_nan():
+    # Корень ~1e300 вне вилки [-99%, MAX_IRR]: Ньютон не должен объявить сходимость
+    assert np.isnan(irr([[1e300] * 30], 1.0)).all()
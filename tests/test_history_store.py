@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""Колоночная история ведет себя как список (HistoryStore list compatibility)."""
+
+import pytest
+
+from Neuro_Estate_OS import EstateConfig, FinancialReport, HistoryStore, NeuroEstateKernel
+
+
+def test_history_store_behaves_like_list():
+    kernel = NeuroEstateKernel(EstateConfig("Test", "Region", 10_000_000), headless=True, seed=2)
+    reports = [kernel.run_year() for _ in range(40)]   # больше стартовой емкости
+    history = kernel.history
+    assert len(history) == len(reports)
+    assert list(history) == reports
+    assert history[-1] == reports[-1]
+    assert history[0] == reports[0]
+    assert history[5:9] == reports[5:9]
+    with pytest.raises(IndexError):
+        history[len(reports)]
+
+
+def test_history_store_append_and_columns():
+    store = HistoryStore(capacity=1)
+    first = FinancialReport(1, 10.0, 4.0, 6.0, 100.0, [])
+    second = FinancialReport(2, 12.0, 5.0, 7.0, 107.0, ["Harvest"])
+    store.append(first)
+    store.append(second)
+    assert list(store) == [first, second]
+    columns = store.to_numpy()
+    assert columns["net_income"].tolist() == [6.0, 7.0]
+    assert columns["event_code"].tolist() == [-1, 0]
+    with pytest.raises(ValueError):
+        store.append(FinancialReport(3, 0.0, 0.0, 0.0, 0.0, ["a", "b"]))
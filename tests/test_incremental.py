@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""Инкрементальный пересчет против полного прогона (Incremental what-if vs. batch engine)."""
+
+import numpy as np
+
+from Neuro_Estate_Incremental import IncrementalEstate
+from Neuro_Estate_MonteCarlo import BatchEstateEngine
+
+N_PATHS, YEARS, SEED = 500, 25, 5
+
+
+def _assert_matches_batch(what_if):
+    expected = BatchEstateEngine(model=what_if.model).run(N_PATHS, YEARS, seed=SEED)
+    actual = what_if.result()
+    for field in ("revenue", "net_income", "capital_valuation"):
+        assert np.allclose(getattr(actual, field), getattr(expected, field), rtol=1e-12), field
+    assert (actual.event_index == expected.event_index).all()
+
+
+def test_incremental_tracks_batch_after_each_change():
+    what_if = IncrementalEstate(N_PATHS, YEARS, seed=SEED)
+    _assert_matches_batch(what_if)
+    changes = [
+        {"revenue.tourism.base": 800_000},
+        {"autonomy.rate": 0.03},
+        {"event_threshold": 0.7},
+        {"expenses.expenses.base": 2_000_000},
+    ]
+    for change in changes:
+        what_if.set_parameters(change)
+        _assert_matches_batch(what_if)
+
+
+def test_stream_change_recomputes_only_dependents():
+    what_if = IncrementalEstate(N_PATHS, YEARS, seed=SEED)
+    what_if["final_valuation"]
+    what_if.set_streams(tourism=900_000)
+    what_if["final_valuation"]
+    assert "revenue.tourism" in what_if.last_recomputed
+    assert "event_index" not in what_if.last_recomputed
+    assert "revenue.remote_work" not in what_if.last_recomputed
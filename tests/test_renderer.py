@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+"""Терминальный вывод событий ядра (Terminal renderer)."""
+
+import io
+
+import pytest
+
+from Neuro_Estate_OS import TechLevel, TerminalRenderer, UpgradeEvent
+
+
+@pytest.mark.parametrize("level", list(TechLevel))
+def test_upgrade_banner_for_every_level(level):
+    stream = io.StringIO()
+    renderer = TerminalRenderer(stream=stream, animate=False)
+    renderer.emit(UpgradeEvent(year=3, tech_level=level))
+    renderer.flush()
+    assert level.name in stream.getvalue()
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""Календарь поместья против годового ядра (Event scheduler vs. yearly kernel)."""
+
+import pytest
+
+from Neuro_Estate_OS import EstateConfig, NeuroEstateKernel
+from Neuro_Estate_Scheduler import EstateScheduler
+
+
+def _kernel(seed):
+    return NeuroEstateKernel(EstateConfig("Test", "Region", 10_000_000), headless=True, seed=seed)
+
+
+@pytest.mark.parametrize("resolution", ["month", "week"])
+@pytest.mark.parametrize("seed", [1, 4])
+def test_scheduler_reports_match_run_year(resolution, seed):
+    years = 30
+    reports = EstateScheduler(_kernel(seed), resolution=resolution).run(years)
+    kernel = _kernel(seed)
+    assert reports == [kernel.run_year() for _ in range(years)]
+
+
+def test_weekly_run_skips_empty_ticks():
+    years = 30
+    scheduler = EstateScheduler(_kernel(2), resolution="week")
+    scheduler.run(years)
+    assert scheduler.ticks_visited < years * 52 // 2
+
+
+def test_ledger_is_reproducible():
+    first = EstateScheduler(_kernel(3), resolution="week")
+    second = EstateScheduler(_kernel(3), resolution="week")
+    first.run(10)
+    second.run(10)
+    assert first.ledger == second.ledger
+    assert first.cash_curve() == second.cash_curve()
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""Потоковые агрегаты Monte Carlo (Streaming Monte Carlo aggregates)."""
+
+import numpy as np
+import pytest
+
+from Neuro_Estate_Stats import aggregate_batch, merge_all
+
+
+@pytest.mark.parametrize("max_workers", [0, 2])
+def test_zero_paths_give_empty_aggregate(max_workers):
+    stats = aggregate_batch(0, 5, seed=1, max_workers=max_workers)
+    assert stats.years == 5
+    assert (stats.count == 0).all()
+
+
+def test_merge_all_rejects_empty_input():
+    with pytest.raises(ValueError):
+        merge_all([])
+
+
+def test_workers_match_single_process():
+    single = aggregate_batch(3_000, 10, seed=4, chunk_paths=1_000, max_workers=0)
+    pooled = aggregate_batch(3_000, 10, seed=4, chunk_paths=1_000, max_workers=2)
+    assert (pooled.count == single.count).all()
+    assert np.allclose(pooled.mean("capital_valuation"), single.mean("capital_valuation"), rtol=1e-12)
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""Свип в колоночное хранилище (Sweep into the result store)."""
+
+import dataclasses
+
+from Neuro_Estate_OS import NEURO_MODEL, EstateConfig, NeuroEstateKernel
+from Neuro_Estate_Store import store_sweep
+from Neuro_Estate_Sweep import SweepRunner, build_grid, task_stream_seed
+
+
+def test_store_sweep_accepts_generator_and_default_model(tmp_path):
+    tasks = build_grid([EstateConfig("Test", "Region", 10_000_000)], seeds=range(4), horizons=[6])
+    # None и NEURO_MODEL — одна модель (None means NEURO_MODEL)
+    tasks = [dataclasses.replace(task, model=NEURO_MODEL) if task.seed % 2 else task for task in tasks]
+    store = store_sweep(str(tmp_path / "sweep"), (task for task in tasks), runner=SweepRunner(max_workers=0))
+    assert store.n_paths == len(tasks)
+    for task in tasks:
+        kernel = NeuroEstateKernel(dataclasses.replace(task.config), headless=True,
+                                   seed=task_stream_seed(task), model=task.model)
+        assert store.reports(task.task_id) == [kernel.run_year() for _ in range(task.years)]